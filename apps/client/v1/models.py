@@ -40,5 +40,5 @@ class Collection(BaseModel):
     model_config = ConfigDict(from_attributes=True, frozen=True)
 
     @property
-    def total_duration(self) -> int:
+    def total_duration(self) -> float:
         return sum(record.metadata.duration for record in self.records)
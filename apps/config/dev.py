@@ -1,9 +1,11 @@
 from typing import Final, Literal
 
+from pathlib import Path
+
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from .base import ENV_PATH
+from .base import BASE_DIR, ENV_PATH
 
 load_dotenv(ENV_PATH)
 
@@ -61,10 +63,80 @@ class SaluteSpeechSettings(BaseSettings):
     scope: str = "<SCOPE>"
     client_id: str = "<CLIENT_ID>"
     client_secret: str = "<CLIENT_SECRET>"
+    max_in_flight_tasks: int = 10
+    poll_interval: float = 1
+    max_poll_interval: float = 30
+    max_poll_failures: int = 10
+    shared_token_cache: bool = True
+    shared_limits: bool = True
+    requests_per_second: float = 10
+    requests_burst: int = 20
+    max_account_tasks: int | None = None
+    retry_attempts: int = 5
+    circuit_failure_threshold: int = 5
+    circuit_recovery_timeout: float = 30
+    circuit_half_open_probes: int = 1
 
     model_config = SettingsConfigDict(env_prefix="SALUTE_SPEECH")
 
 
+class AudioPipelineSettings(BaseSettings):
+    profile: Literal["hifi", "speech", "speech_flac"] = "speech"
+    claim_check: bool = False
+    claim_check_storage: Literal["s3", "local"] = "s3"
+    claim_check_dir: Path = BASE_DIR / ".claim-check"
+    silence_aware: bool = True
+    silence_search_window: float = 30
+    segment_overlap: float = 2
+    max_parallel_records: int = 4
+    scratch_dir: Path | None = None
+    scratch_limit: int = 4 * 1024 ** 3
+    timeline: bool = False
+    enhancer_processes: int | None = None
+    fused_enhancement: bool = False
+    adaptive_enhancement: bool = True
+    transcription_cache: Literal["redis", "storage"] | None = "redis"
+    transcription_cache_days: int = 30
+    fast_path_max_duration: int = 120
+
+    model_config = SettingsConfigDict(env_prefix="AUDIO_PIPELINE_")
+
+
+class YandexCloudSettings(BaseSettings):
+    folder_id: str = "<FOLDER_ID>"
+    apikey: str = "<APIKEY>"
+    base_url: str = "https://llm.api.cloud.yandex.net/v1"
+
+    model_config = SettingsConfigDict(env_prefix="YANDEX_CLOUD_")
+
+    @property
+    def qwen3_235b(self) -> str:
+        return f"gpt://{self.folder_id}/qwen3-235b-a22b-fp8/latest"
+
+
+class SummarizerSettings(BaseSettings):
+    temperature: float = 0.2
+    max_retries: int = 3
+    chunk_tokens: int = 6000
+    chunk_overlap_tokens: int = 200
+    max_concurrency: int = 8
+    reduce_fan_in: int = 4
+    compact_transcript: bool = True
+    summary_cache: bool = True
+    summary_cache_days: int = 30
+
+    model_config = SettingsConfigDict(env_prefix="SUMMARIZER_")
+
+
+class SchedulerSettings(BaseSettings):
+    enabled: bool = False
+    max_running_tasks: int = 8
+    task_lease: int = 30 * 60
+    dispatch_interval: float = 1
+
+    model_config = SettingsConfigDict(env_prefix="SCHEDULER_")
+
+
 class JWTSettings(BaseSettings):
     secret_key: str = "<SECRET_KEY>"
     algorithm: str = "HS256"
@@ -130,6 +202,10 @@ class Settings(BaseSettings):
     rabbitmq: RabbitMQSettings = RabbitMQSettings()
     redis: RedisSettings = RedisSettings()
     salute_speech: SaluteSpeechSettings = SaluteSpeechSettings()
+    audio_pipeline: AudioPipelineSettings = AudioPipelineSettings()
+    yandex_cloud: YandexCloudSettings = YandexCloudSettings()
+    summarizer: SummarizerSettings = SummarizerSettings()
+    scheduler: SchedulerSettings = SchedulerSettings()
     jwt: JWTSettings = JWTSettings()
     vk: VKSettings = VKSettings()
     oauth: OAuthSettings = OAuthSettings()
@@ -1,5 +1,7 @@
 __all__ = (
+    "AudioSegmentClaimCheck",
     "AudioSplitter",
 )
 
+from .claim_check import AudioSegmentClaimCheck
 from .workers import AudioSplitter
@@ -0,0 +1,113 @@
+import logging
+from collections.abc import AsyncIterator
+from uuid import uuid4
+
+from modules.media.application import Storage
+from modules.media.application.exceptions import RemovingFailedError
+from modules.media.domain import File
+
+from ..domain import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PART_SIZE = 1024 * 1024  # Размер части при потоковом чтении сегмента (1 МБ)
+
+
+class AudioSegmentClaimCheck:
+    """Claim-check для передачи аудио сегментов между воркерами пайплайна.
+
+    Тело сегмента складывается в хранилище, а через брокер передаётся только сегмент
+    со ссылкой `filepath` и метаданными. Это снимает нагрузку по памяти с брокера
+    и избавляет от base64 кодирования больших PCM сегментов.
+
+    Схема работы:
+
+    AudioSegment(content) ──► check_in ──► Storage + AudioSegment(filepath) ──► брокер
+    брокер ──► AudioSegment(filepath) ──► check_out / stream ──► контент сегмента
+    """
+
+    def __init__(
+            self,
+            storage: Storage,
+            prefix: str = "audio-segments",
+            part_size: int = DEFAULT_PART_SIZE,
+    ) -> None:
+        """
+        :param storage: Хранилище для тел сегментов (S3 или локальный диск).
+        :param prefix: Префикс путей сегментов в хранилище.
+        :param part_size: Размер части в байтах при потоковом чтении сегмента.
+        """
+
+        self._storage = storage
+        self._prefix = prefix
+        self._part_size = part_size
+
+    def _build_filepath(self, segment: AudioSegment) -> str:
+        task_id = segment.metadata.get("task_id", "unknown")
+        return f"{self._prefix}/{task_id}/{segment.number:05d}-{uuid4().hex}.{segment.format}"
+
+    async def check_in(self, segment: AudioSegment) -> AudioSegment:
+        """Выгрузка тела сегмента в хранилище.
+
+        :param segment: Сегмент с контентом.
+        :returns: Сегмент без контента, со ссылкой на него в хранилище.
+        """
+
+        if segment.is_claimed:
+            return segment
+        filepath = self._build_filepath(segment)
+        await self._storage.upload(File(
+            path=filepath,
+            size=segment.size,
+            mime_type=f"audio/{segment.format}",
+            content=segment.content,
+        ))
+        logger.debug(
+            "Audio segment %s checked in to %s", segment.number, filepath, extra=segment.metadata
+        )
+        return segment.model_copy(update={"content": None, "filepath": filepath})
+
+    async def check_out(self, segment: AudioSegment) -> AudioSegment:
+        """Получение сегмента вместе с контентом из хранилища.
+
+        :param segment: Сегмент со ссылкой на контент.
+        :returns: Сегмент с контентом.
+        """
+
+        if not segment.is_claimed:
+            return segment
+        file = await self._storage.download(segment.filepath)
+        if file is None:
+            raise FileNotFoundError(f"Audio segment content not found by path {segment.filepath}")
+        return segment.model_copy(update={"content": file.content})
+
+    async def stream(self, segment: AudioSegment) -> AsyncIterator[bytes]:
+        """Потоковое чтение контента сегмента без загрузки его целиком в память"""
+
+        if not segment.is_claimed:
+            yield segment.content
+            return
+        async for file_part in self._storage.download_multipart(
+                segment.filepath, part_size=self._part_size
+        ):
+            yield file_part.content
+
+    async def release(self, segment: AudioSegment) -> None:
+        """Удаление тела сегмента из хранилища, после того как оно больше не нужно.
+        Вызывается только после публикации результата обработки сегмента, иначе при сбое
+        публикации или повторной доставке сообщения контент уже не прочитать. Ошибка
+        удаления только логируется: результат опубликован, а тело остаётся до очистки
+        хранилища (lifecycle правило на префикс).
+        """
+
+        if segment.filepath is None:
+            return
+        try:
+            await self._storage.remove(segment.filepath)
+        except RemovingFailedError:
+            logger.warning(
+                "Audio segment %s is not released from %s", segment.number, segment.filepath,
+                exc_info=True,
+            )
+            return
+        logger.debug("Audio segment %s released from %s", segment.number, segment.filepath)
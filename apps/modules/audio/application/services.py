@@ -1,35 +1,95 @@
-import asyncio
 import logging
+from functools import cache
 
 from config.dev import settings
-from salute_speech.asyncio import AsyncSaluteSpeechClient
+from salute_speech.asyncio import AsyncSaluteSpeechClient, AsyncTranscriptionEngine
+from salute_speech.constants import AudioEncoding
+from salute_speech.models import RecognizedSpeechList
+from salute_speech.resilience import CircuitBreaker, RetryPolicy
+
+from ..infrastructure.rate_limit import create_rate_limiter, create_task_slots
+from ..infrastructure.token_cache import create_token_cache
+from ..infrastructure.transcription_cache import create_transcription_cache
+from ..utils.fingerprint import fingerprint_audio
+from ..utils.headers import parse_audio_header
+from .transcription_cache import TranscriptionCache, build_transcription_key, transcribe_cached
 
 logger = logging.getLogger(__name__)
 
 
+@cache
+def get_transcription_engine(poll_interval: float) -> AsyncTranscriptionEngine:
+    """Общий движок транскрибации процесса: все вызовы делят квоту задач
+    и цикл опроса статусов.
+    """
+
+    stt_client = AsyncSaluteSpeechClient(
+        apikey=settings.salute_speech.apikey,
+        scope=settings.salute_speech.scope,
+        token_cache=create_token_cache(),
+        rate_limiter=create_rate_limiter(),
+        retry_policy=RetryPolicy(attempts=settings.salute_speech.retry_attempts),
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=settings.salute_speech.circuit_failure_threshold,
+            recovery_timeout=settings.salute_speech.circuit_recovery_timeout,
+            half_open_probes=settings.salute_speech.circuit_half_open_probes,
+        ),
+    )
+    return AsyncTranscriptionEngine(
+        stt_client,
+        max_in_flight=settings.salute_speech.max_in_flight_tasks,
+        poll_interval=poll_interval,
+        max_poll_interval=settings.salute_speech.max_poll_interval,
+        task_slots=create_task_slots(),
+        max_poll_failures=settings.salute_speech.max_poll_failures,
+    )
+
+
+@cache
+def get_transcription_cache() -> TranscriptionCache | None:
+    """Общий кэш результатов распознавания процесса"""
+
+    return create_transcription_cache()
+
+
 async def transcribe_audio(
-        audio: bytes, max_speakers_count: int = 10, async_timeout: int = 1, **kwargs
+        audio: bytes,
+        audio_encoding: AudioEncoding = "PCM_S16LE",
+        channels: int = 1,
+        samplerate: int = 16000,
+        max_speakers_count: int = 10,
+        async_timeout: int = 1,
 ) -> str:
     """Асинхронная трансрибация аудио записи.
 
     :param audio: Байты аудио контента.
+    :param audio_encoding: Кодировка аудио (по умолчанию PCM 16-bit, профиль 'speech').
+    :param channels: Количество аудио каналов.
+    :param samplerate: Частота дискретизации.
     :param max_speakers_count: Максимальное количество спикеров на записи.
-    :param async_timeout: Время задержки между polling запросами.
+    :param async_timeout: Минимальная задержка между polling запросами.
     :returns: Трансрибация в формате Markdown.
     """
 
-    stt_client = AsyncSaluteSpeechClient(
-        apikey=settings.salute_speech.apikey, scope=settings.salute_speech.scope
-    )
-    request_file_id = await stt_client.upload_file(
-        file=audio, audio_encoding="PCM_S16LE", **kwargs
-    )
-    task = await stt_client.async_recognize(
-        request_file_id=request_file_id, audio_encoding=..., max_speakers_count=max_speakers_count
-    )
-    while task.status != "DONE":
-        await asyncio.sleep(async_timeout)
-        task = await stt_client.get_task_status(task.id)
-    response_file_id = task.response_file_id
-    recognized_speech_list = await stt_client.download_file(response_file_id)
-    return recognized_speech_list.to_markdown()
+    engine = get_transcription_engine(async_timeout)
+    transcription_cache = get_transcription_cache()
+    options = {
+        "channels": channels, "samplerate": samplerate, "max_speakers_count": max_speakers_count
+    }
+
+    async def transcribe() -> RecognizedSpeechList:
+        # Продолжительность нужна для планирования первого опроса статуса задачи
+        audio_info = parse_audio_header(audio)
+        return await engine.transcribe(
+            audio,
+            audio_encoding=audio_encoding,
+            duration=audio_info["duration"] if audio_info is not None else None,
+            **options,
+        )
+
+    if transcription_cache is None:
+        recognized_speech = await transcribe()
+    else:
+        cache_key = build_transcription_key(fingerprint_audio(audio), **options)
+        recognized_speech = await transcribe_cached(transcription_cache, cache_key, transcribe)
+    return recognized_speech.to_markdown()
@@ -0,0 +1,73 @@
+from typing import Any, Protocol
+
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+
+from modules.shared_kernel.domain import AppError
+from salute_speech.models import RecognizedSpeechList
+
+logger = logging.getLogger(__name__)
+
+# Версия ключа: меняется, если меняется формат результата или сервис распознавания.
+# 2 - отпечаток FLAC проверяется по кадрам (ключи сегментов сегмент-мюксера были неверными)
+TRANSCRIPTION_CACHE_VERSION = 2
+
+
+class TranscriptionCache(Protocol):
+    """Хранилище результатов распознавания по ключу из отпечатка аудио и опций"""
+
+    async def get(self, key: str) -> RecognizedSpeechList | None:
+        """Получение результата распознавания (None, если его нет или срок хранения истёк)"""
+
+    async def set(self, key: str, speech: RecognizedSpeechList) -> None:
+        """Сохранение результата распознавания на срок хранения кэша"""
+
+
+def build_transcription_key(fingerprint: str, **options: Any) -> str:
+    """Ключ результата распознавания.
+
+    Кодировка аудио в ключ не входит: отпечаток строится по PCM, поэтому одна
+    и та же запись в разных контейнерах (WAV, FLAC) распознаётся один раз.
+
+    :param fingerprint: Отпечаток аудио (см. `modules.audio.utils.fingerprint`).
+    :param options: Опции распознавания, влияющие на результат (каналы, частота, спикеры).
+    :returns: Хеш отпечатка вместе с опциями.
+    """
+
+    payload = json.dumps(
+        {"version": TRANSCRIPTION_CACHE_VERSION, "fingerprint": fingerprint, **options},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def transcribe_cached(
+        cache: TranscriptionCache,
+        key: str,
+        transcribe: Callable[[], Awaitable[RecognizedSpeechList]],
+) -> RecognizedSpeechList:
+    """Распознавание через кэш: при попадании загрузка и опрос задачи не выполняются.
+    Недоступный кэш не мешает распознаванию, а только логируется.
+
+    :param cache: Кэш результатов распознавания.
+    :param key: Ключ результата (см. `build_transcription_key`).
+    :param transcribe: Распознавание аудио при промахе кэша.
+    :returns: Распознанная речь.
+    """
+
+    try:
+        speech = await cache.get(key)
+    except AppError:
+        logger.warning("Transcription cache is unavailable, key %s", key, exc_info=True)
+        speech = None
+    if speech is not None:
+        logger.info("Transcription cache hit, key %s", key)
+        return speech
+    speech = await transcribe()
+    try:
+        await cache.set(key, speech)
+    except AppError:
+        logger.warning("Transcription is not cached, key %s", key, exc_info=True)
+    return speech
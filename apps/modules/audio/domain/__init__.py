@@ -1,5 +1,7 @@
 __all__ = (
+    "AUDIO_PROFILES",
     "AudioFormat",
+    "AudioProfile",
     "AudioSegment",
     "SummarizeMeetingCommand",
     "TranscriptionSegment",
@@ -8,4 +10,10 @@ __all__ = (
 
 from .commands import SummarizeMeetingCommand
 from .exceptions import UnsupportedAudioError
-from .value_objects import AudioFormat, AudioSegment, TranscriptionSegment
+from .value_objects import (
+    AUDIO_PROFILES,
+    AudioFormat,
+    AudioProfile,
+    AudioSegment,
+    TranscriptionSegment,
+)
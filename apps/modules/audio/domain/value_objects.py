@@ -1,12 +1,12 @@
-from typing import Any, Self
+from typing import Any, Final, Self
 
 import os
 from enum import StrEnum
 from pathlib import Path
 
-from pydantic import Field, PositiveInt
+from pydantic import Field, NonNegativeFloat, PositiveInt, model_validator
 
-from modules.shared_kernel.domain import ValueObject
+from modules.shared_kernel.domain import InvariantViolationError, ValueObject
 
 
 class AudioFormat(StrEnum):
@@ -76,13 +76,70 @@ class AudioFormat(StrEnum):
         return self in self.lossless_formats()
 
 
+class AudioProfile(ValueObject):
+    """Профиль выходного аудио сегментов (кодек, количество каналов, частота дискретизации)
+
+    Attributes:
+        name: Название профиля
+        format: Формат (контейнер) сегментов
+        codec: Аудио-кодек, например: 'pcm_s16le', 'flac'
+        channels: Количество аудио каналов
+        samplerate: Частота дискретизации
+        sample_format: Формат семплов, по умолчанию 16-bit
+    """
+
+    name: str
+    format: AudioFormat
+    codec: str
+    channels: PositiveInt
+    samplerate: PositiveInt
+    sample_format: str = "s16"
+
+    @property
+    def bytes_per_second(self) -> int:
+        """Объём несжатого аудио в секунду (верхняя оценка для сжатых форматов)"""
+
+        return self.samplerate * self.channels * 2
+
+    @classmethod
+    def from_name(cls, name: str) -> "AudioProfile":
+        """Получение предопределённого профиля по его названию"""
+
+        profile = AUDIO_PROFILES.get(name)
+        if profile is None:
+            raise ValueError(
+                f"Unknown audio profile {name}, available profiles: {', '.join(AUDIO_PROFILES)}"
+            )
+        return profile
+
+
+AUDIO_PROFILES: Final[dict[str, AudioProfile]] = {
+    # Исходное качество: стерео 44.1 kHz PCM
+    "hifi": AudioProfile(
+        name="hifi", format=AudioFormat.WAV, codec="pcm_s16le", channels=2, samplerate=44100
+    ),
+    # Профиль для распознавания речи: моно 16 kHz PCM
+    "speech": AudioProfile(
+        name="speech", format=AudioFormat.WAV, codec="pcm_s16le", channels=1, samplerate=16000
+    ),
+    # Профиль для распознавания речи со сжатием без потерь: моно 16 kHz FLAC
+    "speech_flac": AudioProfile(
+        name="speech_flac", format=AudioFormat.FLAC, codec="flac", channels=1, samplerate=16000
+    ),
+}
+
+
 class _Segment(ValueObject):
     number: PositiveInt
-    total_count: PositiveInt
+    total_count: PositiveInt | None = None
+    offset: NonNegativeFloat = 0
+    overlap: NonNegativeFloat = 0
 
     @property
     def is_last(self) -> bool:
-        """Является ли сегмент последним в последовательности"""
+        """Является ли сегмент последним в последовательности.
+        При потоковой обработке общее количество сегментов известно только для последнего.
+        """
 
         return self.number == self.total_count
 
@@ -92,8 +149,11 @@ class AudioSegment(_Segment):
 
     Attributes:
         number: Номер сегмента (натуральное число)
-        total_count: Общее количество сегментов
-        content: Аудио контент (байты)
+        total_count: Общее количество сегментов (None, если ещё неизвестно)
+        offset: Смещение начала сегмента от начала записи в секундах
+        overlap: Перекрытие начала сегмента с концом предыдущего в секундах
+        content: Аудио контент (байты), отсутствует если сегмент передаётся через claim-check
+        filepath: Путь до контента сегмента в хранилище (claim-check)
         format: Формат аудио, например 'wav', 'mp3', 'm4a', 'flac', ...
         size: Размер сегмента в байтах
         duration: Продолжительность сегмента в секундах
@@ -102,7 +162,8 @@ class AudioSegment(_Segment):
         metadata: Дополнительная информация, которую нужно передать в контекст
     """
 
-    content: bytes
+    content: bytes | None = None
+    filepath: str | None = None
     format: AudioFormat
     size: PositiveInt
     duration: PositiveInt
@@ -110,8 +171,35 @@ class AudioSegment(_Segment):
     samplerate: PositiveInt | None = None
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    @model_validator(mode="after")
+    def _check_invariant_violation(self) -> Self:
+        """Сегмент должен содержать либо контент, либо ссылку на него в хранилище"""
+        if self.content is None and self.filepath is None:
+            raise InvariantViolationError(
+                "Audio segment must have either content or filepath!",
+                entity_name=self.__class__.__name__,
+            )
+        return self
+
+    @property
+    def is_claimed(self) -> bool:
+        """Передаётся ли контент сегмента через хранилище (claim-check)"""
+
+        return self.content is None
+
 
 class TranscriptionSegment(_Segment):
+    """Расшифровка аудио сегмента
+
+    Attributes:
+        number: Номер сегмента (натуральное число)
+        total_count: Общее количество сегментов (None, если ещё неизвестно)
+        offset: Смещение начала сегмента от начала записи в секундах
+        overlap: Перекрытие начала сегмента с концом предыдущего в секундах
+        text: Текст расшифровки
+        metadata: Дополнительная информация, переданная из аудио сегмента
+    """
+
     text: str
     metadata: dict[str, Any] = Field(default_factory=dict)
 
@@ -120,6 +208,8 @@ class TranscriptionSegment(_Segment):
         return cls(
             number=segment.number,
             total_count=segment.total_count,
+            offset=segment.offset,
+            overlap=segment.overlap,
             text=text,
             metadata=segment.metadata,
         )
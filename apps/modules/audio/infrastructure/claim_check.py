@@ -0,0 +1,26 @@
+from config.dev import settings
+from modules.media.application import Storage
+from modules.media.infrastructure.storage import LocalStorage, S3Storage
+
+from ..application import AudioSegmentClaimCheck
+
+
+def create_claim_check() -> AudioSegmentClaimCheck | None:
+    """Создание claim-check для аудио сегментов согласно настройкам пайплайна.
+
+    :returns: Claim-check или None, если режим выключен (сегменты идут через брокер целиком).
+    """
+
+    if not settings.audio_pipeline.claim_check:
+        return None
+    storage: Storage
+    if settings.audio_pipeline.claim_check_storage == "local":
+        storage = LocalStorage(base_dir=settings.audio_pipeline.claim_check_dir)
+    else:
+        storage = S3Storage(
+            endpoint_url=settings.minio.url,
+            access_key=settings.minio.user,
+            secret_key=settings.minio.password,
+            bucket=settings.minio.bucket,
+        )
+    return AudioSegmentClaimCheck(storage)
@@ -1,5 +1,10 @@
 __all__ = (
+    "ENHANCEMENT_FILTER",
     "FFMpegAudioSplitter",
+    "SilenceBoundaryPlanner",
+    "build_overlap_filtergraph",
 )
 
+from .filters import ENHANCEMENT_FILTER, build_overlap_filtergraph
+from .planner import SilenceBoundaryPlanner
 from .splitter import FFMpegAudioSplitter
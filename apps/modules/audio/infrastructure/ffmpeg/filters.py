@@ -0,0 +1,42 @@
+from typing import Final
+
+from ...utils.segments import SegmentBounds
+
+# Цепочка эффектов FFMpeg, повторяющая `build_board()` (Pedalboard) из sound_enhancer:
+# шумовой гейт -30 dB, компрессор -16 dB 4:1, подъём низких частот +8 dB до 400 Hz, +2 dB.
+# Пороги agate / acompressor задаются в линейной шкале (10 ** (dB / 20)).
+ENHANCEMENT_FILTER: Final[str] = (
+    "agate=threshold=0.0316:ratio=1.5:attack=1:release=250,"
+    "acompressor=threshold=0.158:ratio=4:attack=5:release=100,"
+    "lowshelf=f=400:t=q:w=1:g=8,"
+    "volume=2dB"
+)
+
+
+def build_overlap_filtergraph(
+        bounds: list[SegmentBounds], audio_filter: str | None = None
+) -> str:
+    """Граф фильтров FFMpeg для перекрывающихся сегментов за один проход декодирования.
+
+    Декодированный вход один раз проходит `audio_filter`, затем делится `asplit`,
+    и каждая ветка сразу обрезается `atrim` по границам своего сегмента. Поэтому фильтры
+    обрабатывают запись целиком один раз (без повторной обработки перекрытий и со
+    сквозным состоянием гейта и компрессора на границах), а передискретизация
+    и кодирование каждой ветки - только сам сегмент. При `-ss`/`-to` у каждого выхода
+    обрезка выполняется в конце цепочки выхода, и выход k обрабатывает всю запись
+    с начала до конца сегмента (N²/2 сегментов работы вместо N).
+
+    :param bounds: Границы сегментов.
+    :param audio_filter: Цепочка аудио фильтров FFMpeg до деления на сегменты (*опционально).
+    :returns: Граф для `-filter_complex`, выход сегмента с индексом i - метка `[s<i>]`.
+    """
+
+    branches = "".join(f"[b{index}]" for index in range(len(bounds)))
+    source = f"{audio_filter}," if audio_filter else ""
+    graph = [f"[0:a]{source}asplit={len(bounds)}{branches}"]
+    for index, segment_bounds in enumerate(bounds):
+        trim = f"atrim=start={segment_bounds.start}"
+        if segment_bounds.end is not None:
+            trim += f":end={segment_bounds.end}"
+        graph.append(f"[b{index}]{trim},asetpts=PTS-STARTPTS[s{index}]")
+    return ";".join(graph)
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from pathlib import Path
+
+import numpy as np
+
+from ...application.exceptions import AudioSplittingError
+from ...utils.silence import choose_cut_points, compute_energy_envelope
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_SAMPLERATE = 8000  # Частоты 8 kHz достаточно для оценки энергии речи
+SAMPLE_WIDTH = 2  # PCM 16-bit
+READ_BLOCK_SIZE = 64 * 1024  # Размер блока чтения PCM из stdout FFMpeg
+
+
+class SilenceBoundaryPlanner:
+    """Планировщик границ сегментов по паузам в речи.
+
+    Аудио декодируется FFMpeg в моно PCM 16-bit пониженной частоты и читается потоково,
+    по ходу чтения строится огибающая энергии (RMS по фреймам). Затем рядом с целевой
+    продолжительностью сегмента выбираются самые тихие участки, по которым FFMpeg режет
+    запись через `-segment_times`. Это позволяет не разрывать слова на границах сегментов.
+
+    Example:
+        >>> planner = SilenceBoundaryPlanner(search_window=30)
+        >>> cut_points = await planner.plan(Path("record.mp3"), segment_duration=300)
+        >>> cut_points
+        [287.42, 581.1, 869.96]
+    """
+
+    def __init__(
+            self,
+            search_window: float = 30,
+            frame_duration: float = 0.02,
+            pause_duration: float = 0.3,
+            samplerate: int = ANALYSIS_SAMPLERATE,
+    ) -> None:
+        """
+        :param search_window: Окно поиска паузы перед целевой границей сегмента (в секундах).
+        :param frame_duration: Продолжительность фрейма огибающей энергии (в секундах).
+        :param pause_duration: Минимальная продолжительность паузы (в секундах).
+        :param samplerate: Частота дискретизации для анализа.
+        """
+
+        self._search_window = search_window
+        self._frame_duration = frame_duration
+        self._pause_duration = pause_duration
+        self._samplerate = samplerate
+        self._frame_size = max(int(samplerate * frame_duration), 1)
+
+    async def _compute_envelope(
+            self, input_path: Path, input_options: list[str] | None = None
+    ) -> np.ndarray:
+        """Потоковое декодирование записи и построение огибающей энергии"""
+
+        ffmpeg_command = [
+            "ffmpeg",
+            "-v",
+            "error",
+            *(input_options or []),
+            "-i",
+            f"{input_path}",
+            "-map",
+            "0:a:0",
+            "-ac",
+            "1",
+            "-ar",
+            f"{self._samplerate}",
+            "-f",
+            "s16le",
+            "pipe:1",
+        ]
+        process = await asyncio.create_subprocess_exec(
+            *ffmpeg_command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stderr_reader = asyncio.create_task(process.stderr.read())
+        frame_bytes = self._frame_size * SAMPLE_WIDTH
+        envelopes: list[np.ndarray] = []
+        remainder = b""
+        try:
+            while chunk := await process.stdout.read(READ_BLOCK_SIZE):
+                data = remainder + chunk
+                # Обрабатываются только целые фреймы, хвост переносится в следующий блок
+                end = len(data) - len(data) % frame_bytes
+                remainder = data[end:]
+                if end:
+                    samples = np.frombuffer(data[:end], dtype=np.int16)
+                    envelopes.append(compute_energy_envelope(samples, self._frame_size))
+            await process.wait()
+            stderr = await stderr_reader
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            stderr_reader.cancel()
+        if process.returncode != 0:
+            error_message = stderr.decode()
+            logger.error("FFmpeg decoding for boundary planning failed: %s", error_message)
+            raise AudioSplittingError(f"FFmpeg process failed with error: {error_message}")
+        if not envelopes:
+            return np.empty(0, dtype=np.float32)
+        return np.concatenate(envelopes)
+
+    async def plan(
+            self,
+            input_path: Path,
+            segment_duration: float,
+            input_options: list[str] | None = None,
+    ) -> list[float]:
+        """Планирование точек разреза записи.
+
+        :param input_path: Путь до аудио файла.
+        :param segment_duration: Целевая (максимальная) продолжительность сегмента в секундах.
+        :param input_options: Параметры входа FFMpeg (*опционально),
+        например `-f concat -safe 0` для списка записей.
+        :returns: Времена разрезов в секундах, пустой список если разрезать не нужно.
+        """
+
+        envelope = await self._compute_envelope(input_path, input_options)
+        cut_points = choose_cut_points(
+            envelope,
+            frame_duration=self._frame_size / self._samplerate,
+            target_duration=segment_duration,
+            search_window=self._search_window,
+            pause_duration=self._pause_duration,
+        )
+        logger.info(
+            "Planned %s silence-aware cut points for %s: %s",
+            len(cut_points), input_path, cut_points
+        )
+        return cut_points
@@ -11,14 +11,22 @@ from pathlib import Path
 from uuid import UUID, uuid4
 
 import aiofiles
+import aiofiles.os
 
 from ...application import AudioSplitter
 from ...application.exceptions import AudioSplittingError
-from ...domain import AudioFormat, AudioSegment
+from ...domain import AUDIO_PROFILES, AudioFormat, AudioProfile, AudioSegment
 from ...utils.audio import get_audio_info
+from ...utils.segments import SegmentBounds, overlapping_bounds, uniform_cut_points
+from .filters import build_overlap_filtergraph
+from .planner import SilenceBoundaryPlanner
 
 logger = logging.getLogger(__name__)
 
+PIPE_INPUT = "pipe:0"  # Чтение входного аудио из stdin FFMpeg
+# Промежуточный кодек сегмент-мюксера для форматов, которые он не может записать корректно
+INTERMEDIATE_CODEC = "pcm_s16le"
+
 
 class FFMpegAudioSplitter(AudioSplitter):
     """Асинхронный сплиттер аудио-потоков на сегменты фиксированной длительности
@@ -31,16 +39,23 @@ class FFMpegAudioSplitter(AudioSplitter):
 
     Основные возможности:
     - Потоковое разделение аудио на сегменты
-    - Автоматическая конвертация в указанный формат (по умолчанию WAV)
-    - Поддержка перекрытия сегментов (overlap)
+    - Автоматическая конвертация в указанный профиль (по умолчанию WAV стерео 44.1 kHz,
+      для распознавания речи - профили 'speech' / 'speech_flac', моно 16 kHz)
+    - Поддержка перекрытия сегментов (overlap): каждый сегмент, кроме первого, начинается
+      на `segment_overlap` секунд раньше границы, чтобы не терять слова на стыках
+      (дубли в расшифровках склеиваются через `stitch_transcriptions`)
+    - Разрезание по паузам в речи (boundary planner), чтобы не разрывать слова
+    - Улучшение звука фильтрами FFMpeg в том же проходе (`audio_filter`)
     - Очистка временных файлов после обработки
     - Асинхронная обработка для эффективной работы с I/O
+    - Потоковый режим (streaming): вход передаётся в stdin FFMpeg по мере поступления,
+      а сегменты отдаются сразу после их закрытия FFMpeg (отслеживается через -segment_list)
 
     Example:
         >>> splitter = FFMpegAudioSplitter(
         ...     segment_duration=300,  # 5 минут
         ...     segment_overlap=10,    # 10 секунд перекрытия
-        ...     segment_format=AudioFormat.WAV,
+        ...     profile=AudioProfile.from_name("speech"),
         ...     prefix="session_123"
         ... )
         >>> async for segment in splitter.split_stream(audio_stream):
@@ -51,42 +66,144 @@ class FFMpegAudioSplitter(AudioSplitter):
         - Все временные файлы автоматически удаляются после обработки
         - Поддерживает форматы: WAV, MP3, OGG, FLAC (зависит от FFmpeg)
         - Сегменты нумеруются начиная с 1
+        - В потоковом режиме `total_count` известен только у последнего сегмента
+        - Потоковый режим не подходит для контейнеров, требующих seek при чтении
+          (например, MP4/M4A с moov атомом в конце файла)
+        - Разрезание по паузам работает только в файловом режиме, так как требует
+          предварительного анализа всей записи
+        - Перекрытие сегментов работает только в файловом режиме: сегмент-мюксер FFMpeg
+          не умеет перекрывать сегменты, поэтому каждый сегмент пишется отдельным выходом
+          из ветки `asplit`/`atrim` (см. `build_overlap_filtergraph`)
+        - FLAC сегменты сегмент-мюксер пишет в WAV, а кодирует каждый сегмент отдельно:
+          FLAC кодировщик заполняет STREAMINFO только в конце всего потока, и без этого
+          у промежуточных сегментов `total_samples=0`, а у последнего - длина всей записи
     """
 
     def __init__(
             self,
             segment_duration: int,
             segment_overlap: int,
-            segment_format: AudioFormat = AudioFormat.WAV,
+            profile: AudioProfile = AUDIO_PROFILES["hifi"],
             temp_dir: Path | None = None,
             prefix: str | float | UUID = "",
+            streaming: bool = False,
+            poll_interval: float = 0.5,
+            boundary_planner: SilenceBoundaryPlanner | None = None,
+            audio_filter: str | None = None,
     ) -> None:
         """
         :param segment_duration: Продолжительность сегмента в секундах
         :param segment_overlap: Перекрытие между сегментами в секундах
-        :param segment_format: Формат сегмента
+        :param profile: Профиль выходного аудио (формат, кодек, каналы, частота)
         :param temp_dir: Директория для временных файлов обработки, по умолчанию текущая
         :param prefix: Уникальный префикс для временных файлов
+        :param streaming: Потоковый режим, сегменты отдаются во время работы FFMpeg
+        :param poll_interval: Интервал опроса списка сегментов в потоковом режиме (в секундах)
+        :param boundary_planner: Планировщик границ сегментов по паузам (*опционально),
+        без него запись режется на равные сегменты.
+        :param audio_filter: Цепочка аудио фильтров FFMpeg (*опционально), применяется
+        в том же проходе декодирования, например `ENHANCEMENT_FILTER`.
         """
 
         super().__init__(
             segment_duration=segment_duration,
             segment_overlap=segment_overlap,
-            segment_format=segment_format
+            profile=profile
         )
         self._temp_dir = temp_dir
         self._prefix = prefix or uuid4()
+        self._streaming = streaming
+        self._poll_interval = poll_interval
+        self._boundary_planner = boundary_planner
+        self._audio_filter = audio_filter
+        if streaming and boundary_planner is not None:
+            logger.warning("Boundary planner is not supported in streaming mode and is ignored")
+        if streaming and segment_overlap > 0:
+            logger.warning("Segment overlap is not supported in streaming mode and is ignored")
 
     @property
     def _ffmpeg_output_pattern(self) -> str:
         """Паттерн для выходных сегментов FFMpeg"""
         return f"{self._prefix}_segment_%03d.{self._segment_format}"
 
+    @property
+    def _muxer_format(self) -> AudioFormat:
+        """Формат сегментов на выходе сегмент-мюксера (FLAC кодируется после разрезания)"""
+        if self._segment_format == AudioFormat.FLAC:
+            return AudioFormat.WAV
+        return self._segment_format
+
+    @property
+    def _ffmpeg_muxer_pattern(self) -> str:
+        """Паттерн для сегментов на выходе сегмент-мюксера FFMpeg"""
+        return f"{self._prefix}_segment_%03d.{self._muxer_format}"
+
+    @property
+    def _ffmpeg_segment_list(self) -> Path:
+        """Список закрытых FFMpeg сегментов (дополняется по мере их записи)"""
+        return Path(f"{self._prefix}_segments.list")
+
+    @property
+    def _ffmpeg_encoding_options(self) -> list[str]:
+        """Параметры кодирования выходных сегментов согласно профилю"""
+        return [
+            "-c:a",
+            self._profile.codec,
+            "-sample_fmt",
+            self._profile.sample_format,
+            "-ac",
+            f"{self._profile.channels}",
+            "-ar",
+            f"{self._profile.samplerate}",
+        ]
+
+    @property
+    def _ffmpeg_output_options(self) -> list[str]:
+        """Параметры фильтрации и кодирования сегментов на выходе сегмент-мюксера"""
+        encoding = self._ffmpeg_encoding_options
+        if self._muxer_format != self._segment_format:
+            encoding[1] = INTERMEDIATE_CODEC
+        return [
+            *(["-af", self._audio_filter] if self._audio_filter else []),
+            *encoding,
+            "-map",
+            "0:a",  # Только аудио
+        ]
+
+    def _ffmpeg_overlap_outputs(self, bounds: list[SegmentBounds]) -> list[str]:
+        """Отдельный выход FFMpeg на каждый сегмент, вход декодируется один раз,
+        а каждый выход получает уже обрезанную ветку графа фильтров
+        """
+
+        outputs = [
+            "-filter_complex", build_overlap_filtergraph(bounds, audio_filter=self._audio_filter)
+        ]
+        for index in range(len(bounds)):
+            outputs.extend([
+                "-map",
+                f"[s{index}]",
+                *self._ffmpeg_encoding_options,
+                self._ffmpeg_output_pattern % index,
+            ])
+        return outputs
+
     @asynccontextmanager
-    async def _ffmpeg_pipe(self, input_path: Path):
+    async def _ffmpeg_pipe(
+            self,
+            input_path: Path | str,
+            segment_list: Path | None = None,
+            segment_times: list[float] | None = None,
+            bounds: list[SegmentBounds] | None = None,
+    ):
         """Создание асинхронного процесса для потоковой работы с FFMpeg.
 
-        :param input_path: Путь до файла, который нужно разбить на чанки.
+        :param input_path: Путь до файла, который нужно разбить на чанки
+        (или `pipe:0` для чтения из stdin).
+        :param segment_list: Путь до списка сегментов, в который FFMpeg дописывает
+        имя сегмента сразу после его закрытия.
+        :param segment_times: Явные времена разрезов в секундах, вместо фиксированной
+        продолжительности сегмента.
+        :param bounds: Границы перекрывающихся сегментов, вместо сегмент-мюксера.
         """
 
         ffmpeg_command = [
@@ -94,25 +211,33 @@ class FFMpegAudioSplitter(AudioSplitter):
             "-y",  # Перезапись выхода
             "-i",
             f"{input_path}",
-            "-f",
-            "segment",
-            "-segment_time",
-            f"{self._segment_duration}",
-            "-c:a",
-            "pcm_s16le",  # Кодирование в WAV (PCM 16-bit)
-            "-ac",
-            "2",  # 2 канала (стерео)
-            "-ar",
-            "44100",  # Частота дискретизации 44.1 kHz
-            "-reset_timestamps",
-            "1",
-            "-map",
-            "0:a",  # Только аудио
-            self._ffmpeg_output_pattern,
         ]
+        if bounds:
+            ffmpeg_command.extend(self._ffmpeg_overlap_outputs(bounds))
+        else:
+            ffmpeg_command.extend([
+                "-f",
+                "segment",
+                *(
+                    ["-segment_times", ",".join(f"{time}" for time in segment_times)]
+                    if segment_times
+                    else ["-segment_time", f"{self._segment_duration}"]
+                ),
+                *self._ffmpeg_output_options,
+                "-reset_timestamps",
+                "1",
+            ])
+            if segment_list is not None:
+                ffmpeg_command.extend(
+                    ["-segment_list", f"{segment_list}", "-segment_list_type", "flat"]
+                )
+            ffmpeg_command.append(self._ffmpeg_muxer_pattern)
         logger.info("FFmpeg launch command: %s", " ".join(ffmpeg_command))
         process = await asyncio.create_subprocess_exec(
-            *ffmpeg_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            *ffmpeg_command,
+            stdin=asyncio.subprocess.PIPE if input_path == PIPE_INPUT else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
         try:
             yield process
@@ -147,36 +272,222 @@ class FFMpegAudioSplitter(AudioSplitter):
                 await temp_file.write(chunk)
             return Path(temp_file.name)
 
+    @staticmethod
+    async def _probe_duration(input_path: Path) -> float:
+        """Получение продолжительности записи в секундах через FFprobe"""
+
+        ffprobe_command = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            f"{input_path}",
+        ]
+        process = await asyncio.create_subprocess_exec(
+            *ffprobe_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            error_message = stderr.decode()
+            logger.error("FFprobe process failed with error: %s", error_message)
+            raise AudioSplittingError(f"FFprobe process failed with error: {error_message}")
+        try:
+            return float(stdout.decode().strip())
+        except ValueError as e:
+            raise AudioSplittingError(f"Unknown duration of input file {input_path}") from e
+
+    async def _plan_bounds(self, input_path: Path) -> list[SegmentBounds]:
+        """Планирование границ перекрывающихся сегментов (по паузам или равными частями)"""
+
+        if self._boundary_planner is not None:
+            cut_points = await self._boundary_planner.plan(input_path, self._segment_duration)
+        else:
+            duration = await self._probe_duration(input_path)
+            cut_points = uniform_cut_points(duration, self._segment_duration)
+        return overlapping_bounds(cut_points, self._segment_overlap)
+
+    async def _encode_segment(self, filepath: Path) -> Path:
+        """Кодирование сегмента сегмент-мюксера в формат профиля (отдельным процессом,
+        чтобы заголовок описывал только этот сегмент), промежуточный файл удаляется.
+
+        :param filepath: Путь до сегмента в промежуточном формате.
+        :returns: Путь до сегмента в формате профиля.
+        """
+
+        output_path = filepath.with_suffix(f".{self._segment_format}")
+        ffmpeg_command = [
+            "ffmpeg",
+            "-y",
+            "-i",
+            f"{filepath}",
+            *self._ffmpeg_encoding_options,
+            f"{output_path}",
+        ]
+        process = await asyncio.create_subprocess_exec(
+            *ffmpeg_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+        try:
+            os.unlink(filepath)
+        except OSError:
+            logger.exception("Error occurred while unlinking file %s", filepath)
+        if process.returncode != 0:
+            error_message = stderr.decode()
+            logger.error("FFmpeg process failed with error: %s", error_message)
+            raise AudioSplittingError(f"FFmpeg process failed with error: {error_message}")
+        return output_path
+
+    async def _read_segment(
+            self,
+            filepath: Path,
+            number: int,
+            total_count: int | None = None,
+            metadata: dict[str, Any] | None = None,
+            bounds: SegmentBounds | None = None,
+    ) -> AudioSegment:
+        """Чтение готового сегмента с диска и удаление временного файла.
+
+        :param filepath: Путь до файла сегмента.
+        :param number: Номер сегмента (начиная с 1).
+        :param total_count: Общее количество сегментов, если известно.
+        :param metadata: Дополнительные данные для контекста сегмента.
+        :param bounds: Границы сегмента в записи (смещение и перекрытие), если известны.
+        """
+
+        if AudioFormat.from_filepath(filepath) != self._segment_format:
+            filepath = await self._encode_segment(filepath)
+        async with aiofiles.open(filepath, mode="rb") as file:
+            content = await file.read()
+        audioinfo = get_audio_info(filepath, content=content)
+        try:
+            os.unlink(filepath)
+            logger.debug("File %s unlinked successfully", filepath)
+        except OSError:
+            logger.exception("Error occurred while unlinking file %s", filepath)
+        return AudioSegment(
+            number=number,
+            total_count=total_count,
+            offset=bounds.start if bounds is not None else 0,
+            overlap=bounds.overlap if bounds is not None else 0,
+            content=content,
+            format=self._segment_format,
+            size=len(content),
+            duration=audioinfo["duration"],
+            samplerate=audioinfo["samplerate"],
+            channels=audioinfo["channels"],
+            metadata=(metadata or {}).copy(),
+        )
+
     async def _iter_segments(
-            self, metadata: dict[str, Any] | None = None
+            self,
+            metadata: dict[str, Any] | None = None,
+            bounds: list[SegmentBounds] | None = None,
+            segmented: bool = False,
     ) -> AsyncIterator[AudioSegment]:
-        metadata = metadata or {}
+        pattern = self._ffmpeg_muxer_pattern if segmented else self._ffmpeg_output_pattern
         files = sorted(
-            glob.glob(self._ffmpeg_output_pattern.replace("%03d", "*")),
-            key=lambda x: int(
-                re.search(rf"{self._prefix}_segment_(\d+)\.{self._segment_format}", x).group(1)
-            ),
+            glob.glob(pattern.replace("%03d", "*")),
+            key=lambda x: int(re.search(rf"{self._prefix}_segment_(\d+)\.", x).group(1)),
         )
         for index, filepath in enumerate(files):
-            audioinfo = get_audio_info(Path(filepath))
-            async with aiofiles.open(filepath, mode="rb") as file:
-                content = await file.read()
-            yield AudioSegment(
+            yield await self._read_segment(
+                Path(filepath),
                 number=index + 1,
                 total_count=len(files),
-                content=content,
-                format=self._segment_format,
-                size=len(content),
-                duration=audioinfo["duration"],
-                samplerate=audioinfo["samplerate"],
-                channels=audioinfo["channels"],
-                metadata=metadata.copy(),
+                metadata=metadata,
+                bounds=(
+                    bounds[index] if bounds
+                    else SegmentBounds(start=index * self._segment_duration, end=None, overlap=0)
+                ),
             )
+
+    @staticmethod
+    async def _feed_stdin(
+            process: asyncio.subprocess.Process, stream: AsyncIterable[bytes]
+    ) -> None:
+        """Передача входного потока в stdin FFMpeg по мере его поступления"""
+
+        try:
+            async for chunk in stream:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.warning("FFmpeg closed stdin before the end of input stream")
+        finally:
+            process.stdin.close()
+
+    async def _follow_segment_list(
+            self, segment_list: Path, process: asyncio.subprocess.Process
+    ) -> AsyncIterator[Path]:
+        """Отслеживание списка сегментов, отдаёт пути до сегментов по мере их закрытия FFMpeg.
+
+        :param segment_list: Путь до списка сегментов.
+        :param process: Запущенный процесс FFMpeg.
+        :returns: Генератор путей до закрытых сегментов.
+        """
+
+        position = 0
+        while True:
+            # Статус проверяется до чтения, чтобы не потерять последние записи списка
+            is_finished = process.returncode is not None
+            if await aiofiles.os.path.exists(segment_list):
+                async with aiofiles.open(segment_list, mode="rb") as file:
+                    await file.seek(position)
+                    data = await file.read()
+                # Берутся только полностью записанные строки
+                end = data.rfind(b"\n") + 1
+                position += end
+                for line in data[:end].decode().splitlines():
+                    if line.strip():
+                        yield segment_list.parent / line.strip()
+            if is_finished:
+                break
+            await asyncio.sleep(self._poll_interval)
+
+    async def _split_pipe(
+            self, stream: AsyncIterable[bytes], metadata: dict[str, Any] | None = None
+    ) -> AsyncIterator[AudioSegment]:
+        """Разделение аудио на лету: вход пишется в stdin FFMpeg, а каждый сегмент
+        отдаётся сразу после закрытия. Сегмент придерживается до появления следующего,
+        чтобы у последнего сегмента был известен `total_count`.
+        """
+
+        segment_list = self._ffmpeg_segment_list
+        segment_list.unlink(missing_ok=True)  # Список от прошлого запуска
+        async with self._ffmpeg_pipe(PIPE_INPUT, segment_list=segment_list) as pipe:
+            feeder = asyncio.create_task(self._feed_stdin(pipe, stream))
+            stderr_reader = asyncio.create_task(pipe.stderr.read())
+            pending: Path | None = None
+            number = 0
             try:
-                os.unlink(filepath)
-                logger.debug("File %s unlinked successfully", filepath)
-            except OSError:
-                logger.exception("Error occurred while unlinking file %s", filepath)
+                async for filepath in self._follow_segment_list(segment_list, pipe):
+                    if pending is not None:
+                        yield await self._read_segment(pending, number, metadata=metadata)
+                    pending, number = filepath, number + 1
+                await feeder
+                stderr = await stderr_reader
+                if pipe.returncode != 0:
+                    error_message = stderr.decode()
+                    logger.error("FFmpeg process failed with error: %s", error_message)
+                    raise AudioSplittingError(
+                        f"FFmpeg process failed with error: {error_message}"
+                    )
+                if pending is not None:
+                    yield await self._read_segment(
+                        pending, number, total_count=number, metadata=metadata
+                    )
+            finally:
+                feeder.cancel()
+                stderr_reader.cancel()
+                try:
+                    os.unlink(segment_list)
+                except OSError:
+                    logger.exception(
+                        "Error occurred while unlinking segment list %s", segment_list
+                    )
 
     async def split_stream(
             self, stream: AsyncIterable[bytes], metadata: dict[str, Any] | None = None
@@ -188,14 +499,31 @@ class FFMpegAudioSplitter(AudioSplitter):
         :returns: Генератор аудио сегментов.
         """
 
+        if self._streaming:
+            async for segment in self._split_pipe(stream, metadata):
+                yield segment
+            return
         input_path = await self._write_input_file(stream)
-        async with self._ffmpeg_pipe(input_path) as pipe:
+        segment_times, bounds = None, None
+        if self._segment_overlap > 0:
+            bounds = await self._plan_bounds(input_path)
+        elif self._boundary_planner is not None:
+            segment_times = await self._boundary_planner.plan(input_path, self._segment_duration)
+        async with self._ffmpeg_pipe(
+                input_path, segment_times=segment_times, bounds=bounds
+        ) as pipe:
             _, stderr = await pipe.communicate()
             if pipe.returncode != 0:
                 error_message = stderr.decode()
                 logger.error("FFmpeg process failed with error: %s", error_message)
                 raise AudioSplittingError(f"FFmpeg process failed with error: {error_message}")
-            async for segment in self._iter_segments(metadata):
+            # Без перекрытия смещения сегментов совпадают с точками разреза
+            segment_bounds = bounds or (
+                overlapping_bounds(segment_times, 0) if segment_times else None
+            )
+            async for segment in self._iter_segments(
+                    metadata, bounds=segment_bounds, segmented=not bounds
+            ):
                 yield segment
         try:
             os.unlink(input_path)
@@ -0,0 +1,208 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+from redis import RedisError
+from redis.asyncio import Redis
+
+from config.dev import settings
+from salute_speech.cache import build_account_key
+from salute_speech.resilience import RateLimiter, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+SLOT_RETRY_INTERVAL = 1  # Интервал повторной попытки занять слот задачи (в секундах)
+# Аренда слота (в секундах): продлевается, пока задача в работе,
+# и истекает, если процесс упал не освободив слот
+SLOT_LEASE = 5 * 60
+
+# Пополнение и списание токена атомарно, время - по часам Redis (общим для всех процессов).
+# Возвращает время ожидания до следующего токена строкой (Lua number -> integer в ответе).
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "updated_at", now)
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+# Слоты - sorted set с временем истечения аренды, просроченные слоты освобождаются
+TASK_SLOT_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local lease = tonumber(ARGV[2])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now)
+if redis.call("ZCARD", KEYS[1]) < limit then
+    redis.call("ZADD", KEYS[1], now + lease, ARGV[3])
+    redis.call("EXPIRE", KEYS[1], lease)
+    return 1
+end
+return 0
+"""
+
+# Продление аренды слота, только если он ещё занят (не истёк и не освобождён)
+TASK_SLOT_RENEW_SCRIPT = """
+local lease = tonumber(ARGV[1])
+if not redis.call("ZSCORE", KEYS[1], ARGV[2]) then
+    return 0
+end
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+redis.call("ZADD", KEYS[1], now + lease, ARGV[2])
+redis.call("EXPIRE", KEYS[1], lease)
+return 1
+"""
+
+
+class RedisTokenBucket:
+    """Token bucket в Redis: лимит запросов в секунду на аккаунт, общий для всех воркеров"""
+
+    def __init__(self, redis: Redis, key: str, rate: float, capacity: float | None = None) -> None:
+        """
+        :param redis: Клиент Redis.
+        :param key: Ключ лимита (аккаунт).
+        :param rate: Количество запросов в секунду.
+        :param capacity: Максимальный всплеск запросов (по умолчанию равен `rate`).
+        """
+
+        self._key = key
+        self._rate = rate
+        self._capacity = max(capacity or rate, 1)
+        self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+        # Пока Redis недоступен, частота ограничивается в пределах процесса
+        self._fallback = TokenBucket(rate=rate, capacity=capacity)
+
+    async def acquire(self) -> None:
+        while True:
+            try:
+                wait = float(
+                    await self._script(keys=[self._key], args=[self._rate, self._capacity])
+                )
+            except RedisError:
+                logger.warning("Shared rate limit %s is unavailable, using local one", self._key)
+                await self._fallback.acquire()
+                return
+            if wait <= 0:
+                return
+            logger.debug("Rate limit %s exceeded, waiting %.2f s", self._key, wait)
+            await asyncio.sleep(wait)
+
+
+class RedisTaskSlots:
+    """Лимит задач распознавания в работе на аккаунт, общий для всех воркеров.
+    Аренда занятого слота продлевается в фоне каждую треть `lease`, поэтому задача
+    может работать сколько угодно долго, а слот упавшего процесса освобождается
+    не позже чем через `lease`.
+    """
+
+    def __init__(self, redis: Redis, key: str, limit: int, lease: int = SLOT_LEASE) -> None:
+        """
+        :param redis: Клиент Redis.
+        :param key: Ключ лимита (аккаунт).
+        :param limit: Максимальное количество задач в работе.
+        :param lease: Аренда слота на случай падения процесса (в секундах).
+        """
+
+        self._redis = redis
+        self._key = key
+        self._limit = limit
+        self._lease = lease
+        self._script = redis.register_script(TASK_SLOT_SCRIPT)
+        self._renew_script = redis.register_script(TASK_SLOT_RENEW_SCRIPT)
+
+    async def _acquire(self, token: str) -> bool:
+        """Ожидание свободного слота.
+
+        :param token: Уникальный идентификатор слота.
+        :returns: Занят ли слот (False, если Redis недоступен).
+        """
+
+        while True:
+            try:
+                if await self._script(keys=[self._key], args=[self._limit, self._lease, token]):
+                    return True
+            except RedisError:
+                # Задачи по-прежнему ограничены семафором процесса
+                logger.warning("Shared task slots %s are unavailable, skipping", self._key)
+                return False
+            await asyncio.sleep(SLOT_RETRY_INTERVAL)
+
+    async def _keep_alive(self, token: str) -> None:
+        """Продление аренды слота, пока задача в работе"""
+
+        while True:
+            await asyncio.sleep(self._lease / 3)
+            try:
+                if not await self._renew_script(keys=[self._key], args=[self._lease, token]):
+                    logger.warning("Task slot lease in %s expired before renewal", self._key)
+                    return
+            except RedisError:
+                logger.warning("Failed to renew task slot lease in %s", self._key)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        token = uuid4().hex
+        keep_alive = (
+            asyncio.create_task(self._keep_alive(token)) if await self._acquire(token) else None
+        )
+        try:
+            yield
+        finally:
+            if keep_alive is not None:
+                keep_alive.cancel()
+            with contextlib.suppress(RedisError):
+                await self._redis.zrem(self._key, token)
+
+
+def _account_key() -> str:
+    return build_account_key(settings.salute_speech.apikey, settings.salute_speech.scope)
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Создание ограничителя частоты запросов к SaluteSpeech согласно настройкам.
+
+    :returns: Общий для воркеров ограничитель в Redis или ограничитель процесса.
+    """
+
+    rate = settings.salute_speech.requests_per_second
+    capacity = settings.salute_speech.requests_burst
+    if not settings.salute_speech.shared_limits:
+        return TokenBucket(rate=rate, capacity=capacity)
+    return RedisTokenBucket(
+        Redis.from_url(settings.redis.url),
+        key=f"salute_speech:rate:{_account_key()}",
+        rate=rate,
+        capacity=capacity,
+    )
+
+
+def create_task_slots() -> RedisTaskSlots | None:
+    """Создание общего лимита задач распознавания в работе на аккаунт.
+
+    :returns: Лимит или None, если задачи ограничиваются только в пределах процесса.
+    """
+
+    limit = settings.salute_speech.max_account_tasks
+    if not settings.salute_speech.shared_limits or limit is None:
+        return None
+    return RedisTaskSlots(
+        Redis.from_url(settings.redis.url),
+        key=f"salute_speech:tasks:{_account_key()}",
+        limit=limit,
+    )
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from config.dev import settings
+from modules.shared_kernel.insrastructure.cache import RedisKeyValueCache
+from salute_speech.models import AccessToken
+
+
+class AccessTokenCache(RedisKeyValueCache[AccessToken]):
+    model = AccessToken
+    sensitive = True
+
+
+def create_token_cache() -> AccessTokenCache | None:
+    """Создание общего для процессов кэша access token SaluteSpeech.
+
+    :returns: Кэш или None, если токен кэшируется только в памяти процесса.
+    """
+
+    if not settings.salute_speech.shared_token_cache:
+        return None
+    # TTL каждого токена задаётся по его `expires_at`, значение по умолчанию - запасное
+    return AccessTokenCache(
+        url=settings.redis.url, prefix="salute_speech:token", ttl=timedelta(minutes=30)
+    )
@@ -0,0 +1,112 @@
+import logging
+from datetime import timedelta
+
+from pydantic import RootModel
+
+from config.dev import settings
+from modules.media.application import Storage
+from modules.media.domain import File
+from modules.media.infrastructure.storage import LocalStorage, S3Storage
+from modules.shared_kernel.insrastructure.cache import RedisKeyValueCache
+from modules.shared_kernel.utils import current_datetime
+from salute_speech.models import RecognizedSpeech, RecognizedSpeechList
+
+from ..application.transcription_cache import TranscriptionCache
+
+logger = logging.getLogger(__name__)
+
+
+class CachedSpeech(RootModel[list[RecognizedSpeech]]):
+    """Сериализуемый результат распознавания"""
+
+
+class _RecognizedSpeechCache(RedisKeyValueCache[CachedSpeech]):
+    model = CachedSpeech
+    sensitive = True
+
+
+class RedisTranscriptionCache:
+    """Кэш результатов распознавания в Redis, срок хранения - TTL ключа"""
+
+    def __init__(self, url: str, retention: timedelta, prefix: str = "transcriptions") -> None:
+        """
+        :param url: URL для подключения к Redis.
+        :param retention: Срок хранения результата.
+        :param prefix: Префикс ключей.
+        """
+
+        self._cache = _RecognizedSpeechCache(url=url, prefix=prefix, ttl=retention)
+
+    async def get(self, key: str) -> RecognizedSpeechList | None:
+        cached_speech = await self._cache.get(key)
+        return RecognizedSpeechList(cached_speech.root) if cached_speech is not None else None
+
+    async def set(self, key: str, speech: RecognizedSpeechList) -> None:
+        await self._cache.set(key, CachedSpeech(list(speech)))
+
+
+class StorageTranscriptionCache:
+    """Кэш результатов распознавания в объектном хранилище (для долгого хранения).
+    Срок хранения отсчитывается от времени загрузки объекта, просроченный объект удаляется
+    при обращении (для S3 дополнительно стоит настроить lifecycle правило на префикс).
+    """
+
+    def __init__(
+            self, storage: Storage, retention: timedelta, prefix: str = "transcriptions"
+    ) -> None:
+        """
+        :param storage: Хранилище (S3 или локальный диск).
+        :param retention: Срок хранения результата.
+        :param prefix: Префикс путей результатов в хранилище.
+        """
+
+        self._storage = storage
+        self._retention = retention
+        self._prefix = prefix
+
+    def _build_filepath(self, key: str) -> str:
+        return f"{self._prefix}/{key[:2]}/{key}.json"
+
+    async def get(self, key: str) -> RecognizedSpeechList | None:
+        filepath = self._build_filepath(key)
+        file = await self._storage.download(filepath)
+        if file is None:
+            return None
+        if file.uploaded_at + self._retention < current_datetime():
+            logger.debug("Cached transcription %s expired", filepath)
+            await self._storage.remove(filepath)
+            return None
+        return RecognizedSpeechList(CachedSpeech.model_validate_json(file.content).root)
+
+    async def set(self, key: str, speech: RecognizedSpeechList) -> None:
+        content = CachedSpeech(list(speech)).model_dump_json().encode("utf-8")
+        await self._storage.upload(File(
+            path=self._build_filepath(key),
+            size=len(content),
+            mime_type="application/json",
+            content=content,
+        ))
+
+
+def create_transcription_cache() -> TranscriptionCache | None:
+    """Создание кэша результатов распознавания согласно настройкам пайплайна.
+
+    :returns: Кэш в Redis или в хранилище claim-check, None - если кэш выключен.
+    """
+
+    retention = timedelta(days=settings.audio_pipeline.transcription_cache_days)
+    match settings.audio_pipeline.transcription_cache:
+        case "redis":
+            return RedisTranscriptionCache(url=settings.redis.url, retention=retention)
+        case "storage" if settings.audio_pipeline.claim_check_storage == "local":
+            storage = LocalStorage(base_dir=settings.audio_pipeline.claim_check_dir)
+            return StorageTranscriptionCache(storage, retention=retention)
+        case "storage":
+            storage = S3Storage(
+                endpoint_url=settings.minio.url,
+                access_key=settings.minio.user,
+                secret_key=settings.minio.password,
+                bucket=settings.minio.bucket,
+            )
+            return StorageTranscriptionCache(storage, retention=retention)
+    return None
@@ -1,30 +1,10 @@
-from typing import TypedDict
-
-import io
 import math
 from pathlib import Path
 
 import mutagen
-import soundfile as sf
-from pedalboard import Compressor, Gain, LowShelfFilter, NoiseGate, Pedalboard
-
-from ..domain import AudioFormat, UnsupportedAudioError
-
-
-class AudioInfo(TypedDict):
-    """Информация об аудио файле
-
-    Attributes:
-        duration: Продолжительность в секундах
-        samplerate: Частота дискретизации
-        channels: Количество каналов
-        birate: Бит-рейт
-    """
 
-    duration: int
-    samplerate: int
-    channels: int
-    bitrate: int
+from ..domain import UnsupportedAudioError
+from .headers import AudioInfo, parse_audio_header, read_audio_header
 
 
 def extract_audio_info(filepath: Path) -> AudioInfo:
@@ -41,24 +21,14 @@ def extract_audio_info(filepath: Path) -> AudioInfo:
     }
 
 
-def enhance_sound_quality(audio: bytes, output_format: AudioFormat = "wav") -> tuple[bytes, int]:
-    """Улучшение качества звука используя технологии Spotify.
+def get_audio_info(filepath: Path, content: bytes | None = None) -> AudioInfo:
+    """Получение информации об аудио: WAV и FLAC разбираются по заголовку,
+    остальные форматы через mutagen.
 
-    :param audio: Байты аудио записи.
-    :param output_format: Формат аудио на выходе, после обработки (по умолчанию WAV).
-    :returns: Байты обработанной аудио записи + частота дискретизации.
+    :param filepath: Путь до аудио файла.
+    :param content: Уже прочитанное содержимое файла (*опционально), чтобы не читать его повторно.
+    :returns: Информация об аудио.
     """
 
-    with io.BytesIO(audio) as stream:
-        content, samplerate = sf.read(stream)
-    board = Pedalboard([
-        NoiseGate(threshold_db=-30, ratio=1.5, release_ms=250),
-        Compressor(threshold_db=-16, ratio=4, attack_ms=5, release_ms=100),
-        LowShelfFilter(cutoff_frequency_hz=400, gain_db=8, q=1),
-        Gain(gain_db=2)
-    ])
-    effected = board(content, samplerate)
-    with io.BytesIO(effected) as stream:
-        sf.write(stream, content, samplerate, format=output_format)
-        stream.seek(0)
-        return stream.read(), samplerate
+    audioinfo = read_audio_header(filepath) if content is None else parse_audio_header(content)
+    return audioinfo or extract_audio_info(filepath)
@@ -0,0 +1,214 @@
+from typing import Any, BinaryIO, Final, TypedDict
+
+import io
+from collections.abc import Callable
+
+import numpy as np
+import soundfile as sf
+from pedalboard import Compressor, Gain, LowShelfFilter, NoiseGate, Pedalboard
+
+from ..domain import AudioFormat
+
+BLOCK_SIZE = 64 * 1024  # Размер блока обработки в фреймах (~1.5 секунды при 44.1 kHz)
+ANALYSIS_FRAME_DURATION = 0.05  # Продолжительность фрейма анализа уровня (в секундах)
+SILENCE_DB = -90.0  # Уровень абсолютной тишины (в dBFS)
+CLIPPING_LEVEL = 0.999  # Амплитуда, начиная с которой семпл считается клиппингом
+
+CLEAN_MIN_SNR_DB = 25  # Минимальное отношение сигнал/шум чистой записи
+CLEAN_MAX_CLIPPING_RATIO = 0.001  # Максимальная доля клиппинга чистой записи
+QUIET_LOUDNESS_DB = -30  # Громкость, ниже которой запись нужно поднять
+LIGHT_MIN_SNR_DB = 15  # Минимальное отношение сигнал/шум для лёгкой обработки
+
+
+class AudioAnalysis(TypedDict):
+    """Оценка качества аудио
+
+    Attributes:
+        noise_floor_db: Уровень шума (10-й перцентиль уровня фреймов) в dBFS
+        speech_level_db: Уровень речи (90-й перцентиль уровня фреймов) в dBFS
+        snr_db: Отношение сигнал/шум в dB
+        clipping_ratio: Доля семплов с клиппингом
+        loudness_db: Средняя громкость (RMS всей записи) в dBFS
+    """
+
+    noise_floor_db: float
+    speech_level_db: float
+    snr_db: float
+    clipping_ratio: float
+    loudness_db: float
+
+
+def build_board() -> Pedalboard:
+    """Цепочка эффектов для улучшения качества речи"""
+
+    return Pedalboard([
+        NoiseGate(threshold_db=-30, ratio=1.5, release_ms=250),
+        Compressor(threshold_db=-16, ratio=4, attack_ms=5, release_ms=100),
+        LowShelfFilter(cutoff_frequency_hz=400, gain_db=8, q=1),
+        Gain(gain_db=2)
+    ])
+
+
+def build_light_board() -> Pedalboard:
+    """Лёгкая обработка для чистой, но тихой или неровной по громкости записи"""
+
+    return Pedalboard([
+        Compressor(threshold_db=-20, ratio=2, attack_ms=10, release_ms=150),
+        Gain(gain_db=6),
+    ])
+
+
+# Пресеты обработки: None - запись не обрабатывается
+PRESETS: Final[dict[str, Callable[[], Pedalboard] | None]] = {
+    "clean": None,
+    "light": build_light_board,
+    "full": build_board,
+}
+
+
+def _to_db(value: float) -> float:
+    return max(20 * float(np.log10(max(value, 1e-10))), SILENCE_DB)
+
+
+def analyze_audio_stream(source: BinaryIO, block_size: int = BLOCK_SIZE) -> AudioAnalysis:
+    """Поблочная оценка уровня шума, отношения сигнал/шум, клиппинга и громкости.
+
+    :param source: Входной аудио поток (файл или BytesIO), позиция возвращается в начало.
+    :param block_size: Размер блока в фреймах.
+    :returns: Оценка качества аудио.
+    """
+
+    position = source.tell()
+    frame_levels: list[np.ndarray] = []
+    squares_sum, samples_count, clipped_count = 0.0, 0, 0
+    with sf.SoundFile(source) as infile:
+        frame_size = max(int(infile.samplerate * ANALYSIS_FRAME_DURATION), 1)
+        # Размер блока кратен фрейму, чтобы фреймы не разрывались между блоками
+        block_size = max(block_size // frame_size, 1) * frame_size
+        for block in infile.blocks(blocksize=block_size, dtype="float32", always_2d=True):
+            clipped_count += int(np.count_nonzero(np.abs(block) >= CLIPPING_LEVEL))
+            mono = block.mean(axis=1)
+            squares_sum += float(np.dot(mono, mono))
+            samples_count += len(mono)
+            frames_count = len(mono) // frame_size
+            if frames_count:
+                frames = mono[:frames_count * frame_size].reshape(frames_count, frame_size)
+                frame_levels.append(np.sqrt(np.mean(np.square(frames), axis=1)))
+        channels = infile.channels
+    source.seek(position)
+    levels = np.concatenate(frame_levels) if frame_levels else np.zeros(1, dtype=np.float32)
+    noise_floor_db = _to_db(float(np.percentile(levels, 10)))
+    speech_level_db = _to_db(float(np.percentile(levels, 90)))
+    return {
+        "noise_floor_db": round(noise_floor_db, 2),
+        "speech_level_db": round(speech_level_db, 2),
+        "snr_db": round(speech_level_db - noise_floor_db, 2),
+        "clipping_ratio": round(clipped_count / max(samples_count * channels, 1), 6),
+        "loudness_db": round(_to_db((squares_sum / max(samples_count, 1)) ** 0.5), 2),
+    }
+
+
+def choose_preset(analysis: AudioAnalysis) -> str:
+    """Выбор пресета обработки по оценке качества аудио.
+
+    :param analysis: Оценка качества аудио (см. `analyze_audio_stream`).
+    :returns: Название пресета из `PRESETS`.
+    """
+
+    if (
+            analysis["snr_db"] < LIGHT_MIN_SNR_DB
+            or analysis["clipping_ratio"] > CLEAN_MAX_CLIPPING_RATIO
+    ):
+        return "full"
+    if analysis["snr_db"] < CLEAN_MIN_SNR_DB or analysis["loudness_db"] < QUIET_LOUDNESS_DB:
+        return "light"
+    return "clean"
+
+
+def enhance_audio_stream(
+        source: BinaryIO,
+        destination: BinaryIO,
+        output_format: AudioFormat = "wav",
+        board: Pedalboard | None = None,
+        block_size: int = BLOCK_SIZE,
+) -> int:
+    """Поблочное улучшение качества звука с постоянным потреблением памяти.
+
+    Аудио читается блоками фиксированного размера, каждый блок проходит через цепочку
+    эффектов с `reset=False` (состояние фильтров и компрессора переносится между блоками)
+    и сразу дописывается в выходной поток.
+
+    :param source: Входной аудио поток (файл или BytesIO).
+    :param destination: Выходной поток для обработанного аудио.
+    :param output_format: Формат аудио на выходе (по умолчанию WAV).
+    :param board: Цепочка эффектов (*опционально), по умолчанию `build_board()`.
+    :param block_size: Размер блока в фреймах.
+    :returns: Частота дискретизации.
+    """
+
+    board = board or build_board()
+    board.reset()  # Состояние от предыдущей записи не должно попасть в новую
+    with sf.SoundFile(source) as infile:
+        subtype = infile.subtype if sf.check_format(output_format, infile.subtype) else None
+        with sf.SoundFile(
+                destination,
+                mode="w",
+                samplerate=infile.samplerate,
+                channels=infile.channels,
+                format=output_format,
+                subtype=subtype,
+        ) as outfile:
+            for block in infile.blocks(blocksize=block_size, dtype="float32", always_2d=True):
+                # SoundFile отдаёт (фреймы, каналы), а Pedalboard ожидает (каналы, фреймы)
+                effected = board(block.T, infile.samplerate, reset=False)
+                outfile.write(effected.T)
+        return infile.samplerate
+
+
+def enhance_sound_quality(
+        audio: bytes, output_format: AudioFormat = "wav", board: Pedalboard | None = None
+) -> tuple[bytes, int]:
+    """Улучшение качества звука используя технологии Spotify.
+
+    :param audio: Байты аудио записи.
+    :param output_format: Формат аудио на выходе, после обработки (по умолчанию WAV).
+    :param board: Цепочка эффектов (*опционально), чтобы не строить её на каждый вызов.
+    :returns: Байты обработанной аудио записи + частота дискретизации.
+    """
+
+    with io.BytesIO(audio) as source, io.BytesIO() as destination:
+        samplerate = enhance_audio_stream(source, destination, output_format, board=board)
+        return destination.getvalue(), samplerate
+
+
+def enhance_sound_quality_adaptive(
+        audio: bytes,
+        output_format: AudioFormat = "wav",
+        boards: dict[str, Pedalboard] | None = None,
+) -> tuple[bytes, int, dict[str, Any]]:
+    """Адаптивное улучшение качества звука: по оценке качества выбирается пресет,
+    чистая запись возвращается без изменений (без декодирования и кодирования).
+
+    :param audio: Байты аудио записи.
+    :param output_format: Формат аудио на выходе, после обработки (по умолчанию WAV).
+    :param boards: Уже построенные цепочки эффектов по названиям пресетов (*опционально).
+    :returns: Байты аудио записи + частота дискретизации + результат анализа и пресет.
+    """
+
+    with io.BytesIO(audio) as source:
+        analysis = analyze_audio_stream(source)
+        preset = choose_preset(analysis)
+        report = {**analysis, "preset": preset}
+        board_factory = PRESETS[preset]
+        if board_factory is None:
+            with sf.SoundFile(source) as infile:
+                samplerate, input_format = infile.samplerate, infile.format
+            if input_format.lower() == f"{output_format}".lower():
+                return audio, samplerate, report
+            source.seek(0)
+            board = Pedalboard([])  # Без обработки, только смена формата
+        else:
+            board = (boards or {}).get(preset) or board_factory()
+        with io.BytesIO() as destination:
+            samplerate = enhance_audio_stream(source, destination, output_format, board=board)
+            return destination.getvalue(), samplerate, report
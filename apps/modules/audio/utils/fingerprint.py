@@ -0,0 +1,352 @@
+from typing import Literal, NamedTuple
+
+import hashlib
+import struct
+from collections.abc import AsyncIterable
+
+from .headers import (
+    CHUNK_HEADER,
+    FLAC_MARKER,
+    FLAC_STREAMINFO,
+    FLAC_STREAMINFO_SIZE,
+    RIFF_HEADER,
+    UNKNOWN_SIZE,
+    WAVE_FORMAT,
+)
+
+FLAC_HEADER_SIZE = len(FLAC_MARKER) + 4 + FLAC_STREAMINFO_SIZE
+FLAC_BLOCK_SIZE_OFFSET = len(FLAC_MARKER) + 4 + 2  # Максимальный размер блока (16 бит)
+FLAC_FRAME_SIZE_OFFSET = len(FLAC_MARKER) + 4 + 7  # Максимальный размер кадра (24 бита)
+FLAC_STREAM_OFFSET = len(FLAC_MARKER) + 4 + 10  # Параметры потока в STREAMINFO (64 бита)
+FLAC_MD5_OFFSET = len(FLAC_MARKER) + 4 + 18  # MD5 несжатых семплов в конце STREAMINFO
+MAX_HEADER_SIZE = 64 * 1024  # Дальше заголовка аудио не ищется, контент хешируется целиком
+FLAC_FRAME_SYNC = (b"\xff\xf8", b"\xff\xf9")  # Синхрокод кадра: фиксированный/переменный блок
+FLAC_FRAME_HEADER_MIN_SIZE = 6
+FLAC_FRAME_HEADER_MAX_SIZE = 16
+FLAC_DEFAULT_FRAME_SIZE = 64 * 1024  # Поиск последнего кадра, если размер кадра не записан
+FLAC_MAX_NUMBER_SIZE = 7  # Номер кадра в UTF-8 подобной кодировке, до 36 бит
+UTF8_CONTINUATION = 0x80  # Старшие биты байта продолжения: 10xxxxxx
+FLAC_INVALID_SAMPLERATE = 0x0F
+# Размер блока по коду в заголовке кадра, либо размер поля с ним в конце заголовка
+FLAC_BLOCK_SIZES = {
+    1: 192, 2: 576, 3: 1152, 4: 2304, 5: 4608,
+    **{code: 256 << (code - 8) for code in range(8, 16)},
+}
+FLAC_BLOCK_SIZE_FIELDS = {6: 1, 7: 2}
+FLAC_SAMPLERATE_FIELDS = {12: 1, 13: 2, 14: 2}  # Частота в конце заголовка кадра
+
+
+class _FlacStreamInfo(NamedTuple):
+    """Параметры потока FLAC из STREAMINFO, нужные для проверки отпечатка"""
+
+    max_block_size: int
+    max_frame_size: int
+    total_samples: int
+    digest: str
+
+
+class AudioFingerprint:
+    """Отпечаток аудио по декодированному PCM, а не по байтам файла.
+
+    Отпечаток PCM - параметры потока и MD5 семплов, как в STREAMINFO FLAC:
+        - WAV - MD5 семплов чанка 'data' (метаданные и заголовок не учитываются);
+        - FLAC - MD5 несжатых семплов из STREAMINFO, если первый кадр файла начинается
+          с семпла 0, а последний заканчивается на `total_samples` из STREAMINFO (иначе
+          заголовок описывает не этот файл, например сегмент из сегмент-мюксера FFmpeg);
+        - остальные форматы и непроверенный FLAC - SHA-256 содержимого файла целиком.
+
+    Поэтому одна и та же запись в WAV и во FLAC (с любым уровнем сжатия и тегами)
+    даёт один отпечаток. Контент принимается частями, что подходит для потокового
+    чтения из хранилища.
+
+    Example:
+        >>> fingerprint = AudioFingerprint()
+        >>> async for chunk in claim_check.stream(segment):
+        ...     if fingerprint.update(chunk):
+        ...         break
+        >>> fingerprint.hexdigest()
+    """
+
+    def __init__(self) -> None:
+        self._header = bytearray()
+        self._tail = bytearray()  # Конец FLAC файла для поиска последнего кадра
+        self._flac: _FlacStreamInfo | None = None
+        self._kind: Literal["pcm", "flac", "raw"] | None = None
+        self._hash = hashlib.sha256()
+        self._samples_hash = hashlib.md5(usedforsecurity=False)
+        self._wav_format: tuple[int, int, int, int] | None = None  # Частота, каналы, биты, блок
+        self._samples_size = 0
+        self._remaining: int | None = None  # Сколько байт семплов WAV осталось (None - до конца)
+        self._digest: str | None = None
+
+    @property
+    def done(self) -> bool:
+        """Отпечаток готов и дальнейшее содержимое не требуется"""
+
+        return self._digest is not None
+
+    def _detect(self) -> None:
+        """Определение формата по накопленному заголовку и начало хеширования семплов"""
+
+        header = bytes(self._header)
+        if (flac := _parse_flac_stream_info(header)) is not None:
+            self._kind = "flac"
+            self._flac = flac
+            self._hash.update(header)
+            self._tail.extend(header)
+            return
+        if (wav_data := _find_wav_data(header)) is not None:
+            data_offset, data_size, self._wav_format = wav_data
+            self._kind = "pcm"
+            self._remaining = None if data_size in {0, UNKNOWN_SIZE} else data_size
+            self._consume(header[data_offset:])
+            return
+        is_unknown_format = (
+                len(header) >= len(FLAC_MARKER) and not header.startswith((b"RIFF", FLAC_MARKER))
+        )
+        # FLAC без MD5 или количества семплов в STREAMINFO
+        is_unknown_format |= header.startswith(FLAC_MARKER) and len(header) >= FLAC_HEADER_SIZE
+        if is_unknown_format or len(header) >= MAX_HEADER_SIZE:
+            self._kind = "raw"
+            self._hash.update(header)
+
+    def _consume(self, data: bytes | bytearray | memoryview) -> None:
+        if self._kind == "flac":
+            self._consume_flac(data)
+            return
+        if self._kind == "raw":
+            self._hash.update(data)
+            return
+        if self._remaining is not None:
+            data = data[:self._remaining]
+            self._remaining -= len(data)
+        self._samples_hash.update(data)
+        self._samples_size += len(data)
+
+    def _consume_flac(self, data: bytes | bytearray | memoryview) -> None:
+        """FLAC хешируется целиком на случай, если STREAMINFO не совпадёт с кадрами,
+        начало файла хранится для первого кадра, конец - для последнего
+        """
+
+        self._hash.update(data)
+        if len(self._header) < MAX_HEADER_SIZE:
+            self._header.extend(data[:MAX_HEADER_SIZE - len(self._header)])
+        self._tail.extend(data)
+        frame_size = self._flac.max_frame_size or FLAC_DEFAULT_FRAME_SIZE
+        del self._tail[:-(frame_size + FLAC_FRAME_HEADER_MAX_SIZE)]
+
+    def _flac_digest(self) -> str:
+        """Отпечаток PCM из STREAMINFO, если он подтверждается кадрами файла, иначе SHA-256"""
+
+        flac = self._flac
+        first_frame_offset = _find_flac_frames(self._header)
+        first_frame = (
+            _parse_flac_frame(self._header, first_frame_offset, flac.max_block_size)
+            if first_frame_offset is not None
+            else None
+        )
+        last_frame = _find_last_flac_frame(bytes(self._tail), flac.max_block_size)
+        if (
+                first_frame is not None
+                and first_frame[0] == 0
+                and last_frame is not None
+                and sum(last_frame) == flac.total_samples
+        ):
+            return flac.digest
+        return f"raw:{self._hash.hexdigest()}"
+
+    def update(self, data: bytes | bytearray | memoryview) -> bool:
+        """Добавление очередной части контента.
+
+        :param data: Часть содержимого аудио файла (по порядку).
+        :returns: Готов ли отпечаток (дальше контент можно не читать).
+        """
+
+        if self._digest is not None:
+            return True
+        if self._kind is None:
+            self._header.extend(data)
+            self._detect()
+        else:
+            self._consume(data)
+        if self._wav_format is not None and self._remaining == 0:
+            self._digest = self._wav_digest()
+        return self._digest is not None
+
+    def _wav_digest(self) -> str:
+        samplerate, channels, bits, block_align = self._wav_format
+        total_samples = self._samples_size // block_align if block_align else 0
+        return _pcm_digest(samplerate, channels, bits, total_samples, self._samples_hash.digest())
+
+    def hexdigest(self) -> str:
+        """Отпечаток аудио, вычисленный по переданному контенту"""
+
+        if self._digest is not None:
+            return self._digest
+        if self._flac is not None:
+            return self._flac_digest()
+        if self._wav_format is not None:
+            # Размер чанка 'data' не записан (запись в pipe): семплы до конца файла
+            return self._wav_digest()
+        if self._kind is None:
+            # Заголовок не распознан до конца контента: хешируется всё, что пришло
+            self._hash.update(self._header)
+        return f"raw:{self._hash.hexdigest()}"
+
+
+def _pcm_digest(samplerate: int, channels: int, bits: int, total_samples: int, md5: bytes) -> str:
+    return f"pcm:{samplerate}:{channels}:{bits}:{total_samples}:{md5.hex()}"
+
+
+def _parse_flac_stream_info(header: bytes) -> _FlacStreamInfo | None:
+    """Параметры потока и отпечаток PCM из STREAMINFO
+    (None, если это не FLAC или кодировщик не записал MD5 или количество семплов)
+    """
+
+    if len(header) < FLAC_HEADER_SIZE or not header.startswith(FLAC_MARKER):
+        return None
+    if header[len(FLAC_MARKER)] & 0x7F != FLAC_STREAMINFO:
+        return None
+    md5 = header[FLAC_MD5_OFFSET:FLAC_HEADER_SIZE]
+    # 20 бит частоты, 3 бита каналов - 1, 5 бит глубины - 1, 36 бит семплов
+    (packed,) = struct.unpack_from(">Q", header, FLAC_STREAM_OFFSET)
+    total_samples = packed & 0xFFFFFFFFF
+    if not any(md5) or not total_samples:
+        return None
+    return _FlacStreamInfo(
+        max_block_size=int.from_bytes(header[FLAC_BLOCK_SIZE_OFFSET:FLAC_BLOCK_SIZE_OFFSET + 2]),
+        max_frame_size=int.from_bytes(header[FLAC_FRAME_SIZE_OFFSET:FLAC_FRAME_SIZE_OFFSET + 3]),
+        total_samples=total_samples,
+        digest=_pcm_digest(
+            samplerate=packed >> 44,
+            channels=((packed >> 41) & 0x07) + 1,
+            bits=((packed >> 36) & 0x1F) + 1,
+            total_samples=total_samples,
+            md5=md5,
+        ),
+    )
+
+
+def _find_flac_frames(header: bytes | bytearray) -> int | None:
+    """Смещение первого кадра FLAC - после последнего блока метаданных
+    (None, если метаданные не уместились в заголовок)
+    """
+
+    position = len(FLAC_MARKER)
+    while position + 4 <= len(header):
+        is_last = header[position] & 0x80
+        position += 4 + int.from_bytes(header[position + 1:position + 4])
+        if is_last:
+            return position
+    return None
+
+
+def _crc8(data: bytes | bytearray) -> int:
+    """CRC-8 заголовка кадра FLAC (полином x^8 + x^2 + x + 1)"""
+
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+def _parse_flac_frame(
+        data: bytes | bytearray, position: int, max_block_size: int
+) -> tuple[int, int] | None:
+    """Первый семпл и размер блока кадра FLAC по его заголовку
+    (None, если по смещению нет заголовка кадра с верной CRC-8)
+    """
+
+    header = data[position:position + FLAC_FRAME_HEADER_MAX_SIZE]
+    is_header = (
+            len(header) >= FLAC_FRAME_HEADER_MIN_SIZE
+            and header[:2] in FLAC_FRAME_SYNC
+            and not header[3] & 0x01
+    )
+    if not is_header:
+        return None
+    block_code, rate_code = header[2] >> 4, header[2] & 0x0F
+    is_reserved = block_code not in FLAC_BLOCK_SIZES and block_code not in FLAC_BLOCK_SIZE_FIELDS
+    if is_reserved or rate_code == FLAC_INVALID_SAMPLERATE:
+        return None
+    # Номер кадра (фиксированный блок) или первого семпла (переменный) в кодировке UTF-8
+    length = 8 - (~header[4] & 0xFF).bit_length() if header[4] & 0x80 else 1
+    if not 1 <= length <= FLAC_MAX_NUMBER_SIZE:
+        return None
+    number = header[4] & (0x7F >> length) if length > 1 else header[4]
+    for byte in header[5:4 + length]:
+        if byte & 0xC0 != UTF8_CONTINUATION:
+            return None
+        number = (number << 6) | (byte & 0x3F)
+    position = 4 + length
+    size_length = FLAC_BLOCK_SIZE_FIELDS.get(block_code, 0)
+    block_size = FLAC_BLOCK_SIZES.get(block_code) or (
+        int.from_bytes(header[position:position + size_length]) + 1
+    )
+    position += size_length + FLAC_SAMPLERATE_FIELDS.get(rate_code, 0)
+    if position >= len(header) or _crc8(header[:position]) != header[position]:
+        return None
+    is_variable = header[1] & 0x01
+    return (number if is_variable else number * max_block_size), block_size
+
+
+def _find_last_flac_frame(tail: bytes, max_block_size: int) -> tuple[int, int] | None:
+    """Последний кадр FLAC в конце файла: первый семпл и размер блока"""
+
+    position = len(tail)
+    while (position := tail.rfind(b"\xff", 0, position)) >= 0:
+        if (frame := _parse_flac_frame(tail, position, max_block_size)) is not None:
+            return frame
+    return None
+
+
+def _find_wav_data(header: bytes) -> tuple[int, int, tuple[int, int, int, int]] | None:
+    """Смещение и размер чанка 'data' и параметры семплов из чанка 'fmt '"""
+
+    if len(header) < RIFF_HEADER.size:
+        return None
+    riff, _, wave = RIFF_HEADER.unpack_from(header, 0)
+    if riff != b"RIFF" or wave != b"WAVE":
+        return None
+    wav_format: tuple[int, int, int, int] | None = None
+    position = RIFF_HEADER.size
+    while position + CHUNK_HEADER.size <= len(header):
+        chunk_id, chunk_size = CHUNK_HEADER.unpack_from(header, position)
+        position += CHUNK_HEADER.size
+        if chunk_id == b"fmt " and position + WAVE_FORMAT.size <= len(header):
+            _, channels, samplerate, _, block_align, bits = WAVE_FORMAT.unpack_from(
+                header, position
+            )
+            wav_format = (samplerate, channels, bits, block_align)
+        elif chunk_id == b"data":
+            return (position, chunk_size, wav_format) if wav_format is not None else None
+        position += chunk_size + chunk_size % 2
+    return None
+
+
+def fingerprint_audio(data: bytes | bytearray | memoryview) -> str:
+    """Отпечаток аудио по декодированному PCM (см. `AudioFingerprint`).
+
+    :param data: Содержимое аудио файла.
+    :returns: Отпечаток 'pcm:<частота>:<каналы>:<биты>:<семплы>:<md5>' или 'raw:<sha256>'.
+    """
+
+    fingerprint = AudioFingerprint()
+    fingerprint.update(data)
+    return fingerprint.hexdigest()
+
+
+async def fingerprint_audio_stream(chunks: AsyncIterable[bytes]) -> str:
+    """Отпечаток аудио по потоку частей контента, чтение прекращается как только он готов.
+
+    :param chunks: Асинхронный итератор частей содержимого аудио файла.
+    :returns: Отпечаток 'pcm:<частота>:<каналы>:<биты>:<семплы>:<md5>' или 'raw:<sha256>'.
+    """
+
+    fingerprint = AudioFingerprint()
+    async for chunk in chunks:
+        if fingerprint.update(chunk):
+            break
+    return fingerprint.hexdigest()
@@ -0,0 +1,113 @@
+from typing import TypedDict
+
+import math
+import mmap
+import struct
+from pathlib import Path
+
+RIFF_HEADER = struct.Struct("<4sI4s")  # 'RIFF', размер, 'WAVE'
+CHUNK_HEADER = struct.Struct("<4sI")  # Идентификатор и размер RIFF чанка
+WAVE_FORMAT = struct.Struct("<HHIIHH")  # Кодек, каналы, частота, байт/сек, блок, бит/семпл
+FLAC_MARKER = b"fLaC"
+FLAC_STREAMINFO = 0  # Тип метаданных STREAMINFO (всегда первый блок FLAC)
+FLAC_STREAMINFO_SIZE = 34
+UNKNOWN_SIZE = 0xFFFFFFFF  # Размер чанка при записи в pipe (не дописан после записи)
+
+
+class AudioInfo(TypedDict):
+    """Информация об аудио файле
+
+    Attributes:
+        duration: Продолжительность в секундах
+        samplerate: Частота дискретизации
+        channels: Количество каналов
+        birate: Бит-рейт
+    """
+
+    duration: int
+    samplerate: int
+    channels: int
+    bitrate: int
+
+
+def _parse_wav_header(data: bytes | mmap.mmap) -> AudioInfo | None:
+    """Разбор RIFF/WAVE: параметры из чанка 'fmt ', продолжительность по размеру 'data'"""
+
+    if len(data) < RIFF_HEADER.size:
+        return None
+    riff, _, wave = RIFF_HEADER.unpack_from(data, 0)
+    if riff != b"RIFF" or wave != b"WAVE":
+        return None
+    channels = samplerate = byte_rate = 0
+    position = RIFF_HEADER.size
+    while position + CHUNK_HEADER.size <= len(data):
+        chunk_id, chunk_size = CHUNK_HEADER.unpack_from(data, position)
+        position += CHUNK_HEADER.size
+        if chunk_id == b"fmt " and position + WAVE_FORMAT.size <= len(data):
+            _, channels, samplerate, byte_rate, _, _ = WAVE_FORMAT.unpack_from(data, position)
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            available = len(data) - position
+            data_size = (
+                available if chunk_size in {0, UNKNOWN_SIZE} else min(chunk_size, available)
+            )
+            return {
+                "duration": math.floor(data_size / byte_rate),
+                "samplerate": samplerate,
+                "channels": channels,
+                "bitrate": byte_rate * 8,
+            }
+        # Чанки выровнены по чётной границе
+        position += chunk_size + chunk_size % 2
+    return None
+
+
+def _parse_flac_header(data: bytes | mmap.mmap) -> AudioInfo | None:
+    """Разбор FLAC: параметры и количество семплов из блока STREAMINFO"""
+
+    header_end = len(FLAC_MARKER) + 4 + FLAC_STREAMINFO_SIZE
+    if len(data) < header_end or data[:len(FLAC_MARKER)] != FLAC_MARKER:
+        return None
+    block_type = data[len(FLAC_MARKER)] & 0x7F
+    if block_type != FLAC_STREAMINFO:
+        return None
+    # STREAMINFO: 20 бит частоты, 3 бита каналов - 1, 5 бит глубины - 1, 36 бит семплов
+    (packed,) = struct.unpack_from(">Q", data, len(FLAC_MARKER) + 4 + 10)
+    samplerate = packed >> 44
+    channels = ((packed >> 41) & 0x07) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    if not samplerate or not total_samples:
+        return None
+    length = total_samples / samplerate
+    return {
+        "duration": math.floor(length),
+        "samplerate": samplerate,
+        "channels": channels,
+        "bitrate": round(len(data) * 8 / length),
+    }
+
+
+def parse_audio_header(data: bytes | mmap.mmap) -> AudioInfo | None:
+    """Получение информации об аудио по заголовку WAV или FLAC, без сторонних процессов.
+
+    :param data: Содержимое аудио файла (байты или mmap).
+    :returns: Информация об аудио или None, если формат не поддерживается или заголовок неполный.
+    """
+
+    return _parse_wav_header(data) or _parse_flac_header(data)
+
+
+def read_audio_header(filepath: Path) -> AudioInfo | None:
+    """Получение информации об аудио файле по заголовку WAV или FLAC через mmap.
+
+    :param filepath: Путь до аудио файла.
+    :returns: Информация об аудио или None, если формат не поддерживается.
+    """
+
+    with open(filepath, mode="rb") as file:
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return parse_audio_header(data)
+        except ValueError:  # Пустой файл нельзя отобразить в память
+            return None
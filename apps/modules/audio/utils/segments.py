@@ -0,0 +1,87 @@
+from typing import Any, NamedTuple
+
+import math
+
+
+class SegmentBounds(NamedTuple):
+    """Границы сегмента записи
+
+    Attributes:
+        start: Начало сегмента в секундах (с учётом перекрытия)
+        end: Конец сегмента в секундах (None - до конца записи)
+        overlap: Перекрытие начала сегмента с концом предыдущего в секундах
+    """
+
+    start: float
+    end: float | None
+    overlap: float
+
+
+def uniform_cut_points(duration: float, segment_duration: float) -> list[float]:
+    """Точки разреза записи на равные сегменты.
+
+    :param duration: Продолжительность записи в секундах.
+    :param segment_duration: Продолжительность сегмента в секундах.
+    :returns: Времена разрезов в секундах, пустой список если разрезать не нужно.
+    """
+
+    segments_count = math.ceil(duration / segment_duration) if duration > 0 else 1
+    return [float(segment_duration * number) for number in range(1, segments_count)]
+
+
+def overlapping_bounds(cut_points: list[float], overlap: float) -> list[SegmentBounds]:
+    """Границы сегментов с перекрытием: каждый сегмент, кроме первого,
+    начинается на `overlap` секунд раньше точки разреза.
+
+    :param cut_points: Отсортированные времена разрезов в секундах.
+    :param overlap: Продолжительность перекрытия в секундах.
+    :returns: Границы сегментов по порядку.
+    """
+
+    starts, ends = [0.0, *cut_points], [*cut_points, None]
+    bounds: list[SegmentBounds] = []
+    for previous_start, start, end in zip([0.0, *starts], starts, ends, strict=False):
+        # Перекрытие не может выходить за начало предыдущего сегмента
+        segment_overlap = round(min(overlap, start - previous_start), 3)
+        bounds.append(
+            SegmentBounds(start=start - segment_overlap, end=end, overlap=segment_overlap)
+        )
+    return bounds
+
+
+class TimelineSpan(NamedTuple):
+    """Запись на общем таймлайне коллекции
+
+    Attributes:
+        record_id: Идентификатор записи
+        start: Начало записи на таймлайне в секундах
+        duration: Продолжительность записи в секундах
+    """
+
+    record_id: str
+    start: float
+    duration: float
+
+
+def map_timeline(spans: list[TimelineSpan], start: float, end: float) -> list[dict[str, Any]]:
+    """Карта записей, попавших в отрезок таймлайна `[start, end)`.
+
+    :param spans: Записи на таймлайне по порядку.
+    :param start: Начало отрезка (сегмента) на таймлайне в секундах.
+    :param end: Конец отрезка на таймлайне в секундах.
+    :returns: Для каждой записи: её идентификатор, смещение внутри записи,
+    смещение внутри сегмента и продолжительность пересечения (в секундах).
+    """
+
+    records: list[dict[str, Any]] = []
+    for span in spans:
+        span_start, span_end = max(span.start, start), min(span.start + span.duration, end)
+        if span_end <= span_start:
+            continue
+        records.append({
+            "record_id": span.record_id,
+            "record_offset": round(span_start - span.start, 3),
+            "segment_offset": round(span_start - start, 3),
+            "duration": round(span_end - span_start, 3),
+        })
+    return records
@@ -0,0 +1,65 @@
+import numpy as np
+
+SILENCE_DB = -90.0  # Уровень энергии для абсолютной тишины (в dBFS)
+# Штраф за удалённость разреза от целевой точки (в dB на секунду): среди одинаково тихих
+# участков выбирается ближайший к цели, и сегменты не укорачиваются без необходимости
+DISTANCE_PENALTY_DB = 0.01
+
+
+def compute_energy_envelope(samples: np.ndarray, frame_size: int) -> np.ndarray:
+    """Вычисление огибающей энергии (RMS по фреймам) в dBFS.
+
+    :param samples: Моно PCM 16-bit семплы.
+    :param frame_size: Размер фрейма в семплах (неполный хвост отбрасывается).
+    :returns: Массив уровней энергии по фреймам в dBFS.
+    """
+
+    frames_count = len(samples) // frame_size
+    if frames_count == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = samples[:frames_count * frame_size].reshape(frames_count, frame_size)
+    normalized = frames.astype(np.float32) / np.iinfo(np.int16).max
+    rms = np.sqrt(np.mean(np.square(normalized), axis=1))
+    return np.maximum(20 * np.log10(np.maximum(rms, 1e-10)), SILENCE_DB).astype(np.float32)
+
+
+def choose_cut_points(
+        envelope: np.ndarray,
+        frame_duration: float,
+        target_duration: float,
+        search_window: float,
+        pause_duration: float = 0.3,
+) -> list[float]:
+    """Выбор точек разреза в паузах рядом с целевой продолжительностью сегмента.
+
+    Для каждого следующего сегмента ищется самый тихий участок (сглаженная энергия
+    на отрезке `pause_duration`) в окне `[target - search_window, target]` от предыдущего
+    разреза, поэтому сегменты никогда не превышают целевую продолжительность.
+    При равной энергии предпочитается участок ближе к цели (`DISTANCE_PENALTY_DB`).
+
+    :param envelope: Огибающая энергии в dBFS (см. `compute_energy_envelope`).
+    :param frame_duration: Продолжительность фрейма огибающей в секундах.
+    :param target_duration: Целевая продолжительность сегмента в секундах.
+    :param search_window: Размер окна поиска паузы в секундах.
+    :param pause_duration: Минимальная продолжительность паузы для сглаживания в секундах.
+    :returns: Отсортированные времена разрезов в секундах от начала записи.
+    """
+
+    total_frames = len(envelope)
+    target_frames = max(int(target_duration / frame_duration), 1)
+    window_frames = min(max(int(search_window / frame_duration), 1), target_frames)
+    pause_frames = max(int(pause_duration / frame_duration), 1)
+    # Скользящее среднее, чтобы предпочитать длинные паузы коротким провалам между словами
+    smoothed = np.convolve(envelope, np.ones(pause_frames) / pause_frames, mode="same")
+    # Расстояние от каждого фрейма окна до целевой точки разреза в секундах
+    penalty = DISTANCE_PENALTY_DB * frame_duration * np.arange(window_frames, 0, -1)
+    cut_points: list[float] = []
+    last_cut = 0
+    while total_frames - last_cut > target_frames:
+        window_end = last_cut + target_frames
+        window_start = window_end - window_frames
+        cut = window_start + int(np.argmin(smoothed[window_start:window_end] + penalty))
+        cut = max(cut, last_cut + 1)
+        cut_points.append(round(cut * frame_duration, 3))
+        last_cut = cut
+    return cut_points
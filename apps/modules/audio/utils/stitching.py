@@ -0,0 +1,153 @@
+from typing import NamedTuple
+
+import math
+import re
+from collections.abc import Iterable
+from difflib import SequenceMatcher
+
+from ..domain import TranscriptionSegment
+
+MAX_WORDS_PER_SECOND = 4  # Верхняя оценка темпа речи (слов в секунду)
+ALIGNMENT_MARGIN = 5  # Запас слов на погрешность границ перекрытия
+MIN_MATCH_WORDS = 2  # Минимальная длина совпадения (в словах речи) для склейки по перекрытию
+# Строка между текстами сегментов: спикеры нумеруются заново в каждой задаче распознавания,
+# поэтому '(1)' до и после границы могут быть разными людьми
+SEGMENT_BREAK = "---"
+
+# Реплика `RecognizedSpeechList.to_markdown`: '<номер>. <текст> (<спикер>) [<эмоция>]'
+_PHRASE = re.compile(
+    r"^(?P<number>\d+\.\s+)(?P<text>.*?)"
+    r"(?:\s+\(-?\d+\))?(?:\s+\[(?:positive|neutral|negative)\])?\s*$"
+)
+_PUNCTUATION = re.compile(r"[^\w]+", flags=re.UNICODE)
+_WORD = re.compile(r"\S+")
+
+
+class _Word(NamedTuple):
+    """Слово речи: строка текста, положение в тексте реплики и нормализованная форма"""
+
+    line: int
+    start: int
+    end: int
+    normalized: str
+
+
+def _normalize_word(word: str) -> str:
+    return _PUNCTUATION.sub("", word.lower().replace("ё", "е"))
+
+
+def _split_phrase(line: str) -> tuple[str, str, str]:
+    """Разбор строки на номер реплики, текст и метки спикера и эмоции.
+    Строка не в формате `to_markdown` целиком считается текстом.
+    """
+
+    match = _PHRASE.match(line)
+    if match is None:
+        return "", line, ""
+    return match["number"], match["text"], line[match.end("text"):]
+
+
+def _extract_words(phrases: list[tuple[str, str, str]]) -> list[_Word]:
+    """Слова речи из текстов реплик (без нумерации, меток и отдельной пунктуации)"""
+
+    words: list[_Word] = []
+    for line, (_, text, _) in enumerate(phrases):
+        words.extend(
+            _Word(line, word.start(), word.end(), normalized)
+            for word in _WORD.finditer(text)
+            if (normalized := _normalize_word(word.group()))
+        )
+    return words
+
+
+def _align(
+        left_words: list[_Word], right_words: list[_Word], overlap: float
+) -> tuple[int, int] | None:
+    """Выравнивание хвоста левого текста с началом правого по словам речи.
+
+    :returns: Индексы последнего общего слова слева и справа (None без надёжного совпадения).
+    """
+
+    window = math.ceil(overlap * MAX_WORDS_PER_SECOND) + ALIGNMENT_MARGIN
+    tail_start = max(len(left_words) - window, 0)
+    tail, head = left_words[tail_start:], right_words[:window]
+    if overlap <= 0 or not tail or not head:
+        return None
+    matcher = SequenceMatcher(
+        None, [word.normalized for word in tail], [word.normalized for word in head],
+        autojunk=False,
+    )
+    match = matcher.find_longest_match(0, len(tail), 0, len(head))
+    if match.size < MIN_MATCH_WORDS:
+        return None
+    return tail_start + match.a + match.size - 1, match.b + match.size - 1
+
+
+def merge_overlapping_texts(
+        left: str, right: str, overlap: float, separator: str = "\n"
+) -> str:
+    """Склейка текстов соседних сегментов с удалением дублирующихся слов в зоне перекрытия.
+
+    Хвост левого текста и начало правого выравниваются только по словам речи:
+    номера реплик, метки спикеров и эмоций `to_markdown` в выравнивании не участвуют,
+    слова сравниваются без регистра и пунктуации. Самое длинное совпадение (не короче
+    `MIN_MATCH_WORDS` слов) считается общей частью перекрытия: слева берётся текст
+    до конца совпадения, справа - после него. Обрезанные реплики сохраняют свои номера
+    и метки, остальные строки не меняются. Без надёжного совпадения тексты объединяются
+    целиком: дубль на границе лучше потерянного текста.
+
+    :param left: Текст предыдущего сегмента.
+    :param right: Текст следующего сегмента (начинается с перекрытия).
+    :param overlap: Продолжительность перекрытия в секундах.
+    :param separator: Разделитель между частями левого и правого текста.
+    :returns: Склеенный текст.
+    """
+
+    left_lines, right_lines = left.strip().splitlines(), right.strip().splitlines()
+    left_phrases = [_split_phrase(line) for line in left_lines]
+    right_phrases = [_split_phrase(line) for line in right_lines]
+    left_words, right_words = _extract_words(left_phrases), _extract_words(right_phrases)
+    alignment = _align(left_words, right_words, overlap)
+    if alignment is None:
+        return _join(left, right, separator)
+    # Левая реплика обрезается после совпадения, правая - начинается со следующего слова
+    left_end = left_words[alignment[0]]
+    number, text, tags = left_phrases[left_end.line]
+    left_part = [*left_lines[:left_end.line], f"{number}{text[:left_end.end]}{tags}"]
+    right_end = right_words[alignment[1]]
+    following = right_words[alignment[1] + 1:alignment[1] + 2]
+    right_part: list[str] = []
+    if following and following[0].line == right_end.line:
+        number, text, tags = right_phrases[right_end.line]
+        right_part.append(f"{number}{text[following[0].start:]}{tags}")
+    right_part.extend(right_lines[right_end.line + 1:])
+    return _join("\n".join(left_part), "\n".join(right_part), separator)
+
+
+def _join(left: str, right: str, separator: str = "\n") -> str:
+    return separator.join(text for text in (left.strip(), right.strip()) if text)
+
+
+def stitch_transcriptions(segments: Iterable[TranscriptionSegment]) -> str:
+    """Сборка итогового текста из расшифровок сегментов.
+
+    Сегменты упорядочиваются по номеру, тексты сегментов с перекрытием склеиваются
+    через `merge_overlapping_texts`. Между текстами соседних сегментов ставится строка
+    `SEGMENT_BREAK`, чтобы реплики одинаково пронумерованных, но разных спикеров
+    не объединялись при сжатии расшифровки.
+
+    :param segments: Расшифровки сегментов (в произвольном порядке).
+    :returns: Текст расшифровки без дублей на границах сегментов.
+    """
+
+    separator = f"\n{SEGMENT_BREAK}\n"
+    text = ""
+    for segment in sorted(segments, key=lambda segment: segment.number):
+        segment_text = segment.text.strip()
+        if not segment_text:
+            continue
+        if text and segment.overlap > 0:
+            text = merge_overlapping_texts(text, segment_text, segment.overlap, separator)
+        else:
+            text = _join(text, segment_text, separator)
+    return text
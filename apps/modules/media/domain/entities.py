@@ -5,7 +5,7 @@ from collections.abc import AsyncIterable
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from pydantic import Field, NonPositiveInt, PositiveInt
+from pydantic import Field, NonNegativeInt, PositiveInt
 
 from modules.shared_kernel.domain import Entity
 from modules.shared_kernel.utils import current_datetime
@@ -42,7 +42,7 @@ class FilePart(File):
         total_parts: Общее количество частей.
     """
 
-    number: NonPositiveInt
+    number: NonNegativeInt
     total_size: PositiveInt
     total_parts: PositiveInt
 
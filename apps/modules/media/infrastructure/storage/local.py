@@ -1,5 +1,141 @@
+import logging
+import math
+import mimetypes
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import datetime
+from pathlib import Path
+
+import aiofiles
+import aiofiles.os
+
+from config.base import TIMEZONE
+
 from ...application import Storage
+from ...application.exceptions import (
+    DownloadFailedError,
+    RemovingFailedError,
+    UploadingFailedError,
+)
+from ...domain import File, FilePart, Filepath
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIME_TYPE = "application/octet-stream"
 
 
 class LocalStorage(Storage):
-    ...
+    """Реализация хранилища на локальном диске (замена S3 для разработки и одиночных узлов)"""
+
+    def __init__(self, base_dir: Path) -> None:
+        """
+        :param base_dir: Корневая директория хранилища.
+        """
+
+        self.base_dir = base_dir
+
+    def _resolve(self, filepath: Filepath) -> Path:
+        return self.base_dir / filepath
+
+    @staticmethod
+    def _guess_mime_type(filepath: Filepath) -> str:
+        mime_type, _ = mimetypes.guess_type(filepath)
+        return mime_type or DEFAULT_MIME_TYPE
+
+    async def upload(self, file: File) -> None:
+        path = self._resolve(file.path)
+        try:
+            await aiofiles.os.makedirs(path.parent, exist_ok=True)
+            async with aiofiles.open(path, mode="wb") as output:
+                await output.write(file.content)
+        except OSError as e:
+            raise UploadingFailedError(
+                f"File uploading failed with error: {e}",
+                details={"filepath": file.path, "filesize": file.size},
+                original_error=e
+            ) from e
+
+    async def upload_multipart(self, file_parts: AsyncIterable[FilePart]) -> None:
+        output = None
+        try:
+            async for file_part in file_parts:
+                if output is None:
+                    path = self._resolve(file_part.path)
+                    await aiofiles.os.makedirs(path.parent, exist_ok=True)
+                    output = await aiofiles.open(path, mode="wb")
+                await output.write(file_part.content)
+        except OSError as e:
+            raise UploadingFailedError(
+                f"Multipart upload failed with error: {e}",
+                details={"filepath": file_part.path, "filesize": file_part.size},
+                original_error=e
+            ) from e
+        finally:
+            if output is not None:
+                await output.close()
+
+    async def download(self, filepath: Filepath) -> File | None:
+        path = self._resolve(filepath)
+        if not await aiofiles.os.path.exists(path):
+            return None
+        try:
+            stat = await aiofiles.os.stat(path)
+            async with aiofiles.open(path, mode="rb") as file:
+                content = await file.read()
+        except OSError as e:
+            raise DownloadFailedError(
+                f"File download failed with error: {e}",
+                details={"filepath": filepath},
+                original_error=e
+            ) from e
+        return File(
+            path=filepath,
+            size=len(content),
+            mime_type=self._guess_mime_type(filepath),
+            content=content,
+            uploaded_at=datetime.fromtimestamp(stat.st_mtime, tz=TIMEZONE),
+        )
+
+    async def download_multipart(
+            self, filepath: Filepath, part_size: int
+    ) -> AsyncIterator[FilePart]:
+        path = self._resolve(filepath)
+        try:
+            stat = await aiofiles.os.stat(path)
+            filesize, mime_type = stat.st_size, self._guess_mime_type(filepath)
+            uploaded_at = datetime.fromtimestamp(stat.st_mtime, tz=TIMEZONE)
+            part_numbers = math.ceil(filesize / part_size)
+            async with aiofiles.open(path, mode="rb") as file:
+                for part_number in range(part_numbers):
+                    content = await file.read(part_size)
+                    yield FilePart(
+                        number=part_number,
+                        total_size=filesize,
+                        total_parts=part_numbers,
+                        path=filepath,
+                        size=len(content),
+                        mime_type=mime_type,
+                        content=content,
+                        uploaded_at=uploaded_at,
+                    )
+        except OSError as e:
+            raise DownloadFailedError(
+                f"File multipart downloading failed with error: {e}",
+                details={"filepath": filepath, "part_size": part_size},
+                original_error=e
+            ) from e
+
+    async def remove(self, filepath: Filepath) -> bool:
+        try:
+            await aiofiles.os.remove(self._resolve(filepath))
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            raise RemovingFailedError(
+                f"File remove failed with error: {e}",
+                details={"filepath": filepath},
+                original_error=e
+            ) from e
+        return True
+
+    async def exists(self, filepath: Filepath) -> bool:
+        return await aiofiles.os.path.exists(self._resolve(filepath))
@@ -1,3 +1,5 @@
+from typing import ClassVar
+
 import logging
 from datetime import timedelta
 
@@ -14,10 +16,12 @@ logger = logging.getLogger(__name__)
 class RedisKeyValueCache[T: BaseModel](KeyValueCache):
     """Базовый класс для реализации кеширования используя Redis backend.
     Поле класса `model` используется для автоматической сериализации
-    кешируемого объекта.
+    кешируемого объекта. Поле `sensitive` скрывает значения из логов и ошибок
+    (токены, расшифровки и прочие данные пользователей).
     """
 
     model: type[T]
+    sensitive: ClassVar[bool] = False
 
     def __init__(self, url: str, prefix: str, ttl: timedelta) -> None:
         """
@@ -51,12 +55,17 @@ class RedisKeyValueCache[T: BaseModel](KeyValueCache):
         try:
             await self.redis.set(built_key, value.model_dump_json())
             await self.redis.expire(built_key, actual_ttl)
-            logger.info(
-                "Cache set successfully",
-                extra={"key": built_key, "value": value.model_dump_json()}
-            )
+            if self.sensitive:
+                logger.info("Cache set successfully", extra={"key": built_key})
+            else:
+                logger.info(
+                    "Cache set successfully",
+                    extra={"key": built_key, "value": value.model_dump_json()}
+                )
         except RedisError as e:
-            raise CacheSetError(key=built_key, value=value, original_error=e) from e
+            raise CacheSetError(
+                key=built_key, value="<hidden>" if self.sensitive else value, original_error=e
+            ) from e
 
     async def invalidate(self, key: str) -> bool:
         built_key = self._build_key(key)
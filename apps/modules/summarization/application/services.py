@@ -0,0 +1,94 @@
+import logging
+import time
+from functools import cache
+
+from config.dev import settings
+from modules.shared_kernel.domain import AppError
+
+from ..infrastructure.summarizer import MapReduceSummarizer, create_summarizer
+from ..infrastructure.summary_cache import (
+    CachedSummary,
+    SummaryCache,
+    build_summary_key,
+    create_summary_cache,
+)
+from ..utils.compaction import compact_transcript
+
+logger = logging.getLogger(__name__)
+
+
+@cache
+def get_summarizer() -> MapReduceSummarizer:
+    """Общий суммаризатор процесса: лимит одновременных вызовов LLM общий для всех задач"""
+
+    return create_summarizer()
+
+
+@cache
+def get_summary_cache() -> SummaryCache | None:
+    """Общий кэш протоколов совещаний процесса"""
+
+    return create_summary_cache()
+
+
+async def draw_up_minutes(transcript: str) -> str:
+    """Составление протокола совещания потоком из LLM.
+
+    :param transcript: Полная расшифровка совещания.
+    :returns: Протокол в формате Markdown.
+    """
+
+    start_time = time.monotonic()
+    first_chunk_time: float | None = None
+    chunks: list[str] = []
+    async for chunk in get_summarizer().astream(transcript):
+        if first_chunk_time is None:
+            first_chunk_time = time.monotonic() - start_time
+        chunks.append(chunk)
+    logger.info(
+        "Meeting minutes drawn up in %.1f s (first chunk in %.1f s)",
+        time.monotonic() - start_time, first_chunk_time or 0,
+    )
+    return "".join(chunks)
+
+
+async def summarize_transcript(transcript: str) -> str:
+    """Протокол совещания по расшифровке: сжатие, затем протокол из кэша или от LLM.
+    Повторный запрос той же расшифровки (например, протокол в другом формате) - без LLM.
+
+    :param transcript: Полная расшифровка совещания (реплики `to_markdown`).
+    :returns: Протокол в формате Markdown.
+    """
+
+    if settings.summarizer.compact_transcript:
+        # В LLM уходят объединённые реплики спикеров, а не строка на каждую фразу
+        compacted = compact_transcript(transcript)
+        logger.info(
+            "Transcript compacted from %s to %s tokens (%s phrases into %s turns)",
+            compacted.tokens_before, compacted.tokens_after,
+            compacted.phrases_count, compacted.turns_count,
+        )
+        transcript = compacted.text
+    summary_cache = get_summary_cache()
+    if summary_cache is None:
+        return await draw_up_minutes(transcript)
+    cache_key = build_summary_key(
+        transcript,
+        prompt_version=get_summarizer().version,
+        model_name=settings.yandex_cloud.qwen3_235b,
+        temperature=settings.summarizer.temperature,
+    )
+    try:
+        cached_summary = await summary_cache.get(cache_key)
+    except AppError:
+        logger.warning("Summary cache is unavailable, key %s", cache_key, exc_info=True)
+        cached_summary = None
+    if cached_summary is not None:
+        logger.info("Meeting minutes taken from cache, key %s", cache_key)
+        return cached_summary.summary
+    summary = await draw_up_minutes(transcript)
+    try:
+        await summary_cache.set(cache_key, CachedSummary(summary=summary))
+    except AppError:
+        logger.warning("Meeting minutes are not cached, key %s", cache_key, exc_info=True)
+    return summary
@@ -0,0 +1,17 @@
+__all__ = (
+    "AudioSplitEvent",
+    "AudioTranscribedEvent",
+    "SoundEnhancedEvent",
+    "SummarizationTaskCreatedEvent",
+    "SummarizeTranscriptionCommand",
+    "TranscriptionSummarizedEvent",
+)
+
+from .commands import SummarizeTranscriptionCommand
+from .events import (
+    AudioSplitEvent,
+    AudioTranscribedEvent,
+    SoundEnhancedEvent,
+    SummarizationTaskCreatedEvent,
+    TranscriptionSummarizedEvent,
+)
@@ -0,0 +1,21 @@
+from uuid import UUID
+
+from pydantic import NonNegativeInt
+
+from modules.shared_kernel.domain import Command
+
+
+class SummarizeTranscriptionCommand(Command):
+    """Суммаризация полной расшифровки аудио коллекции
+
+    Attributes:
+        task_id: Идентификатор задачи суммаризации.
+        collection_id: Идентификатор аудио коллекции.
+        segments_count: Количество сегментов, из которых собрана расшифровка.
+        transcript: Упорядоченный текст расшифровки.
+    """
+
+    task_id: UUID
+    collection_id: UUID
+    segments_count: NonNegativeInt
+    transcript: str
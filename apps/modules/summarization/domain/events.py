@@ -0,0 +1,69 @@
+from typing import ClassVar
+
+from uuid import UUID
+
+from pydantic import NonNegativeFloat, NonNegativeInt, PositiveInt
+
+from modules.shared_kernel.domain import Event
+
+
+class SummarizationTaskCreatedEvent(Event):
+    """Создана задача суммаризации аудио коллекции.
+
+    Attributes:
+        workspace_id: Пространство, в счёт доли которого выполняется задача
+        (по умолчанию - владелец коллекции)
+    """
+
+    event_type: ClassVar[str] = "summarization_task_created"
+
+    task_id: UUID
+    collection_id: UUID
+    workspace_id: UUID | None = None
+
+
+class AudioSplitEvent(Event):
+    event_type: ClassVar[str] = "audio_split"
+
+    task_id: UUID
+    collection_id: UUID
+    segments_count: NonNegativeInt
+
+
+class SoundEnhancedEvent(Event):
+    event_type: ClassVar[str] = "sound_enhanced"
+
+    collection_id: UUID
+
+
+class AudioTranscribedEvent(Event):
+    """Расшифровка одного сегмента аудио.
+
+    Attributes:
+        segment_id: Номер сегмента (натуральное число)
+        segments_count: Общее количество сегментов (None, если ещё неизвестно)
+        is_last: Номер сегмента совпадает с общим количеством (не значит, что он готов последним)
+        segment_offset: Смещение начала сегмента от начала записи в секундах
+        segment_overlap: Перекрытие начала сегмента с концом предыдущего в секундах
+    """
+
+    event_type: ClassVar[str] = "audio_transcribed"
+
+    task_id: UUID
+    collection_id: UUID
+    record_id: UUID | None = None
+    segment_id: PositiveInt
+    segment_duration: NonNegativeFloat
+    segments_count: PositiveInt | None = None
+    is_last: bool = False
+    segment_offset: NonNegativeFloat = 0
+    segment_overlap: NonNegativeFloat = 0
+    text: str
+
+
+class TranscriptionSummarizedEvent(Event):
+    event_type: ClassVar[str] = "transcription_summarized"
+
+    task_id: UUID
+    collection_id: UUID
+    summary: str
@@ -0,0 +1,20 @@
+from langchain_core.language_models import BaseChatModel
+from langchain_openai import ChatOpenAI
+
+from config.dev import settings
+
+
+def create_chat_model() -> BaseChatModel:
+    """Создание LLM для составления протоколов согласно настройкам (Yandex Cloud, OpenAI API).
+
+    :returns: Чат модель с поддержкой потоковой генерации.
+    """
+
+    return ChatOpenAI(
+        api_key=settings.yandex_cloud.apikey,
+        model=settings.yandex_cloud.qwen3_235b,
+        base_url=settings.yandex_cloud.base_url,
+        temperature=settings.summarizer.temperature,
+        max_retries=settings.summarizer.max_retries,
+        streaming=True,
+    )
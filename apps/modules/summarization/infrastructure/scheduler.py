@@ -0,0 +1,235 @@
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+from redis import RedisError
+from redis.asyncio import Redis
+
+from config.dev import settings
+
+logger = logging.getLogger(__name__)
+
+# Задача ставится в очередь пространства со сроком `время постановки + продолжительность`:
+# короткие задачи идут раньше длинных (SJF), но долго ждущая длинная задача не голодает.
+# Пространство, вернувшееся после простоя, начинает с текущего виртуального времени,
+# а не с отставания, накопленного за простой.
+SUBMIT_SCRIPT = """
+local queue_key = ARGV[1] .. ":queue:" .. ARGV[2]
+redis.call("ZADD", queue_key, ARGV[3], ARGV[4])
+if redis.call("ZSCORE", KEYS[1], ARGV[2]) == false then
+    local finish = tonumber(redis.call("HGET", KEYS[2], ARGV[2])) or 0
+    local clock = tonumber(redis.call("GET", KEYS[3])) or 0
+    redis.call("ZADD", KEYS[1], math.max(finish, clock), ARGV[2])
+end
+return redis.call("ZCARD", queue_key)
+"""
+
+# Выдача задач, пока есть свободные места: пространство с наименьшим виртуальным временем
+# (обслуженные секунды аудио / вес) отдаёт свою задачу с наименьшим сроком.
+# Место занято до `release` или истечения аренды, которую продлевают этапы пайплайна.
+DISPATCH_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local max_running = tonumber(ARGV[2])
+local lease = tonumber(ARGV[3])
+redis.call("ZREMRANGEBYSCORE", KEYS[4], "-inf", now)
+local dispatched = {}
+while redis.call("ZCARD", KEYS[4]) < max_running do
+    local head = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+    if #head == 0 then
+        break
+    end
+    local workspace, virtual_time = head[1], tonumber(head[2])
+    local queue_key = ARGV[1] .. ":queue:" .. workspace
+    local jobs = redis.call("ZRANGE", queue_key, 0, 0)
+    if #jobs == 0 then
+        redis.call("ZREM", KEYS[1], workspace)
+    else
+        redis.call("ZREM", queue_key, jobs[1])
+        local task = cjson.decode(jobs[1])
+        local weight = tonumber(redis.call("HGET", KEYS[5], workspace)) or 1
+        redis.call("SET", KEYS[3], virtual_time)
+        local finish = virtual_time + math.max(tonumber(task["duration"]) or 0, 1) / weight
+        if redis.call("ZCARD", queue_key) == 0 then
+            redis.call("ZREM", KEYS[1], workspace)
+            redis.call("HSET", KEYS[2], workspace, finish)
+        else
+            redis.call("ZADD", KEYS[1], finish, workspace)
+        end
+        redis.call("ZADD", KEYS[4], now + lease, task["task_id"])
+        table.insert(dispatched, jobs[1])
+    end
+end
+return dispatched
+"""
+
+# Продление аренды места задачи, если она ещё его занимает (освобождённое место не занимается)
+RENEW_SCRIPT = """
+if redis.call("ZSCORE", KEYS[1], ARGV[1]) == false then
+    return 0
+end
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+redis.call("ZADD", KEYS[1], now + tonumber(ARGV[2]), ARGV[1])
+return 1
+"""
+
+DEFAULT_LEASE = 30 * 60  # Время занятия места задачей без продления этапами (в секундах)
+
+
+class ScheduledTask(BaseModel):
+    """Задача суммаризации в очереди планировщика
+
+    Attributes:
+        task_id: Идентификатор задачи суммаризации
+        collection_id: Идентификатор аудио коллекции
+        workspace_id: Пространство (арендатор), между которыми делится пайплайн
+        duration: Общая продолжительность аудио коллекции в секундах
+        submitted_at: Время постановки в очередь (Unix time)
+    """
+
+    task_id: UUID
+    collection_id: UUID
+    workspace_id: UUID
+    duration: float
+    submitted_at: float = Field(default_factory=time.time)
+
+
+class FairShareScheduler:
+    """Справедливое распределение аудио пайплайна между пространствами в Redis.
+
+    В пайплайне одновременно не больше `max_running` задач. Освободившееся место
+    получает пространство, которому досталось меньше всего секунд аудио с учётом веса
+    (weighted fair queuing), а внутри пространства - задача с наименьшим сроком
+    `время постановки + продолжительность` (короткие раньше длинных, но без голодания).
+    Десять трёхчасовых записей одного пространства не задерживают пятиминутные
+    звонки остальных: после одной длинной задачи пространство пропускает вперёд других.
+
+    Example:
+        >>> await scheduler.submit(ScheduledTask(..., workspace_id=workspace_id, duration=300))
+        >>> for task in await scheduler.dispatch():
+        ...     await publish(task)
+        >>> async with scheduler.hold(task_id):  # На каждом этапе пайплайна
+        ...     await process(segment)
+        >>> await scheduler.release(task_id)  # Когда задача прошла пайплайн
+    """
+
+    def __init__(
+            self,
+            redis: Redis,
+            max_running: int,
+            prefix: str = "scheduler",
+            lease: int = DEFAULT_LEASE,
+    ) -> None:
+        """
+        :param redis: Клиент Redis.
+        :param max_running: Максимальное количество задач в пайплайне одновременно.
+        :param prefix: Префикс ключей планировщика.
+        :param lease: Через сколько секунд место задачи освобождается без продления
+        и `release` (если задача потерялась по пути, например при сбое воркера).
+        """
+
+        self._redis = redis
+        self._max_running = max_running
+        self._prefix = prefix
+        self._lease = lease
+        self._submit_script = redis.register_script(SUBMIT_SCRIPT)
+        self._dispatch_script = redis.register_script(DISPATCH_SCRIPT)
+        self._renew_script = redis.register_script(RENEW_SCRIPT)
+
+    @property
+    def _keys(self) -> list[str]:
+        return [
+            f"{self._prefix}:active",
+            f"{self._prefix}:finish",
+            f"{self._prefix}:clock",
+            f"{self._prefix}:running",
+            f"{self._prefix}:weights",
+        ]
+
+    async def submit(self, task: ScheduledTask) -> int:
+        """Постановка задачи в очередь её пространства.
+
+        :param task: Задача суммаризации.
+        :returns: Количество задач в очереди пространства.
+        """
+
+        return await self._submit_script(
+            keys=self._keys[:3],
+            args=[
+                self._prefix,
+                f"{task.workspace_id}",
+                task.submitted_at + task.duration,
+                task.model_dump_json(),
+            ],
+        )
+
+    async def dispatch(self) -> list[ScheduledTask]:
+        """Выдача задач на свободные места пайплайна (места занимаются атомарно)"""
+
+        jobs = await self._dispatch_script(
+            keys=self._keys, args=[self._prefix, self._max_running, self._lease]
+        )
+        return [ScheduledTask.model_validate_json(job) for job in jobs]
+
+    async def release(self, task_id: UUID) -> None:
+        """Освобождение места задачи, прошедшей пайплайн"""
+
+        await self._redis.zrem(f"{self._prefix}:running", f"{task_id}")
+
+    async def renew(self, task_id: UUID) -> bool:
+        """Продление аренды места задачи, которая ещё в работе.
+
+        :param task_id: Идентификатор задачи суммаризации.
+        :returns: Занимает ли задача место (False - место уже освобождено или истекло).
+        """
+
+        return bool(await self._renew_script(
+            keys=[f"{self._prefix}:running"], args=[f"{task_id}", self._lease]
+        ))
+
+    @asynccontextmanager
+    async def hold(self, task_id: UUID) -> AsyncIterator[None]:
+        """Работа этапа пайплайна над задачей: аренда места продлевается, а при ошибке
+        этапа (сообщение отклоняется, и задача не дойдёт до конца) место освобождается.
+        Недоступный Redis не мешает этапу, а только логируется.
+
+        :param task_id: Идентификатор задачи суммаризации.
+        """
+
+        try:
+            await self.renew(task_id)
+        except RedisError:
+            logger.warning("Lease of task %s is not renewed", task_id, exc_info=True)
+        try:
+            yield
+        except Exception:
+            logger.warning("Task %s failed in the pipeline, releasing its slot", task_id)
+            try:
+                await self.release(task_id)
+            except RedisError:
+                logger.exception("Slot of task %s is not released", task_id)
+            raise
+
+    async def set_weight(self, workspace_id: UUID, weight: float) -> None:
+        """Вес пространства: доля пайплайна пропорциональна весу (по умолчанию 1)"""
+
+        await self._redis.hset(f"{self._prefix}:weights", f"{workspace_id}", weight)
+
+
+def create_scheduler() -> FairShareScheduler | None:
+    """Создание планировщика задач пайплайна согласно настройкам.
+
+    :returns: Планировщик или None, если задачи идут в пайплайн напрямую.
+    """
+
+    if not settings.scheduler.enabled:
+        return None
+    return FairShareScheduler(
+        Redis.from_url(settings.redis.url),
+        max_running=settings.scheduler.max_running_tasks,
+        lease=settings.scheduler.task_lease,
+    )
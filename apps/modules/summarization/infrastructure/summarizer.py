@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import logging
+from collections.abc import AsyncIterator, Callable
+from pathlib import Path
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from config.dev import settings
+
+from ..utils.tokens import estimate_tokens
+from .llms import create_chat_model
+
+logger = logging.getLogger(__name__)
+
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+
+MAP_PROMPT = (PROMPTS_DIR / "map.md").read_text(encoding="utf-8")
+REDUCE_PROMPT = (PROMPTS_DIR / "reduce.md").read_text(encoding="utf-8")
+MEETING_MINUTES_PROMPT = (PROMPTS_DIR / "meeting_minutes.md").read_text(encoding="utf-8")
+
+SUMMARIES_SEPARATOR = "\n\n---\n\n"
+
+
+class MapReduceSummarizer:
+    """Иерархическое составление протокола по длинной расшифровке.
+
+    Расшифровка делится на окна по `chunk_tokens` токенов (map), выжимки окон
+    объединяются деревом группами до `fan_in` (reduce), пока не уместятся в одно окно,
+    после чего протокол генерируется потоком. Все вызовы LLM идут конкурентно под общим
+    лимитом `max_concurrency`, поэтому задержка определяется глубиной дерева,
+    а не длиной расшифровки. Короткая расшифровка отправляется в LLM целиком.
+
+    Example:
+        >>> summarizer = MapReduceSummarizer(model, chunk_tokens=6000, max_concurrency=8)
+        >>> async for chunk in summarizer.astream(transcript):
+        ...     print(chunk, end="")
+    """
+
+    def __init__(
+            self,
+            model: BaseChatModel,
+            chunk_tokens: int = 6000,
+            chunk_overlap_tokens: int = 200,
+            max_concurrency: int = 8,
+            fan_in: int = 4,
+            length_function: Callable[[str], int] = estimate_tokens,
+    ) -> None:
+        """
+        :param model: Чат модель провайдера.
+        :param chunk_tokens: Размер окна расшифровки и бюджет входа reduce (в токенах).
+        :param chunk_overlap_tokens: Перекрытие соседних окон (в токенах).
+        :param max_concurrency: Максимальное количество одновременных вызовов LLM.
+        :param fan_in: Максимальное количество выжимок, объединяемых одним вызовом.
+        :param length_function: Подсчёт токенов текста (по умолчанию - оценка по символам).
+        """
+
+        self._chunk_tokens = chunk_tokens
+        self._chunk_overlap_tokens = chunk_overlap_tokens
+        self._fan_in = max(fan_in, 2)
+        self._length_function = length_function
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_tokens,
+            chunk_overlap=chunk_overlap_tokens,
+            length_function=length_function,
+            separators=["\n\n", "\n", ". ", " ", ""],
+        )
+        self._map_chain = ChatPromptTemplate.from_template(MAP_PROMPT) | model | StrOutputParser()
+        self._reduce_chain = (
+            ChatPromptTemplate.from_template(REDUCE_PROMPT) | model | StrOutputParser()
+        )
+        self._minutes_chain = (
+            ChatPromptTemplate.from_template(MEETING_MINUTES_PROMPT) | model | StrOutputParser()
+        )
+
+    @property
+    def version(self) -> str:
+        """Хеш шаблонов промптов и параметров разбиения, влияющих на результат"""
+
+        version_hash = hashlib.sha256()
+        for prompt in (MAP_PROMPT, REDUCE_PROMPT, MEETING_MINUTES_PROMPT):
+            version_hash.update(prompt.encode("utf-8"))
+        version_hash.update(
+            f"{self._chunk_tokens}:{self._chunk_overlap_tokens}:{self._fan_in}".encode()
+        )
+        return version_hash.hexdigest()
+
+    async def _summarize_chunk(self, chunk: str, part: int, parts: int) -> str:
+        async with self._semaphore:
+            return await self._map_chain.ainvoke(
+                {"transcription": chunk, "part": part, "parts": parts}
+            )
+
+    async def _combine(self, summaries: list[str]) -> str:
+        if len(summaries) == 1:
+            return summaries[0]
+        async with self._semaphore:
+            return await self._reduce_chain.ainvoke(
+                {"summaries": SUMMARIES_SEPARATOR.join(summaries)}
+            )
+
+    def _group(self, summaries: list[str]) -> list[list[str]]:
+        """Группировка соседних выжимок: до `fan_in` штук в пределах бюджета окна"""
+
+        groups: list[list[str]] = []
+        group_tokens = 0
+        for summary in summaries:
+            tokens = self._length_function(summary)
+            if (
+                    groups
+                    and len(groups[-1]) < self._fan_in
+                    and group_tokens + tokens <= self._chunk_tokens
+            ):
+                groups[-1].append(summary)
+                group_tokens += tokens
+            else:
+                groups.append([summary])
+                group_tokens = tokens
+        if len(groups) == len(summaries):
+            # Выжимки слишком длинные для бюджета: объединяются по `fan_in`, чтобы дерево сходилось
+            return [
+                summaries[i:i + self._fan_in] for i in range(0, len(summaries), self._fan_in)
+            ]
+        return groups
+
+    async def reduce(self, summaries: list[str]) -> list[str]:
+        """Объединение выжимок деревом, пока они не уместятся в одно окно.
+
+        :param summaries: Выжимки последовательных частей расшифровки.
+        :returns: Выжимки, суммарно укладывающиеся в `chunk_tokens` (чаще всего одна).
+        """
+
+        level = 0
+        while (
+                len(summaries) > 1
+                and sum(map(self._length_function, summaries)) > self._chunk_tokens
+        ):
+            level += 1
+            groups = self._group(summaries)
+            logger.debug(
+                "Reduce level %s: %s summaries into %s", level, len(summaries), len(groups)
+            )
+            summaries = await asyncio.gather(*(self._combine(group) for group in groups))
+        return summaries
+
+    async def astream(self, transcript: str) -> AsyncIterator[str]:
+        """Потоковое составление протокола совещания по расшифровке.
+
+        :param transcript: Полная расшифровка совещания.
+        :returns: Части протокола в формате Markdown по мере генерации.
+        """
+
+        chunks = self._splitter.split_text(transcript)
+        if len(chunks) > 1:
+            logger.info("Transcript split into %s chunks for map-reduce", len(chunks))
+            summaries = await asyncio.gather(*(
+                self._summarize_chunk(chunk, part=i, parts=len(chunks))
+                for i, chunk in enumerate(chunks, start=1)
+            ))
+            transcript = SUMMARIES_SEPARATOR.join(await self.reduce(summaries))
+        async with self._semaphore:
+            async for chunk in self._minutes_chain.astream({"transcription": transcript}):
+                yield chunk
+
+    async def summarize(self, transcript: str) -> str:
+        """Составление протокола совещания по расшифровке целиком.
+
+        :param transcript: Полная расшифровка совещания.
+        :returns: Протокол в формате Markdown.
+        """
+
+        return "".join([chunk async for chunk in self.astream(transcript)])
+
+
+def create_summarizer() -> MapReduceSummarizer:
+    """Создание суммаризатора согласно настройкам (LLM - см. `create_chat_model`)"""
+
+    return MapReduceSummarizer(
+        create_chat_model(),
+        chunk_tokens=settings.summarizer.chunk_tokens,
+        chunk_overlap_tokens=settings.summarizer.chunk_overlap_tokens,
+        max_concurrency=settings.summarizer.max_concurrency,
+        fan_in=settings.summarizer.reduce_fan_in,
+    )
@@ -0,0 +1,56 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from pydantic import BaseModel
+
+from config.dev import settings
+from modules.shared_kernel.insrastructure.cache import RedisKeyValueCache
+
+
+class CachedSummary(BaseModel):
+    """Составленный протокол совещания"""
+
+    summary: str
+
+
+class SummaryCache(RedisKeyValueCache[CachedSummary]):
+    model = CachedSummary
+    sensitive = True
+
+
+def build_summary_key(
+        transcript: str, prompt_version: str, model_name: str, temperature: float
+) -> str:
+    """Ключ протокола: одинаковая расшифровка с теми же промптами и моделью
+    суммаризируется один раз.
+
+    :param transcript: Полная расшифровка совещания.
+    :param prompt_version: Хеш шаблонов промптов и параметров суммаризации.
+    :param model_name: Название LLM.
+    :param temperature: Температура генерации.
+    :returns: Хеш всех параметров, влияющих на протокол.
+    """
+
+    payload = json.dumps({
+        "transcript": hashlib.sha256(transcript.encode("utf-8")).hexdigest(),
+        "prompt_version": prompt_version,
+        "model": model_name,
+        "temperature": temperature,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def create_summary_cache() -> SummaryCache | None:
+    """Создание кэша протоколов совещаний согласно настройкам.
+
+    :returns: Кэш или None, если протоколы не кэшируются.
+    """
+
+    if not settings.summarizer.summary_cache:
+        return None
+    return SummaryCache(
+        url=settings.redis.url,
+        prefix="summaries",
+        ttl=timedelta(days=settings.summarizer.summary_cache_days),
+    )
@@ -0,0 +1,132 @@
+import re
+from collections.abc import Callable
+
+from pydantic import BaseModel, Field
+
+from modules.audio.utils.stitching import SEGMENT_BREAK
+
+from .tokens import estimate_tokens
+
+# Реплика `RecognizedSpeechList.to_markdown`: '<номер>. <текст> (<спикер>) [<эмоция>]'
+_PHRASE = re.compile(
+    r"^\d+\.\s+(?P<text>.*?)"
+    r"(?:\s+\((?P<speaker>-?\d+)\))?"
+    r"(?:\s+\[(?P<emotion>positive|neutral|negative)\])?\s*$"
+)
+_PUNCTUATION = re.compile(r"[^\w\s]+", flags=re.UNICODE)
+
+NO_SPEECH = "No speech recognized"
+NEUTRAL_EMOTION = "neutral"
+# Слова-паразиты и поддакивания: реплика только из них не несёт смысла для протокола
+FILLER_WORDS = frozenset({
+    "а", "э", "ээ", "эээ", "эм", "эмм", "м", "мм", "ммм", "хм", "хмм",
+    "угу", "ага", "ну", "вот", "короче", "типа", "значит", "так", "кхм",
+})
+
+
+class CompactTranscript(BaseModel):
+    """Сжатая расшифровка для LLM
+
+    Attributes:
+        text: Сжатый текст расшифровки
+        tokens_before: Оценка токенов исходной расшифровки
+        tokens_after: Оценка токенов сжатой расшифровки
+        phrases_count: Количество реплик в исходной расшифровке
+        turns_count: Количество реплик после объединения
+    """
+
+    text: str
+    tokens_before: int
+    tokens_after: int
+    phrases_count: int
+    turns_count: int
+
+    @property
+    def ratio(self) -> float:
+        """Доля токенов, оставшаяся после сжатия"""
+
+        return self.tokens_after / self.tokens_before if self.tokens_before else 1
+
+
+class _Turn(BaseModel):
+    """Подряд идущие реплики одного спикера"""
+
+    speaker: str | None
+    phrases: list[str] = Field(default_factory=list)
+    emotions: list[str] = Field(default_factory=list)
+    is_break: bool = False
+
+    def render(self) -> str:
+        if self.is_break:
+            return SEGMENT_BREAK
+        text = " ".join(self.phrases)
+        if self.speaker is None:
+            return text
+        label = f"Спикер {self.speaker}"
+        if self.emotions:
+            label += f" [{' → '.join(self.emotions)}]"
+        return f"{label}: {text}"
+
+
+def is_filler(text: str) -> bool:
+    """Состоит ли реплика только из слов-паразитов (или вовсе без слов)"""
+
+    words = _PUNCTUATION.sub(" ", text.lower().replace("ё", "е")).split()
+    return all(word in FILLER_WORDS for word in words)
+
+
+def compact_transcript(
+        transcript: str, length_function: Callable[[str], int] = estimate_tokens
+) -> CompactTranscript:
+    """Сжатие расшифровки в формате `to_markdown` перед отправкой в LLM.
+
+    - подряд идущие реплики одного спикера объединяются в одну, без нумерации;
+    - реплики только из слов-паразитов ('э', 'угу', 'ну вот') отбрасываются,
+      так что реплики спикера по обе стороны от чужого поддакивания тоже объединяются;
+    - эмоция указывается один раз на объединённую реплику и только при смене,
+      нейтральная не указывается;
+    - через границу сегментов (`SEGMENT_BREAK`) реплики не объединяются, граница
+      сохраняется одной строкой: одинаковые номера по разные стороны - разные спикеры.
+
+    Строки в другом формате остаются как есть (отдельными репликами без спикера).
+
+    :param transcript: Расшифровка (реплики `RecognizedSpeechList.to_markdown`).
+    :param length_function: Подсчёт токенов текста (по умолчанию - оценка по символам).
+    :returns: Сжатая расшифровка с количеством токенов до и после.
+    """
+
+    turns: list[_Turn] = []
+    phrases_count = 0
+    for raw_line in transcript.splitlines():
+        line = raw_line.strip()
+        if not line or line == NO_SPEECH:
+            continue
+        if line == SEGMENT_BREAK:
+            if turns and not turns[-1].is_break:
+                turns.append(_Turn(speaker=None, is_break=True))
+            continue
+        phrases_count += 1
+        match = _PHRASE.match(line)
+        text, speaker, emotion = (
+            (match["text"], match["speaker"], match["emotion"]) if match else (line, None, None)
+        )
+        if match and is_filler(text):
+            continue
+        if match is None or speaker is None or not turns or turns[-1].speaker != speaker:
+            turns.append(_Turn(speaker=speaker if match else None))
+        turn = turns[-1]
+        turn.phrases.append(text)
+        if emotion not in {None, NEUTRAL_EMOTION} and (
+                not turn.emotions or turn.emotions[-1] != emotion
+        ):
+            turn.emotions.append(emotion)
+    if turns and turns[-1].is_break:
+        turns.pop()
+    text = "\n".join(turn.render() for turn in turns)
+    return CompactTranscript(
+        text=text,
+        tokens_before=length_function(transcript),
+        tokens_after=length_function(text),
+        phrases_count=phrases_count,
+        turns_count=sum(not turn.is_break for turn in turns),
+    )
@@ -0,0 +1,9 @@
+import math
+
+CHARS_PER_TOKEN = 3  # Оценка символов русского текста на токен (с запасом для разметки)
+
+
+def estimate_tokens(text: str) -> int:
+    """Быстрая оценка количества токенов текста без токенизатора провайдера"""
+
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
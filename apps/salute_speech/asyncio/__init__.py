@@ -1,3 +1,8 @@
-__all__ = ("AsyncSaluteSpeechClient",)
+__all__ = (
+    "AsyncSaluteSpeechClient",
+    "AsyncTranscriptionEngine",
+    "UploadData",
+)
 
-from .client import AsyncSaluteSpeechClient
+from .client import AsyncSaluteSpeechClient, UploadData
+from .engine import AsyncTranscriptionEngine
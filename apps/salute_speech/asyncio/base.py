@@ -0,0 +1,77 @@
+from typing import Self
+
+import logging
+from types import TracebackType
+
+import aiohttp
+
+from ..constants import (
+    DNS_CACHE_TTL,
+    HTTP_CONNECTIONS_LIMIT,
+    HTTP_CONNECTIONS_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHTTPClient:
+    """Базовый асинхронный HTTP клиент с одной долгоживущей сессией.
+
+    Сессия создаётся при первом запросе и переиспользует соединения (keep-alive),
+    поэтому частые запросы (например, опрос статусов задач) не платят за новый
+    TCP + TLS handshake. Сессию нужно закрыть через `close()` или `async with`.
+    """
+
+    def __init__(
+            self,
+            base_url: str,
+            connections_limit: int = HTTP_CONNECTIONS_LIMIT,
+            connections_per_host: int = HTTP_CONNECTIONS_PER_HOST,
+            keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+            dns_cache_ttl: int = DNS_CACHE_TTL,
+    ) -> None:
+        self._base_url = base_url
+        self._connections_limit = connections_limit
+        self._connections_per_host = connections_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Общая HTTP сессия клиента (создаётся лениво, внутри работающего event loop)"""
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._connections_limit,
+                limit_per_host=self._connections_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+                ttl_dns_cache=self._dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            logger.debug("HTTP session for %s created", self._base_url)
+        return self._session
+
+    def _url(self, path: str) -> str:
+        """Полный URL метода API (aiohttp не поддерживает base_url с путём вида '/rest/v1')"""
+
+        return f"{self._base_url}{path}"
+
+    async def close(self) -> None:
+        """Закрытие HTTP сессии и всех её соединений"""
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
@@ -1,18 +1,101 @@
+from typing import Any, Literal
+
+import asyncio
 import json
 import logging
+import mmap
+from collections.abc import AsyncIterable, Iterable, Iterator
+from contextlib import contextmanager
+from http import HTTPStatus
+from pathlib import Path
 from uuid import UUID
 
 import aiohttp
 
+from ..cache import TokenCache
 from ..constants import AUDIO_ENCODING_CONFIG, SALUTE_SPEECH_BASE_URL, AudioEncoding, Language
 from ..exceptions import DownloadingFileError, TaskFailedError, UploadingFileError
 from ..models import RecognizedSpeech, RecognizedSpeechList, Task
+from ..resilience import CircuitBreaker, RateLimiter, RetryPolicy
+from .base import AsyncHTTPClient
 from .oauth import AsyncOAuthSberDevicesClient
 
 logger = logging.getLogger(__name__)
 
+# Источник аудио для загрузки: байты, отображение в память, файл или поток частей
+type UploadData = bytes | bytearray | memoryview | mmap.mmap | Path | AsyncIterable[bytes]
+
+
+@contextmanager
+def _open_upload_data(file: Any) -> Iterator[Any]:
+    """Приведение источника аудио к телу запроса aiohttp без копирования"""
+
+    if isinstance(file, Path):
+        # aiohttp читает файл частями в пуле потоков, Content-Length - по размеру файла
+        with file.open(mode="rb") as data:
+            yield data
+    elif isinstance(file, mmap.mmap):
+        with memoryview(file) as data:
+            yield data
+    else:
+        yield file
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Задержка из заголовка Retry-After (поддерживается только формат в секундах)"""
+
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        return None
+
+
+def _retry_after(error: aiohttp.ClientError) -> float | None:
+    """Задержка перед повтором, указанная сервисом в ответе с ошибкой"""
+
+    if isinstance(error, aiohttp.ClientResponseError) and error.headers is not None:
+        return _parse_retry_after(error.headers.get("Retry-After"))
+    return None
+
+
+def _is_unhealthy(error: aiohttp.ClientError) -> bool:
+    """Ошибка говорит о перегрузке или недоступности сервиса (429, 5xx, сетевые ошибки)"""
+
+    if isinstance(error, aiohttp.ClientResponseError):
+        return (
+                error.status == HTTPStatus.TOO_MANY_REQUESTS
+                or error.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+    return True
+
+
+def _is_retryable(error: aiohttp.ClientError, idempotent: bool, replayable: bool) -> bool:
+    """Запрос можно повторить: 429 - если тело можно отправить повторно (запрос
+    отклонён до обработки), 5xx и сетевые ошибки - только для идемпотентных запросов
+    """
+
+    if isinstance(error, aiohttp.ClientResponseError) and (
+            error.status == HTTPStatus.TOO_MANY_REQUESTS
+    ):
+        return replayable
+    return idempotent and _is_unhealthy(error)
+
+
+class AsyncSaluteSpeechClient(AsyncHTTPClient):
+    """Асинхронный клиент SaluteSpeech.
+
+    Все запросы идут через одну сессию с пулом keep-alive соединений,
+    клиент нужно закрыть после использования. Запросы проходят через ограничитель
+    частоты и circuit breaker, ответы 429 и (для идемпотентных запросов) 5xx и
+    сетевые ошибки повторяются с decorrelated jitter.
+
+    Example:
+        >>> async with AsyncSaluteSpeechClient(apikey=apikey, scope=scope) as client:
+        ...     task = await client.get_task_status(task_id)
+    """
 
-class AsyncSaluteSpeechClient:
     def __init__(
             self,
             apikey: str,
@@ -21,25 +104,160 @@ class AsyncSaluteSpeechClient:
             profanity_check: bool = False,
             base_url: str = SALUTE_SPEECH_BASE_URL,
             use_ssl: bool = False,
+            client_id: str | None = None,
+            client_secret: str | None = None,
+            token_cache: TokenCache | None = None,
+            rate_limiter: RateLimiter | None = None,
+            retry_policy: RetryPolicy | None = None,
+            circuit_breaker: CircuitBreaker | None = None,
     ) -> None:
+        super().__init__(base_url=base_url)
         self._model = model
         self._profanity_check = profanity_check
-        self._base_url = base_url
         self._use_ssl = use_ssl
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._circuit_breaker = circuit_breaker or CircuitBreaker()
         self._oauth_client = AsyncOAuthSberDevicesClient(
-            apikey=apikey, scope=scope, use_ssl=use_ssl
+            apikey=apikey,
+            scope=scope,
+            client_id=client_id,
+            client_secret=client_secret,
+            use_ssl=use_ssl,
+            token_cache=token_cache,
         )
 
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return self._circuit_breaker
+
+    async def _send(
+            self,
+            method: str,
+            path: str,
+            data: UploadData | str | dict[str, Any] | None,
+            read: Literal["json", "text"],
+            headers: dict[str, str] | None,
+            **kwargs: Any,
+    ) -> Any:
+        """Отправка запроса с актуальным access token (токен, отклонённый API, сбрасывается)"""
+
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+        access_token = await self._oauth_client.authenticate()
+        with _open_upload_data(data) as body:
+            async with self.session.request(
+                    method,
+                    self._url(path),
+                    data=body,
+                    ssl=self._use_ssl,
+                    headers={**(headers or {}), "Authorization": f"Bearer {access_token}"},
+                    **kwargs,
+            ) as response:
+                if response.status == HTTPStatus.UNAUTHORIZED:
+                    self._oauth_client.invalidate(access_token)
+                response.raise_for_status()
+                return await (response.json() if read == "json" else response.text())
+
+    async def _attempt(
+            self,
+            method: str,
+            path: str,
+            data: UploadData | str | dict[str, Any] | None,
+            read: Literal["json", "text"],
+            headers: dict[str, str] | None,
+            **kwargs: Any,
+    ) -> Any:
+        """Попытка запроса через circuit breaker (в half-open - как пробный запрос).
+        На ответ 401 запрос один раз повторяется с новым токеном, если тело можно
+        отправить повторно: токен отозван или истёк раньше срока.
+        """
+
+        is_probe = await self._circuit_breaker.acquire()
+        try:
+            try:
+                result = await self._send(method, path, data, read, headers, **kwargs)
+            except aiohttp.ClientResponseError as e:
+                if e.status != HTTPStatus.UNAUTHORIZED or isinstance(data, AsyncIterable):
+                    raise
+                logger.warning("Request %s %s unauthorized, retry with new token", method, path)
+                result = await self._send(method, path, data, read, headers, **kwargs)
+        except aiohttp.ClientError as e:
+            if _is_unhealthy(e):
+                self._circuit_breaker.record_failure()
+            raise
+        else:
+            self._circuit_breaker.record_success()
+            return result
+        finally:
+            if is_probe:
+                self._circuit_breaker.release_probe()
+
+    async def _request(
+            self,
+            method: str,
+            path: str,
+            idempotent: bool,
+            data: UploadData | str | dict[str, Any] | None = None,
+            read: Literal["json", "text"] = "json",
+            headers: dict[str, str] | None = None,
+            **kwargs: Any,
+    ) -> Any:
+        """HTTP запрос к API с ограничением частоты, повторами и circuit breaker.
+
+        Ответ 429 повторяется для любого запроса с повторно читаемым телом (запрос
+        отклонён до обработки), 5xx и сетевые ошибки - только для идемпотентных.
+        Access token берётся перед каждой попыткой, так что повтор после долгой задержки
+        не уходит с истёкшим токеном, а на ответ 401 токен один раз обновляется.
+
+        :param method: HTTP метод.
+        :param path: Путь метода API.
+        :param idempotent: Запрос можно безопасно повторить после ошибки сервера.
+        :param data: Тело запроса.
+        :param read: Формат чтения тела ответа.
+        :param headers: Заголовки запроса (без авторизации).
+        :returns: Тело ответа.
+        """
+
+        replayable = not isinstance(data, AsyncIterable)
+        delay, attempt = self._retry_policy.base_delay, 0
+        while True:
+            attempt += 1
+            try:
+                return await self._attempt(method, path, data, read, headers, **kwargs)
+            except aiohttp.ClientError as e:
+                retryable = _is_retryable(e, idempotent=idempotent, replayable=replayable)
+                if not retryable or attempt >= self._retry_policy.attempts:
+                    raise
+                # Сервис может сам указать, через сколько повторить запрос
+                delay = max(self._retry_policy.next_delay(delay), _retry_after(e) or 0)
+                logger.warning(
+                    "Request %s %s failed (%s), retry %s in %.2f s",
+                    method, path, e, attempt, delay,
+                )
+            await asyncio.sleep(delay)
+
     async def upload_file(
             self,
-            file: bytes,
+            file: UploadData,
             audio_encoding: AudioEncoding,
             channels: int = 1,
             samplerate: int | None = None
     ) -> UUID:
+        """Загрузка аудио файла в SaluteSpeech.
+
+        Путь до файла, mmap и асинхронный итератор передаются потоком
+        (без загрузки всего файла в память), итератор - с chunked transfer encoding.
+
+        :param file: Байты, memoryview/mmap, путь до файла или асинхронный итератор байтов.
+        :param audio_encoding: Аудио-кодек (определяет Content-Type).
+        :param channels: Количество каналов аудио.
+        :param samplerate: Частота дискретизации аудио.
+        :returns: Идентификатор загруженного файла.
+        """
+
         if samplerate is None:
             samplerate = 16000
-        access_token = await self._oauth_client.authenticate()
         config = AUDIO_ENCODING_CONFIG.get(audio_encoding)
         if config is None:
             raise ValueError(
@@ -59,19 +277,16 @@ class AsyncSaluteSpeechClient:
                     f"{min_samplerate} and {max_samplerate} Hz, but got {samplerate} Hz"
                 )
         headers = {
-            "Authorization": f"Bearer {access_token}",
             "Content-Type": config["content_type"].format(samplerate=samplerate),
         }
         try:
-            async with aiohttp.ClientSession(base_url=self._base_url) as session, session.post(
-                    url="/data:upload", headers=headers, data=file, ssl=self._use_ssl
-            ) as response:
-                logger.debug("Start uploading file with format of audio %s", audio_encoding)
-                response.raise_for_status()
-                data = await response.json()
+            logger.debug("Start uploading file with format of audio %s", audio_encoding)
+            data = await self._request(
+                "POST", "/data:upload", idempotent=False, headers=headers, data=file
+            )
             return UUID(data["result"]["request_file_id"])
         except aiohttp.ClientResponseError as e:
-            error_message = f"Uploading failed with {response.status} status, error: {e}"
+            error_message = f"Uploading failed with {e.status} status, error: {e}"
             logger.exception(error_message)
             raise UploadingFileError(error_message) from e
         except aiohttp.ClientError as e:
@@ -111,9 +326,7 @@ class AsyncSaluteSpeechClient:
         :param eou_timeout: Настройка распознавания конца фразы (End of Utterance — eou).
         :returns: Созданная задача со статусом 'NEW'.
         """
-        access_token = await self._oauth_client.authenticate()
         headers = {
-            "Authorization": f"Bearer {access_token}",
             "Accept": "application/json",
             "Content-Type": "application/json",
             "X-Request-ID": f"{request_file_id}",
@@ -143,14 +356,13 @@ class AsyncSaluteSpeechClient:
                 "eou_timeout": eou_timeout
             }
         try:
-            async with aiohttp.ClientSession(base_url=self._base_url) as session, session.post(
-                    url="/speech/async_recognize",
-                    headers=headers,
-                    data=json.dumps(payload),
-                    ssl=self._use_ssl
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
+            data = await self._request(
+                "POST",
+                "/speech/async_recognize",
+                idempotent=False,
+                headers=headers,
+                data=json.dumps(payload),
+            )
             return Task.model_validate(data["result"])
         except aiohttp.ClientResponseError as e:
             error_message = f"Task creation failed with status {e.status} error: {e.message}"
@@ -162,20 +374,18 @@ class AsyncSaluteSpeechClient:
             raise TaskFailedError(error_message) from e
 
     async def get_task_status(self, task_id: UUID) -> Task:
-        access_token = await self._oauth_client.authenticate()
-        headers = {"Authorization": f"Bearer {access_token}", "Accept": "application/json"}
+        headers = {"Accept": "application/json"}
         params = {"id": f"{task_id}"}
         payload = {}
         try:
-            async with aiohttp.ClientSession(base_url=self._base_url) as session, session.get(
-                url="/task:get",
+            data = await self._request(
+                "GET",
+                "/task:get",
+                idempotent=True,
                 headers=headers,
                 params=params,
                 data=json.dumps(payload),
-                ssl=self._use_ssl
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
+            )
             return Task.model_validate(data["result"])
         except aiohttp.ClientResponseError as e:
             error_message = f"Task receiving failed with status {e.status} error: {e.message}"
@@ -186,21 +396,41 @@ class AsyncSaluteSpeechClient:
             logger.exception(error_message)
             raise TaskFailedError(error_message) from e
 
+    async def get_tasks_statuses(
+            self, task_ids: Iterable[UUID]
+    ) -> dict[UUID, Task | TaskFailedError]:
+        """Пакетное получение статусов задач: SaluteSpeech не поддерживает пакетный запрос,
+        поэтому запросы выполняются конкурентно через общий пул соединений.
+
+        :param task_ids: Идентификаторы задач распознавания.
+        :returns: Задача или ошибка её получения по каждому идентификатору.
+        """
+
+        task_ids = list(task_ids)
+        results = await asyncio.gather(
+            *(self.get_task_status(task_id) for task_id in task_ids), return_exceptions=True
+        )
+        statuses: dict[UUID, Task | TaskFailedError] = {}
+        for task_id, result in zip(task_ids, results, strict=True):
+            if isinstance(result, BaseException) and not isinstance(result, TaskFailedError):
+                raise result
+            statuses[task_id] = result
+        return statuses
+
     async def download_file(self, response_file_id: UUID) -> RecognizedSpeechList:
-        access_token = await self._oauth_client.authenticate()
-        headers = {"Authorization": f"Bearer {access_token}", "Accept": "application/octet-stream"}
+        headers = {"Accept": "application/octet-stream"}
         params = {"response_file_id": f"{response_file_id}"}
         payload = {}
         try:
-            async with aiohttp.ClientSession(base_url=self._base_url) as session, session.get(
-                url="/data:download",
+            data = await self._request(
+                "GET",
+                "/data:download",
+                idempotent=True,
+                read="text",
                 headers=headers,
                 params=params,
                 data=payload,
-                ssl=self._use_ssl
-            ) as response:
-                response.raise_for_status()
-                data = await response.text()
+            )
             results = json.loads(data)
             return RecognizedSpeechList(
                 [RecognizedSpeech.from_response(result) for result in results]
@@ -213,3 +443,9 @@ class AsyncSaluteSpeechClient:
             error_message = f"An error occurred while downloading, error {e}"
             logger.exception(error_message)
             raise DownloadingFileError(error_message) from e
+
+    async def close(self) -> None:
+        """Закрытие HTTP сессий клиента и клиента аутентификации"""
+
+        await self._oauth_client.close()
+        await super().close()
@@ -0,0 +1,211 @@
+import asyncio
+import contextlib
+import logging
+from uuid import UUID
+
+from ..constants import MAX_POLL_FAILURES, AudioEncoding
+from ..exceptions import TaskFailedError
+from ..models import RecognizedSpeechList, Task
+from ..polling import PollingScheduler
+from ..resilience import TaskSlots
+from .client import AsyncSaluteSpeechClient, UploadData
+
+logger = logging.getLogger(__name__)
+
+FAILED_STATUSES = frozenset({"ERROR", "CANCELED"})
+
+
+class AsyncTranscriptionEngine:
+    """Конкурентная транскрибация через SaluteSpeech с ограничением задач в работе.
+
+    Одновременно в SaluteSpeech находится не больше `max_in_flight` задач распознавания
+    (квота аккаунта). Статусы всех ожидающих задач опрашивает один общий цикл,
+    который отдаёт результат каждой задачи её вызывающему коду сразу после готовности.
+    Первый опрос задачи - в ожидаемое время готовности по продолжительности аудио,
+    дальше с экспоненциальной задержкой (см. `PollingScheduler`). Ошибка опроса
+    (сбой сети, авторизации) не завершает задачу, которая продолжает работать в сервисе:
+    опрос повторяется с той же задержкой, и задача считается упавшей только после
+    `max_poll_failures` ошибок подряд или статуса ERROR / CANCELED.
+
+    Example:
+        >>> engine = AsyncTranscriptionEngine(client, max_in_flight=10)
+        >>> results = await asyncio.gather(*(
+        ...     engine.transcribe(segment, audio_encoding="PCM_S16LE", duration=60)
+        ...     for segment in segments
+        ... ))
+    """
+
+    def __init__(
+            self,
+            client: AsyncSaluteSpeechClient,
+            max_in_flight: int = 10,
+            poll_interval: float = 1,
+            max_poll_interval: float = 30,
+            task_slots: TaskSlots | None = None,
+            max_poll_failures: int = MAX_POLL_FAILURES,
+    ) -> None:
+        """
+        :param client: Асинхронный клиент SaluteSpeech.
+        :param max_in_flight: Максимальное количество задач распознавания в работе.
+        :param poll_interval: Минимальный интервал опроса статуса задачи (в секундах).
+        :param max_poll_interval: Максимальный интервал опроса статуса задачи (в секундах).
+        :param task_slots: Общий для процессов лимит задач в работе на аккаунт (*опционально).
+        :param max_poll_failures: Количество ошибок опроса задачи подряд, после которого
+        задача считается упавшей.
+        """
+
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._task_slots = task_slots
+        self._max_poll_failures = max_poll_failures
+        self._scheduler = PollingScheduler(
+            min_interval=poll_interval, max_interval=max_poll_interval
+        )
+        self._wakeup = asyncio.Event()
+        self._pending: dict[UUID, asyncio.Future[Task]] = {}
+        self._poller: asyncio.Task[None] | None = None
+
+    @property
+    def in_flight(self) -> int:
+        """Количество задач распознавания, ожидающих результата"""
+
+        return len(self._pending)
+
+    def eta(self, task_id: UUID) -> float | None:
+        """Оценка оставшегося времени до готовности задачи распознавания (в секундах)"""
+
+        return self._scheduler.eta(task_id)
+
+    def etas(self) -> dict[UUID, float]:
+        """Оценки оставшегося времени всех ожидающих задач (для отчёта о прогрессе)"""
+
+        return {
+            task_id: eta
+            for task_id in self._pending
+            if (eta := self._scheduler.eta(task_id)) is not None
+        }
+
+    def _resolve(self, task_id: UUID, result: Task | Exception) -> None:
+        future = self._pending.get(task_id)
+        if future is None or future.done():
+            self._scheduler.remove(task_id)
+            return
+        if isinstance(result, Exception):
+            # Задача могла не упасть, а только не получить статус: опрос повторяется
+            failures = self._scheduler.fail(task_id)
+            if failures < self._max_poll_failures:
+                logger.warning(
+                    "Recognition task %s status is not received (%s failures in a row): %s",
+                    task_id, failures, result,
+                )
+                return
+            self._scheduler.remove(task_id)
+            future.set_exception(result)
+        elif result.status == "DONE":
+            processing_time = (result.updated_at - result.created_at).total_seconds()
+            self._scheduler.complete(task_id, processing_time=processing_time)
+            future.set_result(result)
+        elif result.status in FAILED_STATUSES:
+            self._scheduler.remove(task_id)
+            future.set_exception(
+                TaskFailedError(f"Recognition task {task_id} finished with status {result.status}")
+            )
+        else:
+            self._scheduler.reschedule(task_id)
+
+    async def _sleep(self) -> None:
+        """Ожидание ближайшего запланированного опроса или регистрации новой задачи"""
+
+        self._wakeup.clear()
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self._scheduler.next_delay())
+
+    async def _poll(self) -> None:
+        """Общий цикл опроса: за один такт пакетом опрашиваются все задачи, которым пора,
+        цикл завершается когда ожидающих задач не осталось.
+        """
+
+        while self._pending:
+            await self._sleep()
+            task_ids = [task_id for task_id in self._scheduler.due() if task_id in self._pending]
+            if not task_ids:
+                continue
+            try:
+                statuses = await self._client.get_tasks_statuses(task_ids)
+            except Exception as e:  # noqa: BLE001
+                statuses = dict.fromkeys(task_ids, e)
+            for task_id, result in statuses.items():
+                self._resolve(task_id, result)
+            for task_id in [task_id for task_id, future in self._pending.items() if future.done()]:
+                del self._pending[task_id]
+        self._poller = None
+
+    async def _wait_task(self, task: Task, duration: float | None = None) -> Task:
+        """Регистрация задачи в общем цикле опроса и ожидание её завершения"""
+
+        if task.status == "DONE":
+            return task
+        future = asyncio.get_running_loop().create_future()
+        self._pending[task.id] = future
+        self._scheduler.add(task.id, duration=duration)
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+        else:
+            # Цикл мог уснуть до более позднего опроса, чем первый опрос новой задачи
+            self._wakeup.set()
+        try:
+            return await future
+        finally:
+            # Задача, которую перестали ждать (отмена), больше не опрашивается
+            self._pending.pop(task.id, None)
+            self._scheduler.remove(task.id)
+
+    async def transcribe(
+            self,
+            file: UploadData,
+            audio_encoding: AudioEncoding,
+            channels: int = 1,
+            samplerate: int = 16000,
+            max_speakers_count: int = 10,
+            duration: float | None = None,
+    ) -> RecognizedSpeechList:
+        """Транскрибация аудио: загрузка, создание задачи, ожидание в общем цикле опроса
+        и скачивание результата.
+
+        :param file: Аудио контент: байты, путь до файла, mmap или асинхронный итератор байтов.
+        :param audio_encoding: Кодировка аудио.
+        :param channels: Количество аудио каналов.
+        :param samplerate: Частота дискретизации.
+        :param max_speakers_count: Максимальное количество спикеров на записи.
+        :param duration: Продолжительность аудио в секундах (*опционально),
+        по ней планируется первый опрос статуса задачи.
+        :returns: Распознанная речь.
+        """
+
+        # Слот аккаунта занимается после локального семафора, чтобы не держать его в очереди
+        task_slot = (
+            self._task_slots.slot() if self._task_slots is not None else contextlib.nullcontext()
+        )
+        async with self._semaphore, task_slot:
+            request_file_id = await self._client.upload_file(
+                file=file, audio_encoding=audio_encoding, channels=channels, samplerate=samplerate
+            )
+            task = await self._client.async_recognize(
+                request_file_id,
+                audio_encoding=audio_encoding,
+                channels=channels,
+                samplerate=samplerate,
+                max_speakers_count=max_speakers_count,
+            )
+            logger.debug("Recognition task %s created, in flight %s", task.id, self.in_flight)
+            task = await self._wait_task(task, duration=duration)
+        return await self._client.download_file(task.response_file_id)
+
+    async def close(self) -> None:
+        """Остановка цикла опроса, ожидающие задачи отменяются"""
+
+        for future in self._pending.values():
+            future.cancel()
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
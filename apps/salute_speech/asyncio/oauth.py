@@ -1,62 +1,98 @@
+import asyncio
 import base64
 import logging
+from datetime import timedelta
 from uuid import uuid4
 
 import aiohttp
 
-from ..constants import SBER_DEVICES_BASE_URL
+from ..cache import TokenCache, build_account_key
+from ..constants import SBER_DEVICES_BASE_URL, TOKEN_EXPIRY_MARGIN, TOKEN_REFRESH_MARGIN
 from ..exceptions import AuthenticationFailedError
+from ..models import AccessToken
+from .base import AsyncHTTPClient
 
 logger = logging.getLogger(__name__)
 
 
-class AsyncOAuthSberDevicesClient:
+class AsyncOAuthSberDevicesClient(AsyncHTTPClient):
+    """Асинхронный OAuth клиент SberDevices с кэшированием access token.
+
+    Токен переиспользуется до `expires_at`, за `refresh_margin` до истечения он
+    обновляется в фоне, а за `expiry_margin` перестаёт выдаваться. Конкурентные вызовы
+    делят одно обновление токена, а общий кэш (например, Redis) позволяет
+    нескольким процессам обходиться одним токеном.
+    """
+
     def __init__(
             self,
             apikey: str,
             scope: str,
-            client_id: str,
-            client_secret: str,
+            client_id: str | None = None,
+            client_secret: str | None = None,
             use_ssl: bool = False,
             base_url: str = SBER_DEVICES_BASE_URL,
+            token_cache: TokenCache | None = None,
+            refresh_margin: float = TOKEN_REFRESH_MARGIN,
+            expiry_margin: float = TOKEN_EXPIRY_MARGIN,
     ) -> None:
+        """
+        :param apikey: Ключ авторизации (используется, если не заданы client_id и client_secret).
+        :param scope: Версия API.
+        :param client_id: Идентификатор клиента (*опционально).
+        :param client_secret: Секрет клиента (*опционально).
+        :param use_ssl: Проверять SSL сертификат.
+        :param base_url: Базовый URL OAuth API.
+        :param token_cache: Общий между процессами кэш токенов (*опционально).
+        :param refresh_margin: За сколько секунд до истечения токен обновляется в фоне.
+        :param expiry_margin: За сколько секунд до истечения токен больше не выдаётся.
+        """
+
+        super().__init__(base_url=base_url)
         self._apikey = apikey
         self._scope = scope
         self._client_id = client_id
         self._client_secret = client_secret
         self._rq_uid = uuid4()
         self._use_ssl = use_ssl
-        self._base_url = base_url
+        self._token_cache = token_cache
+        self._token_key = build_account_key(self._build_apikey(), scope)
+        self._refresh_margin = refresh_margin
+        self._expiry_margin = expiry_margin
+        self._token: AccessToken | None = None
+        self._rejected_token: str | None = None  # Отклонённый API токен, не берётся из кэша
+        self._refresh_task: asyncio.Task[AccessToken] | None = None
 
     def _build_apikey(self) -> str:
+        if self._client_id is None or self._client_secret is None:
+            return self._apikey
         credentials = f"{self._client_id}:{self._client_secret}"
         return base64.b64encode(credentials.encode("utf-8")).decode("utf-8")
 
-    async def authenticate(self) -> str:
-        """Производит аутентификацию клиента, выдавая access token"""
+    async def _request_token(self) -> AccessToken:
+        """Запрос нового access token у SberDevices"""
+
         headers = {
             "Authorization": f"Bearer {self._build_apikey()}",
             "Content-Type": "application/x-www-form-urlencoded",
             "Accept": "application/json",
-            "RqUID": self._rq_uid,
+            "RqUID": f"{self._rq_uid}",
         }
         payload = {"scope": self._scope}
         try:
-            async with aiohttp.ClientSession(base_url=self._base_url) as session:
-                async with session.post(
-                        url="/oauth", headers=headers, data=payload, ssl=self._use_ssl
-                ) as response:
-                    logger.debug("Make request for authentication")
-                    response.raise_for_status()
-                    data = await response.json()
-                access_token = data.get("access_token")
-                if access_token is None:
-                    error_message = (
-                        "Authentication failed, "
-                        "because access token missing in response!"
-                    )
-                    logger.error(error_message)
-                    raise AuthenticationFailedError(error_message)
+            async with self.session.post(
+                    url=self._url("/oauth"), headers=headers, data=payload, ssl=self._use_ssl
+            ) as response:
+                logger.debug("Make request for authentication")
+                response.raise_for_status()
+                data = await response.json()
+            if data.get("access_token") is None:
+                error_message = (
+                    "Authentication failed, "
+                    "because access token missing in response!"
+                )
+                logger.error(error_message)
+                raise AuthenticationFailedError(error_message)
         except aiohttp.ClientResponseError as e:
             error_message = f"Authentication failed with status {response.status}, error: {e}"
             logger.exception(error_message)
@@ -67,4 +103,75 @@ class AsyncOAuthSberDevicesClient:
             raise AuthenticationFailedError(error_message) from e
         else:
             logger.info("Client successfully authenticated!")
-            return access_token
+            return AccessToken.model_validate(data)
+
+    async def _load_token(self) -> AccessToken:
+        """Получение свежего токена: из общего кэша или запросом к SberDevices"""
+
+        if self._token_cache is not None:
+            try:
+                token = await self._token_cache.get(self._token_key)
+            except Exception:  # noqa: BLE001
+                logger.warning("Access token cache is unavailable, requesting new token")
+                token = None
+            # Токен из общего кэша уже обновил другой процесс
+            if (
+                    token is not None
+                    and token.access_token != self._rejected_token
+                    and token.expires_in() > self._refresh_margin
+            ):
+                self._token = token
+                return token
+        token = await self._request_token()
+        self._token = token
+        if self._token_cache is not None:
+            ttl = timedelta(seconds=max(token.expires_in() - self._expiry_margin, 1))
+            try:
+                await self._token_cache.set(self._token_key, token, ttl=ttl)
+            except Exception:  # noqa: BLE001
+                logger.warning("Failed to share access token through cache")
+        return token
+
+    def _on_refreshed(self, task: asyncio.Task[AccessToken]) -> None:
+        if self._refresh_task is task:
+            self._refresh_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Access token refresh failed: %s", task.exception())
+
+    def _start_refresh(self) -> asyncio.Task[AccessToken]:
+        """Запуск обновления токена, если оно ещё не выполняется (single-flight)"""
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._load_token())
+            self._refresh_task.add_done_callback(self._on_refreshed)
+        return self._refresh_task
+
+    async def authenticate(self) -> str:
+        """Производит аутентификацию клиента, выдавая access token.
+        Закэшированный токен выдаётся без запроса к SberDevices.
+        """
+
+        token = self._token
+        if token is None or token.expires_in() <= self._expiry_margin:
+            # Отмена одного ожидающего не должна отменять общее обновление
+            token = await asyncio.shield(self._start_refresh())
+        elif token.expires_in() <= self._refresh_margin:
+            self._start_refresh()
+        return token.access_token
+
+    def invalidate(self, access_token: str) -> None:
+        """Сброс токена, отклонённого API (ответ 401): следующий вызов `authenticate`
+        получит новый токен.
+
+        :param access_token: Отклонённый access token.
+        """
+
+        self._rejected_token = access_token
+        if self._token is not None and self._token.access_token == access_token:
+            self._token = None
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        await super().close()
@@ -0,0 +1,63 @@
+from typing import Self
+
+import logging
+from types import TracebackType
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .constants import HTTP_CONNECTIONS_LIMIT, HTTP_CONNECTIONS_PER_HOST
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClient:
+    """Базовый HTTP клиент с одной долгоживущей сессией и пулом keep-alive соединений.
+
+    Сессию нужно закрыть через `close()` или `with`.
+    """
+
+    def __init__(
+            self,
+            base_url: str,
+            connections_limit: int = HTTP_CONNECTIONS_LIMIT,
+            connections_per_host: int = HTTP_CONNECTIONS_PER_HOST,
+    ) -> None:
+        self._base_url = base_url
+        self._connections_limit = connections_limit
+        self._connections_per_host = connections_per_host
+        self._session: requests.Session | None = None
+
+    @property
+    def session(self) -> requests.Session:
+        """Общая HTTP сессия клиента (создаётся лениво)"""
+
+        if self._session is None:
+            # pool_connections - количество пулов (хостов), pool_maxsize - соединений в пуле
+            adapter = HTTPAdapter(
+                pool_connections=max(self._connections_limit // self._connections_per_host, 1),
+                pool_maxsize=self._connections_per_host,
+            )
+            self._session = requests.Session()
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+            logger.debug("HTTP session for %s created", self._base_url)
+        return self._session
+
+    def close(self) -> None:
+        """Закрытие HTTP сессии и всех её соединений"""
+
+        if self._session is not None:
+            self._session.close()
+        self._session = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc_val: BaseException | None,
+            exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
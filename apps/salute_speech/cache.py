@@ -0,0 +1,24 @@
+from typing import Protocol
+
+import hashlib
+from datetime import timedelta
+
+from .models import AccessToken
+
+
+class TokenCache(Protocol):
+    """Общее (между процессами) хранилище access token.
+    Совместимо с `KeyValueCache[AccessToken]` (например, Redis).
+    """
+
+    async def get(self, key: str) -> AccessToken | None: ...
+
+    async def set(self, key: str, value: AccessToken, ttl: timedelta | None = None) -> None: ...
+
+
+def build_account_key(apikey: str, scope: str) -> str:
+    """Ключ аккаунта в общих хранилищах (кэш токенов, лимиты),
+    ключ авторизации не хранится в открытом виде.
+    """
+
+    return f"{scope}:{hashlib.sha256(apikey.encode("utf-8")).hexdigest()[:32]}"
@@ -4,6 +4,7 @@ from uuid import UUID
 
 import requests
 
+from .base import HTTPClient
 from .constants import AUDIO_ENCODING_CONFIG, SALUTE_SPEECH_BASE_URL, AudioEncoding, Language
 from .exceptions import DownloadingFileError, TaskFailedError, UploadingFileError
 from .models import RecognizedSpeech, RecognizedSpeechList, Task
@@ -12,7 +13,17 @@ from .oauth import OAuthSberDevicesClient
 logger = logging.getLogger(__name__)
 
 
-class SaluteSpeechClient:
+class SaluteSpeechClient(HTTPClient):
+    """Клиент SaluteSpeech.
+
+    Все запросы идут через одну сессию с пулом keep-alive соединений,
+    клиент нужно закрыть после использования:
+
+    Example:
+        >>> with SaluteSpeechClient(apikey=apikey, scope=scope) as client:
+        ...     task = client.get_task_status(task_id)
+    """
+
     def __init__(
             self,
             apikey: str,
@@ -21,12 +32,20 @@ class SaluteSpeechClient:
             profanity_check: bool = False,
             base_url: str = SALUTE_SPEECH_BASE_URL,
             use_ssl: bool = False,
+            client_id: str | None = None,
+            client_secret: str | None = None,
     ) -> None:
+        super().__init__(base_url=base_url)
         self._model = model
         self._profanity_check = profanity_check
-        self._base_url = base_url
         self._use_ssl = use_ssl
-        self._oauth_client = OAuthSberDevicesClient(apikey=apikey, scope=scope, use_ssl=use_ssl)
+        self._oauth_client = OAuthSberDevicesClient(
+            apikey=apikey,
+            scope=scope,
+            client_id=client_id,
+            client_secret=client_secret,
+            use_ssl=use_ssl,
+        )
 
     def upload_file(
             self,
@@ -62,13 +81,12 @@ class SaluteSpeechClient:
             "Content-Type": config["content_type"].format(samplerate=samplerate),
         }
         try:
-            with requests.Session() as session:
-                logger.debug("Start uploading file with format of audio %s", audio_encoding)
-                response = session.post(
-                    url=url, headers=headers, data=file, verify=False, stream=True
-                )
-                response.raise_for_status()
-                data = response.json()
+            logger.debug("Start uploading file with format of audio %s", audio_encoding)
+            response = self.session.post(
+                url=url, headers=headers, data=file, verify=False, stream=True
+            )
+            response.raise_for_status()
+            data = response.json()
             return UUID(data["result"]["request_file_id"])
         except requests.exceptions.HTTPError as e:
             error_message = f"Uploading failed with {response.status_code} status, error: {e}"
@@ -139,12 +157,11 @@ class SaluteSpeechClient:
                 "eou_timeout": eou_timeout
             }
         try:
-            with requests.Session() as session:
-                response = session.post(
-                    url=url, headers=headers, data=json.dumps(payload), verify=self._use_ssl
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = self.session.post(
+                url=url, headers=headers, data=json.dumps(payload), verify=self._use_ssl
+            )
+            response.raise_for_status()
+            data = response.json()
             return Task.model_validate(data["result"])
         except requests.exceptions.HTTPError as e:
             raise TaskFailedError(
@@ -158,16 +175,15 @@ class SaluteSpeechClient:
         params = {"id": f"{task_id}"}
         payload = {}
         try:
-            with requests.Session() as session:
-                response = session.get(
-                    url=url,
-                    headers=headers,
-                    params=params,
-                    data=json.dumps(payload),
-                    verify=self._use_ssl
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = self.session.get(
+                url=url,
+                headers=headers,
+                params=params,
+                data=json.dumps(payload),
+                verify=self._use_ssl
+            )
+            response.raise_for_status()
+            data = response.json()
             return Task.model_validate(data["result"])
         except requests.exceptions.HTTPError:
             raise TaskFailedError("Task receiving failed") from None
@@ -179,12 +195,11 @@ class SaluteSpeechClient:
         params = {"response_file_id": f"{response_file_id}"}
         payload = {}
         try:
-            with requests.Session() as session:
-                response = session.get(
-                    url=url, headers=headers, params=params, data=payload, verify=self._use_ssl
-                )
-                response.raise_for_status()
-                data = response.text
+            response = self.session.get(
+                url=url, headers=headers, params=params, data=payload, verify=self._use_ssl
+            )
+            response.raise_for_status()
+            data = response.text
             results = json.loads(data)
             return RecognizedSpeechList(
                 [RecognizedSpeech.from_response(result) for result in results]
@@ -193,3 +208,9 @@ class SaluteSpeechClient:
             raise DownloadingFileError(
                 f"Downloading failed with status {response.status_code} error: {e}"
             ) from e
+
+    def close(self) -> None:
+        """Закрытие HTTP сессий клиента и клиента аутентификации"""
+
+        self._oauth_client.close()
+        super().close()
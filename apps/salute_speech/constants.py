@@ -54,3 +54,29 @@ AUDIO_ENCODING_CONFIG: Final[dict[AudioEncoding, dict[str, Any]]] = {
         "content_type": "audio/g729"
     }
 }
+# Кодировки SaluteSpeech для форматов аудио файлов
+FILE_FORMAT_ENCODINGS: Final[dict[str, AudioEncoding]] = {
+    "wav": "PCM_S16LE",
+    "flac": "FLAC",
+    "mp3": "MP3",
+    "opus": "OPUS",
+    "ogg": "OPUS",
+}
+
+# Параметры пула HTTP соединений клиентов
+HTTP_CONNECTIONS_LIMIT = 100  # Максимум соединений клиента
+HTTP_CONNECTIONS_PER_HOST = 20  # Максимум соединений с одним хостом
+HTTP_KEEPALIVE_TIMEOUT = 60  # Время жизни простаивающего соединения (в секундах)
+DNS_CACHE_TTL = 300  # Время кэширования DNS ответов (в секундах)
+
+# Параметры кэширования access token
+TOKEN_REFRESH_MARGIN = 300  # За сколько до истечения токен обновляется в фоне (в секундах)
+TOKEN_EXPIRY_MARGIN = 30  # За сколько до истечения токен больше не используется (в секундах)
+
+# Параметры опроса статусов задач распознавания
+RECOGNITION_SPEED = 0.2  # Начальная оценка: секунд обработки на секунду аудио
+RECOGNITION_LATENCY = 2  # Задержка постановки задачи в работу (в секундах)
+RECOGNITION_SPEED_SMOOTHING = 0.2  # Вес новой задачи в скользящей оценке скорости
+POLL_BACKOFF_FACTOR = 2  # Множитель интервала опроса после каждого неготового статуса
+POLL_JITTER = 0.25  # Случайный разброс интервала опроса (доля интервала)
+MAX_POLL_FAILURES = 10  # Ошибок опроса задачи подряд, после которых задача считается упавшей
@@ -2,7 +2,7 @@ from typing import Any, Literal, Self
 
 import operator
 from collections import UserList
-from datetime import datetime
+from datetime import UTC, datetime
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -10,6 +10,18 @@ from pydantic import BaseModel
 Emotion = Literal["positive", "neutral", "negative"]
 
 
+class AccessToken(BaseModel):
+    """Access token SberDevices, `expires_at` приходит в миллисекундах Unix time"""
+
+    access_token: str
+    expires_at: datetime
+
+    def expires_in(self) -> float:
+        """Оставшееся время жизни токена (в секундах)"""
+
+        return (self.expires_at - datetime.now(UTC)).total_seconds()
+
+
 class Task(BaseModel):
     id: UUID
     status: Literal["NEW", "RUNNING", "CANCELED", "DONE", "ERROR"]
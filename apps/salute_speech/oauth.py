@@ -1,57 +1,86 @@
 import base64
 import logging
+import threading
 from uuid import uuid4
 
 import requests
 
-from .constants import SBER_DEVICES_BASE_URL
+from .base import HTTPClient
+from .constants import SBER_DEVICES_BASE_URL, TOKEN_EXPIRY_MARGIN, TOKEN_REFRESH_MARGIN
 from .exceptions import AuthenticationFailedError
+from .models import AccessToken
 
 logger = logging.getLogger(__name__)
 
 
-class OAuthSberDevicesClient:
+class OAuthSberDevicesClient(HTTPClient):
+    """OAuth клиент SberDevices с кэшированием access token в памяти процесса.
+
+    Токен переиспользуется до `expires_at`, за `refresh_margin` до истечения он
+    обновляется в фоновом потоке, а за `expiry_margin` перестаёт выдаваться.
+    Конкурентные потоки делят одно обновление токена.
+    """
+
     def __init__(
             self,
             apikey: str,
             scope: str,
-            client_id: str,
-            client_secret: str,
+            client_id: str | None = None,
+            client_secret: str | None = None,
             use_ssl: bool = False,
             base_url: str = SBER_DEVICES_BASE_URL,
+            refresh_margin: float = TOKEN_REFRESH_MARGIN,
+            expiry_margin: float = TOKEN_EXPIRY_MARGIN,
     ) -> None:
+        """
+        :param apikey: Ключ авторизации (используется, если не заданы client_id и client_secret).
+        :param scope: Версия API.
+        :param client_id: Идентификатор клиента (*опционально).
+        :param client_secret: Секрет клиента (*опционально).
+        :param use_ssl: Проверять SSL сертификат.
+        :param base_url: Базовый URL OAuth API.
+        :param refresh_margin: За сколько секунд до истечения токен обновляется в фоне.
+        :param expiry_margin: За сколько секунд до истечения токен больше не выдаётся.
+        """
+
+        super().__init__(base_url=base_url)
         self._apikey = apikey
         self._scope = scope
         self._client_id = client_id
         self._client_secret = client_secret
         self._rq_uid = uuid4()
         self._use_ssl = use_ssl
-        self._base_url = base_url
+        self._refresh_margin = refresh_margin
+        self._expiry_margin = expiry_margin
+        self._token: AccessToken | None = None
+        self._lock = threading.Lock()
+        self._refreshing = False
 
     def _build_apikey(self) -> str:
+        if self._client_id is None or self._client_secret is None:
+            return self._apikey
         credentials = f"{self._client_id}:{self._client_secret}"
         return base64.b64encode(credentials.encode("utf-8")).decode("utf-8")
 
-    def authenticate(self) -> str:
-        """Производит аутентификацию клиента, выдавая access token"""
+    def _request_token(self) -> AccessToken:
+        """Запрос нового access token у SberDevices"""
+
         url = f"{self._base_url}/oauth"
         headers = {
             "Authorization": f"Bearer {self._build_apikey()}",
             "Content-Type": "application/x-www-form-urlencoded",
             "Accept": "application/json",
-            "RqUID": self._rq_uid,
+            "RqUID": f"{self._rq_uid}",
         }
         payload = {"scope": self._scope}
         try:
-            with requests.Session() as session:
-                logger.debug("Make request for authentication")
-                response = session.post(
-                    url=url, headers=headers, data=payload, verify=self._use_ssl
-                )
-                response.raise_for_status()
-                data = response.json()
-            access_token = data.get("access_token")
-            if access_token is None:
+            logger.debug("Make request for authentication")
+            response = self.session.post(
+                url=url, headers=headers, data=payload, verify=self._use_ssl
+            )
+            response.raise_for_status()
+            data = response.json()
+            if data.get("access_token") is None:
                 error_message = "Authentication failed, because access token missing in response!"
                 logger.error(error_message)
                 raise AuthenticationFailedError(error_message)
@@ -59,6 +88,42 @@ class OAuthSberDevicesClient:
             error_message = f"Authentication failed with status {response.status_code}, error: {e}"
             logger.exception(error_message)
             raise AuthenticationFailedError(error_message) from e
+        except requests.exceptions.RequestException as e:
+            error_message = f"An unexpected error occurred while authentication, error {e}"
+            logger.exception(error_message)
+            raise AuthenticationFailedError(error_message) from e
         else:
             logger.info("Client successfully authenticated!")
-            return access_token
+            return AccessToken.model_validate(data)
+
+    def _refresh_in_background(self) -> None:
+        token = None
+        try:
+            token = self._request_token()
+        except AuthenticationFailedError as e:
+            logger.warning("Access token refresh failed: %s", e)
+        finally:
+            # Флаг сбрасывается при любой ошибке, иначе фоновое обновление больше не запустится
+            with self._lock:
+                if token is not None:
+                    self._token = token
+                self._refreshing = False
+
+    def authenticate(self) -> str:
+        """Производит аутентификацию клиента, выдавая access token.
+        Закэшированный токен выдаётся без запроса к SberDevices.
+        """
+
+        token = self._token
+        if token is None or token.expires_in() <= self._expiry_margin:
+            with self._lock:
+                # Пока поток ждал блокировку, токен мог обновить другой поток
+                token = self._token
+                if token is None or token.expires_in() <= self._expiry_margin:
+                    token = self._token = self._request_token()
+        elif token.expires_in() <= self._refresh_margin:
+            with self._lock:
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh_in_background, daemon=True).start()
+        return token.access_token
@@ -0,0 +1,170 @@
+import random
+import time
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from .constants import (
+    POLL_BACKOFF_FACTOR,
+    POLL_JITTER,
+    RECOGNITION_LATENCY,
+    RECOGNITION_SPEED,
+    RECOGNITION_SPEED_SMOOTHING,
+)
+
+
+class _PolledTask(BaseModel):
+    """Состояние опроса задачи, время - по `time.monotonic()`"""
+
+    duration: float | None
+    created_at: float
+    expected_at: float
+    next_poll_at: float
+    attempt: int = 0
+    failures: int = 0  # Ошибок опроса подряд
+
+
+class PollingScheduler:
+    """Планировщик опроса статусов задач распознавания.
+
+    Время готовности задачи оценивается по продолжительности аудио и наблюдаемой
+    скорости распознавания (`время обработки / продолжительность аудио`, скользящее
+    среднее по завершённым задачам). Первый опрос задачи - в момент ожидаемой готовности,
+    дальше интервал растёт экспоненциально (со случайным разбросом) до `max_interval`.
+
+    Example:
+        >>> scheduler = PollingScheduler(min_interval=1, max_interval=30)
+        >>> scheduler.add(task.id, duration=600)
+        >>> await asyncio.sleep(scheduler.next_delay())
+        >>> for task_id in scheduler.due():
+        ...     ...
+    """
+
+    def __init__(
+            self,
+            min_interval: float = 1,
+            max_interval: float = 30,
+            speed: float = RECOGNITION_SPEED,
+            latency: float = RECOGNITION_LATENCY,
+    ) -> None:
+        """
+        :param min_interval: Минимальный интервал опроса задачи (в секундах).
+        :param max_interval: Максимальный интервал опроса задачи (в секундах).
+        :param speed: Начальная оценка скорости распознавания (секунд обработки на секунду аудио).
+        :param latency: Оценка задержки постановки задачи в работу (в секундах).
+        """
+
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._speed = speed
+        self._latency = latency
+        self._tasks: dict[UUID, _PolledTask] = {}
+
+    @property
+    def speed(self) -> float:
+        """Текущая оценка скорости распознавания (секунд обработки на секунду аудио)"""
+
+        return self._speed
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks
+
+    def _expected_time(self, duration: float | None) -> float:
+        if duration is None:
+            return self._min_interval
+        return self._latency + duration * self._speed
+
+    def add(self, task_id: UUID, duration: float | None = None) -> None:
+        """Добавление задачи: первый опрос запланирован на ожидаемое время готовности.
+
+        :param task_id: Идентификатор задачи распознавания.
+        :param duration: Продолжительность аудио в секундах (*опционально).
+        """
+
+        now = time.monotonic()
+        expected_at = now + max(self._expected_time(duration), self._min_interval)
+        self._tasks[task_id] = _PolledTask(
+            duration=duration, created_at=now, expected_at=expected_at, next_poll_at=expected_at
+        )
+
+    def remove(self, task_id: UUID) -> None:
+        """Удаление задачи без обновления оценки скорости (задача отменена или упала)"""
+
+        self._tasks.pop(task_id, None)
+
+    def complete(self, task_id: UUID, processing_time: float | None = None) -> None:
+        """Удаление готовой задачи и уточнение оценки скорости распознавания.
+
+        :param task_id: Идентификатор задачи распознавания.
+        :param processing_time: Время обработки по данным сервиса (`updated_at - created_at`),
+        без него используется время до успешного опроса (оценка сверху).
+        """
+
+        task = self._tasks.pop(task_id, None)
+        if task is None or not task.duration:
+            return
+        if processing_time is None:
+            processing_time = time.monotonic() - task.created_at
+        speed = max(processing_time - self._latency, 0) / task.duration
+        self._speed += RECOGNITION_SPEED_SMOOTHING * (speed - self._speed)
+
+    def reschedule(self, task_id: UUID) -> None:
+        """Планирование следующего опроса ещё не готовой задачи с экспоненциальной задержкой"""
+
+        task = self._tasks.get(task_id)
+        if task is None:
+            return
+        task.failures = 0
+        self._backoff(task)
+
+    def fail(self, task_id: UUID) -> int:
+        """Планирование повторного опроса задачи после ошибки получения статуса
+        (с той же экспоненциальной задержкой).
+
+        :param task_id: Идентификатор задачи распознавания.
+        :returns: Количество ошибок опроса задачи подряд.
+        """
+
+        task = self._tasks.get(task_id)
+        if task is None:
+            return 0
+        task.failures += 1
+        self._backoff(task)
+        return task.failures
+
+    def _backoff(self, task: _PolledTask) -> None:
+        task.attempt += 1
+        delay = min(self._min_interval * POLL_BACKOFF_FACTOR ** task.attempt, self._max_interval)
+        delay *= random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)  # noqa: S311
+        task.next_poll_at = time.monotonic() + max(delay, self._min_interval)
+
+    def due(self) -> list[UUID]:
+        """Задачи, статус которых пора опросить (опрашиваются одним пакетом)"""
+
+        now = time.monotonic()
+        return [task_id for task_id, task in self._tasks.items() if task.next_poll_at <= now]
+
+    def next_delay(self) -> float:
+        """Время до ближайшего запланированного опроса (в секундах)"""
+
+        if not self._tasks:
+            return self._min_interval
+        next_poll_at = min(task.next_poll_at for task in self._tasks.values())
+        return max(next_poll_at - time.monotonic(), 0)
+
+    def eta(self, task_id: UUID) -> float | None:
+        """Оценка оставшегося времени до готовности задачи (в секундах).
+
+        :param task_id: Идентификатор задачи распознавания.
+        :returns: Оставшееся время или None, если задача не отслеживается.
+        Для задачи, которая не успела к ожидаемому времени, - время до следующего опроса.
+        """
+
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        now = time.monotonic()
+        return max(task.expected_at - now, task.next_poll_at - now, 0)
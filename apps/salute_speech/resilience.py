@@ -0,0 +1,179 @@
+from typing import Literal, Protocol
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import AbstractAsyncContextManager
+
+from pydantic import BaseModel, NonNegativeFloat, PositiveInt
+
+logger = logging.getLogger(__name__)
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class RateLimiter(Protocol):
+    """Ограничение частоты запросов к API (локальное или общее для процессов)"""
+
+    async def acquire(self) -> None:
+        """Ожидание разрешения на один запрос"""
+
+
+class TaskSlots(Protocol):
+    """Ограничение количества задач распознавания в работе на весь аккаунт"""
+
+    def slot(self) -> AbstractAsyncContextManager[None]:
+        """Занятие слота задачи на время её выполнения"""
+
+
+class TokenBucket:
+    """Ограничение частоты запросов алгоритмом token bucket в пределах процесса.
+
+    Example:
+        >>> limiter = TokenBucket(rate=10, capacity=20)
+        >>> await limiter.acquire()
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """
+        :param rate: Количество запросов в секунду.
+        :param capacity: Максимальный всплеск запросов (по умолчанию равен `rate`).
+        """
+
+        self._rate = rate
+        self._capacity = max(capacity or rate, 1)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated_at) * self._rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class RetryPolicy(BaseModel):
+    """Политика повторов с decorrelated jitter:
+    `delay = min(max_delay, random(base_delay, previous_delay * 3))`
+
+    Attributes:
+        attempts: Максимальное количество попыток (вместе с первой)
+        base_delay: Минимальная задержка между попытками (в секундах)
+        max_delay: Максимальная задержка между попытками (в секундах)
+    """
+
+    attempts: PositiveInt = 5
+    base_delay: NonNegativeFloat = 0.5
+    max_delay: NonNegativeFloat = 30
+
+    def next_delay(self, previous_delay: float) -> float:
+        """Задержка перед следующей попыткой по задержке перед предыдущей"""
+
+        upper = max(previous_delay * 3, self.base_delay)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))  # noqa: S311
+
+
+class CircuitBreaker:
+    """Circuit breaker для внешнего API.
+
+    После `failure_threshold` ошибок подряд цепь размыкается: новые запросы ждут
+    `recovery_timeout`, после чего пропускается не больше `half_open_probes` пробных
+    запросов одновременно (half-open), остальные ждут их результата. Успешный
+    запрос замыкает цепь, ошибка пробного запроса снова её размыкает.
+
+    Example:
+        >>> breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30)
+        >>> is_probe = await breaker.acquire()
+        >>> try:
+        ...     await call_api()
+        ... except ServiceError:
+        ...     breaker.record_failure()
+        ... else:
+        ...     breaker.record_success()
+        ... finally:
+        ...     if is_probe:
+        ...         breaker.release_probe()
+    """
+
+    def __init__(
+            self,
+            failure_threshold: int = 5,
+            recovery_timeout: float = 30,
+            half_open_probes: int = 1,
+    ) -> None:
+        """
+        :param failure_threshold: Количество ошибок подряд для размыкания цепи.
+        :param recovery_timeout: Время до пробного запроса после размыкания (в секундах).
+        :param half_open_probes: Максимальное количество пробных запросов одновременно.
+        """
+
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_probes = half_open_probes
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probes = 0
+        # Пробный запрос завершился: ждущие проверяют состояние цепи заново
+        self._probe_released = asyncio.Event()
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self._recovery_timeout:
+            return "half_open"
+        return "open"
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Circuit closed, provider is healthy again")
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == "half_open" or self._failures >= self._failure_threshold:
+            if self.state == "closed":
+                logger.warning("Circuit opened after %s failures in a row", self._failures)
+            self._opened_at = time.monotonic()
+
+    async def wait(self) -> None:
+        """Ожидание, пока цепь разомкнута или все пробные запросы уже выполняются"""
+
+        while True:
+            state = self.state
+            has_free_probe = self._probes < self._half_open_probes
+            if state == "closed" or (state == "half_open" and has_free_probe):
+                return
+            if state == "open" and self._opened_at is not None:
+                await asyncio.sleep(self._opened_at + self._recovery_timeout - time.monotonic())
+            else:
+                await self._probe_released.wait()
+
+    async def acquire(self) -> bool:
+        """Ожидание разрешения на запрос, в half-open запрос занимает место пробного.
+
+        :returns: Пробный ли запрос (по его завершении нужно вызвать `release_probe`).
+        """
+
+        await self.wait()
+        if self.state != "half_open":
+            return False
+        self._probes += 1
+        return True
+
+    def release_probe(self) -> None:
+        """Завершение пробного запроса (после `record_success` / `record_failure`)"""
+
+        self._probes = max(self._probes - 1, 0)
+        self._probe_released.set()
+        self._probe_released = asyncio.Event()
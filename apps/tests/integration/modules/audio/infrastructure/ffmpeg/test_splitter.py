@@ -0,0 +1,88 @@
+import asyncio
+import shutil
+import wave
+from pathlib import Path
+
+import aiofiles
+import pytest
+
+from modules.audio.domain import AUDIO_PROFILES, AudioFormat, AudioSegment
+from modules.audio.infrastructure.ffmpeg.planner import SilenceBoundaryPlanner
+from modules.audio.infrastructure.ffmpeg.splitter import FFMpegAudioSplitter
+from modules.audio.utils.headers import parse_audio_header
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="FFmpeg is not installed")
+
+RECORDING_DURATION = 25
+SEGMENT_DURATION = 10
+SEGMENTS_COUNT = 3
+SAMPLERATE = 16000
+
+
+def _make_recording(path: Path) -> Path:
+    with wave.open(f"{path}", "wb") as recording:
+        recording.setnchannels(1)
+        recording.setsampwidth(2)
+        recording.setframerate(SAMPLERATE)
+        recording.writeframes(bytes(2 * SAMPLERATE * RECORDING_DURATION))
+    return path
+
+
+def _split(splitter: FFMpegAudioSplitter, recording: Path) -> list[AudioSegment]:
+    async def stream():
+        async with aiofiles.open(recording, mode="rb") as file:
+            yield await file.read()
+
+    async def collect() -> list[AudioSegment]:
+        return [segment async for segment in splitter.split_stream(stream())]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_flac_segments_without_overlap_describe_own_duration(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch, streaming: bool
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    recording = _make_recording(tmp_path / "recording.wav")
+    splitter = FFMpegAudioSplitter(
+        segment_duration=SEGMENT_DURATION,
+        segment_overlap=0,
+        profile=AUDIO_PROFILES["speech_flac"],
+        temp_dir=tmp_path,
+        prefix="flac",
+        streaming=streaming,
+    )
+
+    segments = _split(splitter, recording)
+
+    assert len(segments) == SEGMENTS_COUNT
+    for segment in segments:
+        assert segment.format == AudioFormat.FLAC
+        assert parse_audio_header(segment.content) is not None
+        assert 0 < segment.duration <= SEGMENT_DURATION
+    # Последний сегмент не должен описывать всю запись
+    assert segments[-1].duration < SEGMENT_DURATION
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["recording.wav"]
+
+
+def test_planned_segments_without_overlap_carry_cut_offsets(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    recording = _make_recording(tmp_path / "recording.wav")
+    planner = SilenceBoundaryPlanner(search_window=SEGMENT_DURATION / 2)
+    splitter = FFMpegAudioSplitter(
+        segment_duration=SEGMENT_DURATION,
+        segment_overlap=0,
+        profile=AUDIO_PROFILES["speech_flac"],
+        temp_dir=tmp_path,
+        prefix="planned",
+        boundary_planner=planner,
+    )
+    cut_points = asyncio.run(planner.plan(recording, SEGMENT_DURATION))
+
+    segments = _split(splitter, recording)
+
+    assert [segment.offset for segment in segments] == [0.0, *cut_points]
+    assert all(segment.overlap == 0 for segment in segments)
@@ -0,0 +1,58 @@
+import asyncio
+import shutil
+import wave
+from pathlib import Path
+
+import pytest
+
+from modules.audio.utils.fingerprint import fingerprint_audio
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="FFmpeg is not installed")
+
+RECORDING_DURATION = 25
+SEGMENT_DURATION = 10
+SAMPLERATE = 16000
+
+
+def _make_recording(path: Path) -> Path:
+    with wave.open(f"{path}", "wb") as recording:
+        recording.setnchannels(1)
+        recording.setsampwidth(2)
+        recording.setframerate(SAMPLERATE)
+        recording.writeframes(bytes(range(256)) * (SAMPLERATE * RECORDING_DURATION // 128))
+    return path
+
+
+def _ffmpeg(*args: str) -> None:
+    async def run() -> int:
+        process = await asyncio.create_subprocess_exec("ffmpeg", "-v", "error", "-y", *args)
+        return await process.wait()
+
+    assert asyncio.run(run()) == 0
+
+
+def test_flac_fingerprint_matches_wav(tmp_path: Path) -> None:
+    recording = _make_recording(tmp_path / "recording.wav")
+    _ffmpeg("-i", f"{recording}", "-c:a", "flac", f"{tmp_path / 'recording.flac'}")
+
+    wav_fingerprint = fingerprint_audio(recording.read_bytes())
+
+    assert wav_fingerprint.startswith("pcm:")
+    assert fingerprint_audio((tmp_path / "recording.flac").read_bytes()) == wav_fingerprint
+
+
+def test_flac_fingerprint_ignores_stream_info_of_whole_recording(tmp_path: Path) -> None:
+    recording = _make_recording(tmp_path / "recording.wav")
+    # Сегмент-мюксер пишет в последний сегмент STREAMINFO всей записи
+    _ffmpeg(
+        "-i", f"{recording}",
+        "-f", "segment", "-segment_time", f"{SEGMENT_DURATION}", "-reset_timestamps", "1",
+        "-c:a", "flac", f"{tmp_path / 'segment_%03d.flac'}",
+    )
+
+    fingerprints = [
+        fingerprint_audio(path.read_bytes()) for path in sorted(tmp_path.glob("segment_*.flac"))
+    ]
+
+    assert fingerprint_audio(recording.read_bytes()) not in fingerprints
+    assert all(fingerprint.startswith("raw:") for fingerprint in fingerprints)
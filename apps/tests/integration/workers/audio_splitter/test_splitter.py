@@ -0,0 +1,95 @@
+import asyncio
+import shutil
+import wave
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from pathlib import Path
+
+import aiofiles
+import pytest
+
+from modules.audio.domain import AUDIO_PROFILES, AudioFormat, AudioSegment
+from modules.audio.utils.headers import parse_audio_header
+from workers.audio_splitter.splitter import AudioSplitter
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="FFmpeg is not installed")
+
+RECORDING_DURATION = 25
+CHUNK_DURATION = 10
+SAMPLERATE = 16000
+
+
+def _make_recording(path: Path) -> Path:
+    with wave.open(f"{path}", "wb") as recording:
+        recording.setnchannels(1)
+        recording.setsampwidth(2)
+        recording.setframerate(SAMPLERATE)
+        recording.writeframes(bytes(2 * SAMPLERATE * RECORDING_DURATION))
+    return path
+
+
+def test_flac_chunks_without_overlap_describe_own_duration(tmp_path: Path) -> None:
+    recording = _make_recording(tmp_path / "recording.wav")
+    splitter = AudioSplitter(
+        chunk_duration=CHUNK_DURATION,
+        profile=AUDIO_PROFILES["speech_flac"],
+        prefix="flac",
+        temp_dir=tmp_path,
+    )
+
+    async def collect() -> list[AudioSegment]:
+        return [chunk async for chunk in splitter.split_file(recording)]
+
+    chunks = asyncio.run(collect())
+
+    assert [chunk.offset for chunk in chunks] == [0, CHUNK_DURATION, 2 * CHUNK_DURATION]
+    for chunk in chunks:
+        assert chunk.format == AudioFormat.FLAC
+        assert parse_audio_header(chunk.content) is not None
+        assert 0 < chunk.duration <= CHUNK_DURATION
+    # Последний чанк не должен описывать всю запись
+    assert chunks[-1].duration < CHUNK_DURATION
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["recording.wav"]
+
+
+def test_interrupted_split_leaves_no_scratch_files(tmp_path: Path) -> None:
+    recording = _make_recording(tmp_path / "recording.wav")
+    splitter = AudioSplitter(
+        chunk_duration=CHUNK_DURATION,
+        profile=AUDIO_PROFILES["speech_flac"],
+        prefix="interrupted",
+        temp_dir=tmp_path,
+    )
+
+    async def stream() -> AsyncIterator[bytes]:
+        async with aiofiles.open(recording, mode="rb") as file:
+            yield await file.read()
+
+    async def read_first() -> AudioSegment:
+        async with aclosing(splitter.split_stream(stream())) as chunks:
+            return await anext(chunks)
+
+    chunk = asyncio.run(read_first())
+    splitter.remove_chunks()
+
+    assert chunk.number == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["recording.wav"]
+
+
+def test_failed_download_leaves_no_input_file(tmp_path: Path) -> None:
+    splitter = AudioSplitter(
+        chunk_duration=CHUNK_DURATION, prefix="failed", temp_dir=tmp_path
+    )
+
+    async def stream() -> AsyncIterator[bytes]:
+        yield bytes(SAMPLERATE)
+        await asyncio.sleep(0)
+        raise ConnectionError
+
+    async def split() -> None:
+        async for _ in splitter.split_stream(stream()):
+            pass
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(split())
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,38 @@
+import numpy as np
+
+from modules.audio.utils.silence import SILENCE_DB, choose_cut_points
+
+FRAME_DURATION = 0.01
+TARGET_DURATION = 1.0
+SEARCH_WINDOW = 0.5
+PAUSE_DURATION = 0.05
+SPEECH_DB = -20.0
+FAR_PAUSE = slice(55, 65)
+NEAR_PAUSE = slice(85, 95)
+
+
+def test_choose_cut_points_prefers_pause_closest_to_target() -> None:
+    # Две паузы одинаковой тишины: на 0.6 с и на 0.9 с от начала записи
+    envelope = np.full(150, SPEECH_DB, dtype=np.float32)
+    envelope[FAR_PAUSE] = SILENCE_DB
+    envelope[NEAR_PAUSE] = SILENCE_DB
+
+    cut_points = choose_cut_points(
+        envelope, FRAME_DURATION, TARGET_DURATION, SEARCH_WINDOW, pause_duration=PAUSE_DURATION
+    )
+
+    assert len(cut_points) == 1
+    assert NEAR_PAUSE.start * FRAME_DURATION <= cut_points[0] < NEAR_PAUSE.stop * FRAME_DURATION
+
+
+def test_choose_cut_points_in_silence_cuts_at_target() -> None:
+    envelope = np.full(250, SILENCE_DB, dtype=np.float32)
+
+    cut_points = choose_cut_points(
+        envelope, FRAME_DURATION, TARGET_DURATION, SEARCH_WINDOW, pause_duration=PAUSE_DURATION
+    )
+
+    assert all(
+        TARGET_DURATION - FRAME_DURATION <= end - start <= TARGET_DURATION
+        for start, end in zip([0.0, *cut_points], cut_points, strict=False)
+    )
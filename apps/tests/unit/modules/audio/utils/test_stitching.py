@@ -0,0 +1,83 @@
+from modules.audio.domain import TranscriptionSegment
+from modules.audio.utils.stitching import merge_overlapping_texts, stitch_transcriptions
+
+
+def test_merge_overlapping_texts_removes_duplicated_words() -> None:
+    left = "0. добрый день коллеги (1) [neutral]\n1. начнём с отчёта по продажам (2) [neutral]"
+    right = "0. отчёта по продажам за квартал (2) [neutral]\n1. спасибо (1) [positive]"
+
+    assert merge_overlapping_texts(left, right, overlap=2) == (
+        "0. добрый день коллеги (1) [neutral]\n"
+        "1. начнём с отчёта по продажам (2) [neutral]\n"
+        "0. за квартал (2) [neutral]\n"
+        "1. спасибо (1) [positive]"
+    )
+
+
+def test_merge_overlapping_texts_ignores_numbering_and_tags() -> None:
+    left = (
+        "2. итак по маркетингу (1) [neutral]\n"
+        "3. слушаю вас внимательно (2) [neutral]"
+    )
+    right = (
+        "0. нимательно (2) [neutral]\n"
+        "1. расходы выросли на двадцать процентов (1) [neutral]"
+    )
+
+    merged = merge_overlapping_texts(left, right, overlap=2)
+
+    assert "слушаю вас внимательно" in merged
+    assert "расходы выросли на двадцать процентов" in merged
+
+
+def test_merge_overlapping_texts_ignores_punctuation_and_case() -> None:
+    left = "Мы закончили. Переходим к бюджету"
+    right = "переходим, к бюджету на следующий год"
+
+    assert merge_overlapping_texts(left, right, overlap=1) == (
+        "Мы закончили. Переходим к бюджету\nна следующий год"
+    )
+
+
+def test_merge_overlapping_texts_keeps_lines_after_full_match() -> None:
+    left = "0. обсудим сроки релиза (1) [neutral]"
+    right = "0. сроки релиза (1) [neutral]\n1. предлагаю пятницу (2) [positive]"
+
+    assert merge_overlapping_texts(left, right, overlap=1) == (
+        "0. обсудим сроки релиза (1) [neutral]\n1. предлагаю пятницу (2) [positive]"
+    )
+
+
+def test_merge_overlapping_texts_without_match_joins_texts() -> None:
+    left = "0. первая часть (1) [neutral]"
+    right = "0. совсем другое (1) [neutral]"
+
+    assert merge_overlapping_texts(left, right, overlap=2) == f"{left}\n{right}"
+
+
+def test_merge_overlapping_texts_without_overlap_joins_texts() -> None:
+    left = "0. сроки релиза (1) [neutral]"
+    right = "0. сроки релиза (1) [neutral]"
+
+    assert merge_overlapping_texts(left, right, overlap=0) == f"{left}\n{right}"
+
+
+def test_stitch_transcriptions_orders_segments_by_number() -> None:
+    segments = [
+        TranscriptionSegment(number=2, offset=58, overlap=2, text="0. план на неделю готов"),
+        TranscriptionSegment(number=1, offset=0, overlap=0, text="0. посмотрим план на неделю"),
+    ]
+
+    assert stitch_transcriptions(segments) == "0. посмотрим план на неделю\n---\n0. готов"
+
+
+def test_stitch_transcriptions_separates_segments() -> None:
+    segments = [
+        TranscriptionSegment(number=1, offset=0, overlap=0, text="0. первый (1) [neutral]"),
+        TranscriptionSegment(number=2, offset=60, overlap=0, text="0. второй (1) [neutral]"),
+        TranscriptionSegment(number=3, offset=120, overlap=0, text=""),
+    ]
+
+    assert stitch_transcriptions(segments) == (
+        "0. первый (1) [neutral]\n---\n0. второй (1) [neutral]"
+    )
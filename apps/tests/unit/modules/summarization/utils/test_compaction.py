@@ -0,0 +1,40 @@
+from modules.summarization.utils.compaction import compact_transcript
+
+PHRASES_COUNT = 4
+SEPARATED_TURNS_COUNT = 2
+
+
+def test_compact_transcript_merges_phrases_of_speaker() -> None:
+    transcript = (
+        "0. добрый день (1) [neutral]\n"
+        "1. начнём совещание (1) [positive]\n"
+        "2. угу (2) [neutral]\n"
+        "3. первый вопрос бюджет (1) [neutral]"
+    )
+
+    compacted = compact_transcript(transcript)
+
+    assert compacted.text == (
+        "Спикер 1 [positive]: добрый день начнём совещание первый вопрос бюджет"
+    )
+    assert compacted.phrases_count == PHRASES_COUNT
+    assert compacted.turns_count == 1
+
+
+def test_compact_transcript_keeps_segments_apart() -> None:
+    transcript = (
+        "0. расходы выросли (1) [neutral]\n"
+        "---\n"
+        "0. я не согласен (1) [negative]\n"
+        "1. давайте проверим (1) [neutral]\n"
+        "---"
+    )
+
+    compacted = compact_transcript(transcript)
+
+    assert compacted.text == (
+        "Спикер 1: расходы выросли\n"
+        "---\n"
+        "Спикер 1 [negative]: я не согласен давайте проверим"
+    )
+    assert compacted.turns_count == SEPARATED_TURNS_COUNT
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class ScratchSpaceLimiter:
+    """Ограничение суммарного объёма временных файлов параллельных задач разбиения.
+
+    Задача резервирует оценку своего объёма на диске до старта и освобождает её
+    после завершения. Резервы выдаются строго в порядке запросов (FIFO), чтобы
+    большая запись не ждала бесконечно, пока её обгоняют маленькие.
+
+    Example:
+        >>> limiter = ScratchSpaceLimiter(limit=2 * 1024 ** 3)
+        >>> async with limiter.reserve(record_size):
+        ...     await split_record(record)
+    """
+
+    def __init__(self, limit: int) -> None:
+        """
+        :param limit: Максимальный суммарный объём временных файлов в байтах.
+        """
+
+        self._limit = limit
+        self._used = 0
+        self._waiters: deque[tuple[int, asyncio.Future[None]]] = deque()
+
+    def _wake_up(self) -> None:
+        while self._waiters:
+            size, waiter = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if self._used + size > self._limit:
+                break
+            self._waiters.popleft()
+            self._used += size
+            waiter.set_result(None)
+
+    @asynccontextmanager
+    async def reserve(self, size: int) -> AsyncIterator[None]:
+        """Резервирование места на диске на время выполнения задачи.
+
+        :param size: Оценка объёма временных файлов задачи в байтах
+        (больше лимита - резервируется весь лимит).
+        """
+
+        size = min(max(size, 0), self._limit)
+        if not self._waiters and self._used + size <= self._limit:
+            self._used += size
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append((size, waiter))
+            logger.debug("Waiting for %s bytes of scratch space, used %s", size, self._used)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._used -= size
+                    self._wake_up()
+                raise
+        try:
+            yield
+        finally:
+            self._used -= size
+            self._wake_up()
@@ -1,16 +1,45 @@
-from collections.abc import AsyncIterable
+from typing import Any
 
+import asyncio
+import contextlib
+import logging
+import math
+import os
+from collections.abc import AsyncIterable, AsyncIterator
+from pathlib import Path
+
+import aiofiles
 from faststream import FastStream, Logger
 from faststream.rabbit import RabbitBroker
 
 from client.v1 import ClientV1
+from client.v1.models import Collection, Record
 from config.dev import settings as dev_settings
-from modules.shared_kernel.audio import AudioFormat, AudioSegment
-from modules.summarization.domain import AudioSplitEvent, SummarizationTaskCreatedEvent
+from modules.audio.application.services import transcribe_audio
+from modules.audio.domain import AudioProfile, AudioSegment, TranscriptionSegment
+from modules.audio.infrastructure.claim_check import create_claim_check
+from modules.audio.infrastructure.ffmpeg import ENHANCEMENT_FILTER, SilenceBoundaryPlanner
+from modules.audio.utils.segments import TimelineSpan, map_timeline
+from modules.audio.utils.stitching import stitch_transcriptions
+from modules.summarization.application.services import summarize_transcript
+from modules.summarization.domain import (
+    AudioSplitEvent,
+    SoundEnhancedEvent,
+    SummarizationTaskCreatedEvent,
+    TranscriptionSummarizedEvent,
+)
+from modules.summarization.infrastructure.scheduler import create_scheduler
+from salute_speech.constants import FILE_FORMAT_ENCODINGS
 
+from .limits import ScratchSpaceLimiter
 from .splitter import AudioSplitter
 
 CHUNK_SIZE = 8192  # Размер чанка для скачивания аудио записей
+CONCAT_INPUT_OPTIONS = ["-f", "concat", "-safe", "0"]  # Вход FFmpeg из списка записей
+MAX_CHUNK_DURATION = 5 * 60  # Максимальная продолжительность аудио чанка (в секундах)
+MIN_CHUNK_DURATION = 60  # Минимальная продолжительность аудио чанка (в секундах)
+
+logger = logging.getLogger(__name__)
 
 broker = RabbitBroker(url=dev_settings.rabbitmq.url)
 
@@ -18,40 +47,326 @@ app = FastStream(broker)
 
 client = ClientV1(base_url=dev_settings.app.url)
 
+claim_check = create_claim_check()
+
+scheduler = create_scheduler()
+
+ffmpeg_semaphore = asyncio.Semaphore(dev_settings.audio_pipeline.max_parallel_records)
+
+scratch_space = ScratchSpaceLimiter(limit=dev_settings.audio_pipeline.scratch_limit)
+
+if dev_settings.audio_pipeline.scratch_dir is not None:
+    dev_settings.audio_pipeline.scratch_dir.mkdir(parents=True, exist_ok=True)
+
+# В совмещённом режиме звук улучшается фильтрами FFmpeg при разбиении,
+# и чанки идут сразу на транскрибацию, минуя sound_enhancer
+fused_enhancement = dev_settings.audio_pipeline.fused_enhancement
+
+audio_filter = ENHANCEMENT_FILTER if fused_enhancement else None
+
+segments_queue = "transcribing" if fused_enhancement else "sound_enhancement"
+
+boundary_planner = (
+    SilenceBoundaryPlanner(search_window=dev_settings.audio_pipeline.silence_search_window)
+    if dev_settings.audio_pipeline.silence_aware
+    else None
+)
+
+
+def should_chunking(total_duration: float) -> bool:
+    """Нужно ли разбивать коллекцию записей на чанки"""
+
+    return total_duration > MAX_CHUNK_DURATION
 
-def should_chunking(total_duration: int) -> bool:
-    return total_duration > ...
+
+def calculate_chunk_duration(total_duration: float, record_count: int) -> int:
+    """Расчёт продолжительности чанка, так чтобы записи разбивались на чанки
+    примерно равной длины, не превышающие `MAX_CHUNK_DURATION`.
+
+    :param total_duration: Общая продолжительность записей коллекции в секундах.
+    :param record_count: Количество записей в коллекции.
+    :returns: Продолжительность чанка в секундах.
+    """
+
+    if not should_chunking(total_duration):
+        return MAX_CHUNK_DURATION
+    average_duration = total_duration / max(record_count, 1)
+    chunks_per_record = math.ceil(average_duration / MAX_CHUNK_DURATION)
+    return max(MIN_CHUNK_DURATION, math.ceil(average_duration / chunks_per_record))
+
+
+async def split_record(
+        record: Record,
+        splitter: AudioSplitter,
+        metadata: dict[str, Any],
+        queue: asyncio.Queue[AudioSegment | BaseException | None],
+) -> None:
+    """Скачивание и разбиение одной записи в пределах лимитов процессов FFmpeg и диска.
+    Чанки передаются в очередь записи, `None` - признак окончания записи.
+    """
+
+    scratch_size = int(
+        record.metadata.filesize + record.metadata.duration * splitter.bytes_per_second
+    )
+    try:
+        async with scratch_space.reserve(scratch_size), ffmpeg_semaphore:
+            stream = client.collections.download_record(record.id, chunk_size=CHUNK_SIZE)
+            # При отмене разбиение закрывается сразу, и его входной файл удаляется
+            async with contextlib.aclosing(
+                    splitter.split_stream(stream, metadata=metadata)
+            ) as audio_segments:
+                async for audio_segment in audio_segments:
+                    await queue.put(audio_segment)
+    except Exception as e:  # noqa: BLE001
+        await queue.put(e)
+    else:
+        await queue.put(None)
+
+
+async def split_collection(
+        collection: Collection, task_id: Any, audio_filter: str | None = audio_filter
+) -> AsyncIterator[AudioSegment]:
+    """Параллельное разбиение записей коллекции с выдачей чанков в порядке записей.
+
+    Записи скачиваются и режутся одновременно (не больше `max_parallel_records`),
+    а чанки нумеруются сквозной нумерацией по порядку записей. Чанк придерживается
+    до появления следующего, чтобы у последнего был известен `total_count`.
+    `audio_filter` - фильтр FFmpeg, применяемый при разбиении (улучшение звука).
+    """
+
+    chunk_duration = calculate_chunk_duration(collection.total_duration, collection.record_count)
+    profile = AudioProfile.from_name(dev_settings.audio_pipeline.profile)
+    queues: list[asyncio.Queue[AudioSegment | BaseException | None]] = [
+        asyncio.Queue(maxsize=1) for _ in collection.records
+    ]
+    splitters = [
+        AudioSplitter(
+            chunk_duration=chunk_duration,
+            profile=profile,
+            prefix=f"{collection.id}_{index}",
+            boundary_planner=boundary_planner,
+            chunk_overlap=dev_settings.audio_pipeline.segment_overlap,
+            temp_dir=dev_settings.audio_pipeline.scratch_dir,
+            audio_filter=audio_filter,
+        )
+        for index in range(len(collection.records))
+    ]
+    tasks = [
+        asyncio.create_task(split_record(
+            record,
+            splitter,
+            {"task_id": task_id, "collection_id": collection.id, "record_id": record.id},
+            queue,
+        ))
+        for record, splitter, queue in zip(collection.records, splitters, queues, strict=True)
+    ]
+    pending: AudioSegment | None = None
+    number = 0
+    try:
+        for queue in queues:
+            while (item := await queue.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                if pending is not None:
+                    yield pending
+                number += 1
+                pending = item.model_copy(update={"number": number, "total_count": None})
+        if pending is not None:
+            yield pending.model_copy(update={"total_count": number})
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Отменённые разбиения дожидаются, чтобы FFmpeg остановился и удалил свои входы,
+        # и только затем убираются чанки, которые не успели прочитать
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for splitter in splitters:
+            splitter.remove_chunks()
 
 
-def calculate_chunk_duration(total_duration: int, record_count: int) -> int:
-    ...
+def is_short(collection: Collection) -> bool:
+    """Обрабатывается ли коллекция целиком в одном процессе (быстрый путь)"""
+
+    return collection.total_duration <= dev_settings.audio_pipeline.fast_path_max_duration
+
+
+async def transcribe_segment(audio_segment: AudioSegment) -> TranscriptionSegment:
+    """Транскрибация сегмента в процессе (с кэшем результатов распознавания)"""
+
+    text = await transcribe_audio(
+        audio_segment.content,
+        audio_encoding=FILE_FORMAT_ENCODINGS[audio_segment.format],
+        channels=audio_segment.channels,
+        samplerate=audio_segment.samplerate,
+    )
+    return TranscriptionSegment.from_audio(text, audio_segment)
+
+
+async def summarize_short_collection(collection: Collection, task_id: Any) -> str:
+    """Быстрый путь для коротких записей: разбиение, улучшение звука, транскрибация
+    и суммаризация в одном процессе, без передачи аудио через брокер.
+
+    Звук улучшается фильтрами FFmpeg при разбиении (как в совмещённом режиме),
+    сегменты транскрибируются конкурентно и склеиваются так же, как в `transcript_aggregator`.
+
+    :param collection: Коллекция записей, не длиннее `fast_path_max_duration`.
+    :param task_id: Идентификатор задачи суммаризации.
+    :returns: Протокол совещания в формате Markdown.
+    """
+
+    audio_segments = [
+        audio_segment
+        async for audio_segment in split_collection(
+            collection, task_id, audio_filter=ENHANCEMENT_FILTER
+        )
+    ]
+    segments = await asyncio.gather(*map(transcribe_segment, audio_segments))
+    return await summarize_transcript(stitch_transcriptions(segments))
+
+
+async def download_record_file(record: Record, prefix: str) -> Path:
+    """Скачивание записи во временный файл в scratch директории"""
+
+    async with aiofiles.tempfile.NamedTemporaryFile(
+        delete=False,
+        suffix=Path(record.filepath).suffix or ".input",
+        prefix=prefix,
+        dir=dev_settings.audio_pipeline.scratch_dir,
+    ) as temp_file:
+        try:
+            async for chunk in client.collections.download_record(
+                    record.id, chunk_size=CHUNK_SIZE
+            ):
+                await temp_file.write(chunk)
+        except BaseException:
+            os.unlink(temp_file.name)  # Недокачанная запись не остаётся в scratch
+            raise
+        return Path(temp_file.name)
+
+
+async def split_collection_timeline(
+        collection: Collection, task_id: Any
+) -> AsyncIterator[AudioSegment]:
+    """Разбиение коллекции как единого таймлайна: записи склеиваются concat демуксером
+    FFmpeg и режутся на равные чанки поверх границ записей. Каждый чанк несёт карту
+    записей в `metadata["records"]` (см. `map_timeline`), а `metadata["record_id"]` -
+    запись, с которой чанк начинается.
+
+    Note:
+        Concat демуксер требует одинаковых кодеков и параметров у всех записей коллекции.
+    """
+
+    spans: list[TimelineSpan] = []
+    position = 0.0
+    for record in collection.records:
+        spans.append(TimelineSpan(f"{record.id}", position, record.metadata.duration))
+        position += record.metadata.duration
+    splitter = AudioSplitter(
+        chunk_duration=calculate_chunk_duration(collection.total_duration, record_count=1),
+        profile=AudioProfile.from_name(dev_settings.audio_pipeline.profile),
+        prefix=collection.id,
+        boundary_planner=boundary_planner,
+        chunk_overlap=dev_settings.audio_pipeline.segment_overlap,
+        temp_dir=dev_settings.audio_pipeline.scratch_dir,
+        audio_filter=audio_filter,
+    )
+    scratch_size = int(
+        sum(record.metadata.filesize for record in collection.records)
+        + position * splitter.bytes_per_second
+    )
+    async with scratch_space.reserve(scratch_size), ffmpeg_semaphore:
+        downloads = await asyncio.gather(
+            *(
+                download_record_file(record, prefix=f"{collection.id}_{index}")
+                for index, record in enumerate(collection.records)
+            ),
+            return_exceptions=True,
+        )
+        files = [download for download in downloads if isinstance(download, Path)]
+        concat_list = Path(
+            dev_settings.audio_pipeline.scratch_dir or ".", f"{collection.id}_timeline.list"
+        )
+        try:
+            for download in downloads:
+                if isinstance(download, BaseException):
+                    raise download
+            async with aiofiles.open(concat_list, mode="w") as file:
+                for filepath in files:
+                    escaped = f"{filepath.absolute()}".replace("'", "'\\''")
+                    await file.write(f"file '{escaped}'\n")
+            async with contextlib.aclosing(splitter.split_file(
+                    concat_list,
+                    metadata={"task_id": task_id, "collection_id": collection.id},
+                    input_options=CONCAT_INPUT_OPTIONS,
+            )) as audio_segments:
+                async for audio_segment in audio_segments:
+                    end = (
+                        position if audio_segment.is_last
+                        else audio_segment.offset + audio_segment.duration
+                    )
+                    records = map_timeline(spans, audio_segment.offset, end)
+                    yield audio_segment.model_copy(update={"metadata": {
+                        **audio_segment.metadata,
+                        "record_id": records[0]["record_id"] if records else None,
+                        "records": records,
+                    }})
+        finally:
+            splitter.remove_chunks()
+            for filepath in [*files, concat_list]:
+                try:
+                    os.unlink(filepath)
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    logger.exception("Error occurred while unlinking file %s", filepath)
 
 
 @broker.subscriber("audio_splitting")
-@broker.publisher("sound_enhancement")
+@broker.publisher(segments_queue)
 async def handle_summarization_task_created_event(
         event: SummarizationTaskCreatedEvent, logger: Logger
 ) -> AsyncIterable[AudioSegment]:
     logger.debug("Start audio processing for collection with id %s", event.collection_id)
-    collection = await client.collections.get(event.collection_id)
-    chunk_duration = calculate_chunk_duration(collection.total_duration, collection.record_count)
-    splitter = AudioSplitter(
-        chunk_duration=chunk_duration, chunk_format=AudioFormat.WAV, prefix=collection.id,
+    # Ошибка разбиения освобождает место задачи в пайплайне, а не держит его до конца аренды
+    task_slot = (
+        scheduler.hold(event.task_id) if scheduler is not None else contextlib.nullcontext()
     )
-    segments_count = 0
-    for record in collection.records:
-        stream = client.collections.download_record(record.id, chunk_size=CHUNK_SIZE)
-        async for audio_segment in splitter.split_stream(
-                stream,
-                metadata={
-                    "task_id": event.task_id,
-                    "collection_id": collection.id,
-                    "record_id": record.id
-                }
-        ):
-            yield audio_segment
-            segments_count += 1
+    async with task_slot:
+        collection = await client.collections.get(event.collection_id)
+        if is_short(collection):
+            # Короткая запись (голосовое сообщение) не проходит через очереди пайплайна
+            summary = await summarize_short_collection(collection, event.task_id)
+            logger.info(
+                "Collection %s (%s s) summarized on the fast path",
+                collection.id, collection.total_duration,
+            )
+            await broker.publish(
+                TranscriptionSummarizedEvent(
+                    task_id=event.task_id, collection_id=collection.id, summary=summary
+                ),
+                queue="summarized",
+            )
+            if scheduler is not None:
+                await scheduler.release(event.task_id)
+            return
+        segments_count = 0
+        split = (
+            split_collection_timeline
+            if dev_settings.audio_pipeline.timeline and collection.record_count > 1
+            else split_collection
+        )
+        async with contextlib.aclosing(split(collection, event.task_id)) as audio_segments:
+            async for audio_segment in audio_segments:
+                yield (
+                    await claim_check.check_in(audio_segment)
+                    if claim_check is not None
+                    else audio_segment
+                )
+                segments_count += 1
     event = AudioSplitEvent(
         task_id=event.task_id, collection_id=collection.id, segments_count=segments_count
     )
     await broker.publish(event, queue="audio_splitting")
+    if fused_enhancement:
+        await broker.publish(
+            SoundEnhancedEvent(collection_id=collection.id), queue="sound_enhancement"
+        )
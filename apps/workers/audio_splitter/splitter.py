@@ -7,17 +7,22 @@ import logging
 import os
 import re
 from collections.abc import AsyncIterable, AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
 from pathlib import Path
 from uuid import UUID
 
 import aiofiles
 
-from modules.shared_kernel.audio import AudioFormat, AudioSegment
+from modules.audio.domain import AUDIO_PROFILES, AudioFormat, AudioProfile, AudioSegment
+from modules.audio.infrastructure.ffmpeg import SilenceBoundaryPlanner, build_overlap_filtergraph
+from modules.audio.utils.headers import parse_audio_header
+from modules.audio.utils.segments import SegmentBounds, overlapping_bounds, uniform_cut_points
 
 logger = logging.getLogger(__name__)
 
 Prefix = str | UUID | float  # Уникальный префикс
+# Промежуточный кодек сегмент-мюксера для форматов, которые он не может записать корректно
+INTERMEDIATE_CODEC = "pcm_s16le"
 
 
 class AudioSplitter:
@@ -26,26 +31,77 @@ class AudioSplitter:
     Схема работы:
 
     AsyncIterable[bytes] ──► 1. Запись во временный файл (temp_audio_file.input)
+    (опционально) планирование границ чанков по паузам в речи ──► -segment_times
     2. ffmpeg разбиение по аудио фреймам ──► chunk_000.wav, chunk_001.wav, ...
+    (опционально) улучшение звука фильтрами ffmpeg в том же проходе ──► -af
+    (при перекрытии - выход на каждый чанк из ветки asplit/atrim за один проход декодирования)
+    (FLAC - сегмент-мюксер пишет WAV, каждый чанк кодируется отдельно: FLAC кодировщик
+    заполняет STREAMINFO только в конце всего потока)
     3. Чтение чанков + получение метаданных ──► yield AudioSegment
     """
 
     def __init__(
-            self, chunk_duration: int, chunk_format: AudioFormat = "wav", prefix: Prefix = "",
+            self,
+            chunk_duration: int,
+            profile: AudioProfile = AUDIO_PROFILES["hifi"],
+            prefix: Prefix = "",
+            boundary_planner: SilenceBoundaryPlanner | None = None,
+            chunk_overlap: float = 0,
+            temp_dir: Path | None = None,
+            audio_filter: str | None = None,
     ) -> None:
         """
         :param chunk_duration: Продолжительность чанка в секундах.
-        :param chunk_format: Формат чанка на выходе, например: 'wav', 'mp3', ...
+        :param profile: Профиль чанков на выходе (формат, кодек, каналы, частота дискретизации).
         :param prefix: Уникальный префикс для избежания коллизий и конфликтов данных.
+        :param boundary_planner: Планировщик границ чанков по паузам в речи (*опционально),
+        при его наличии `chunk_duration` - максимальная продолжительность чанка.
+        :param chunk_overlap: Перекрытие соседних чанков в секундах, чтобы не терять слова
+        на границах (дубли в расшифровках склеиваются через `stitch_transcriptions`).
+        :param temp_dir: Директория для временных файлов (scratch), по умолчанию текущая.
+        :param audio_filter: Цепочка аудио фильтров FFmpeg (*опционально), применяется
+        в том же проходе декодирования, например `ENHANCEMENT_FILTER`.
         """
         self._chunk_duration = chunk_duration
-        self._chunk_format = chunk_format
+        self._profile = profile
+        self._chunk_format = profile.format
         self._prefix = prefix
+        self._boundary_planner = boundary_planner
+        self._chunk_overlap = chunk_overlap
+        self._temp_dir = temp_dir
+        self._audio_filter = audio_filter
+
+    @property
+    def bytes_per_second(self) -> int:
+        """Объём чанков на выходе в секунду записи (для оценки места на диске)"""
+        return self._profile.bytes_per_second
+
+    @property
+    def _muxer_format(self) -> AudioFormat:
+        """Формат чанков на выходе сегмент-мюксера (FLAC кодируется после разрезания)"""
+        return AudioFormat.WAV if self._chunk_format == AudioFormat.FLAC else self._chunk_format
+
+    def _output_pattern(self, chunk_format: AudioFormat) -> str:
+        pattern = f"{self._prefix}_chunk_%03d.{chunk_format}"
+        return f"{self._temp_dir / pattern}" if self._temp_dir is not None else pattern
 
     @property
     def _ffmpeg_output_pattern(self) -> str:
         """Паттерн для выходных результатов FFmpeg"""
-        return f"{self._prefix}_chunk_%03d.{self._chunk_format}"
+        return self._output_pattern(self._chunk_format)
+
+    @property
+    def _ffmpeg_muxer_pattern(self) -> str:
+        """Паттерн для чанков на выходе сегмент-мюксера FFmpeg"""
+        return self._output_pattern(self._muxer_format)
+
+    def _encoding_options(self, codec: str | None = None) -> list[str]:
+        return [
+            "-c:a", codec or self._profile.codec,
+            "-sample_fmt", self._profile.sample_format,
+            "-ac", f"{self._profile.channels}",
+            "-ar", f"{self._profile.samplerate}",
+        ]
 
     async def _write_input_file(
             self, stream: AsyncIterable[bytes], suffix: str | None = None
@@ -60,20 +116,39 @@ class AudioSplitter:
         async with aiofiles.tempfile.NamedTemporaryFile(
             delete=False,
             suffix=suffix,
-            prefix=self._prefix,
+            prefix=f"{self._prefix}",
+            dir=self._temp_dir,
         ) as temp_file:
-            async for chunk in stream:
-                await temp_file.write(chunk)
+            try:
+                async for chunk in stream:
+                    await temp_file.write(chunk)
+            except BaseException:
+                os.unlink(temp_file.name)  # Недокачанный вход не остаётся в scratch
+                raise
             return Path(temp_file.name)
 
+    def remove_chunks(self) -> None:
+        """Удаление оставшихся на диске чанков (после отмены или ошибки разбиения)"""
+        for pattern in {self._ffmpeg_output_pattern, self._ffmpeg_muxer_pattern}:
+            for filepath in glob.glob(pattern.replace("%03d", "*")):
+                try:
+                    os.unlink(filepath)
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    logger.exception("Error occurred while unlinking file %s", filepath)
+
     @staticmethod
-    async def _probe_file_metadata(filepath: Path) -> dict[str, float]:
+    async def _probe_file_metadata(
+            filepath: Path, input_options: list[str] | None = None
+    ) -> dict[str, float]:
         """Получение метаданных аудио файла
         (длительность, частота дискретизации, количество каналов)
         """
         ffprobe_command = [
             "ffprobe",
             "-v", "quiet",
+            *(input_options or []),
             "-print_format", "json",
             "-show_streams",
             "-select_streams", "a",  # Только аудио потоки
@@ -115,21 +190,65 @@ class AudioSplitter:
             )
             return {}
 
+    async def _plan_bounds(
+            self, input_file: Path, input_options: list[str] | None = None
+    ) -> list[SegmentBounds]:
+        """Планирование границ перекрывающихся чанков (по паузам или равными частями)"""
+        if self._boundary_planner is not None:
+            cut_points = await self._boundary_planner.plan(
+                input_file, self._chunk_duration, input_options=input_options
+            )
+        else:
+            file_metadata = await self._probe_file_metadata(input_file, input_options)
+            cut_points = uniform_cut_points(
+                file_metadata.get("duration", 0), self._chunk_duration
+            )
+        return overlapping_bounds(cut_points, self._chunk_overlap)
+
     @asynccontextmanager
-    async def _ffmpeg_pipe(self, input_file: Path, output_pattern: str):
+    async def _ffmpeg_pipe(
+            self,
+            input_file: Path,
+            segment_times: list[float] | None = None,
+            bounds: list[SegmentBounds] | None = None,
+            input_options: list[str] | None = None,
+    ):
         ffmpeg_command = [
             "ffmpeg",
             "-y",  # Перезапись выхода
+            *(input_options or []),
             "-i", f"{input_file}",
-            "-f", "segment",
-            "-segment_time", f"{self._chunk_duration}",
-            "-c:a", "pcm_s16le",  # Кодирование в WAV (PCM 16-bit)
-            "-ac", "2",  # 2 канала (стерео)
-            "-ar", "44100",  # Частота дискретизации 44.1 kHz
-            "-reset_timestamps", "1",
-            "-map", "0:a",  # Только аудио
-            output_pattern
         ]
+        if bounds:
+            # Сегмент-мюксер не умеет перекрывать чанки, поэтому каждый чанк - отдельный выход
+            # из своей ветки графа, обрезанной до фильтров и кодирования
+            ffmpeg_command.extend([
+                "-filter_complex",
+                build_overlap_filtergraph(bounds, audio_filter=self._audio_filter),
+            ])
+            for index in range(len(bounds)):
+                ffmpeg_command.extend([
+                    "-map", f"[s{index}]",
+                    *self._encoding_options(),
+                    self._ffmpeg_output_pattern % index,
+                ])
+        else:
+            segmentation = (
+                ["-segment_times", ",".join(f"{time}" for time in segment_times)]
+                if segment_times
+                else ["-segment_time", f"{self._chunk_duration}"]
+            )
+            ffmpeg_command.extend([
+                "-f", "segment",
+                *segmentation,
+                *(["-af", self._audio_filter] if self._audio_filter else []),
+                *self._encoding_options(
+                    INTERMEDIATE_CODEC if self._muxer_format != self._chunk_format else None
+                ),
+                "-map", "0:a",  # Только аудио
+                "-reset_timestamps", "1",
+                self._ffmpeg_muxer_pattern
+            ])
         logger.info("FFmpeg launch command: %s", " ".join(ffmpeg_command))
         process = await asyncio.create_subprocess_exec(
             *ffmpeg_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
@@ -145,27 +264,58 @@ class AudioSplitter:
                     process.kill()
                     await process.wait()
 
+    async def _encode_chunk(self, filepath: str) -> str:
+        """Кодирование чанка сегмент-мюксера в формат профиля отдельным процессом
+        (заголовок описывает только этот чанк), промежуточный файл удаляется.
+        """
+        output_path = f"{Path(filepath).with_suffix(f'.{self._chunk_format}')}"
+        ffmpeg_command = ["ffmpeg", "-y", "-i", filepath, *self._encoding_options(), output_path]
+        process = await asyncio.create_subprocess_exec(
+            *ffmpeg_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+        try:
+            os.unlink(filepath)
+        except (PermissionError, OSError):
+            logger.exception("Error occurred while unlinking file %s", filepath)
+        if process.returncode != 0:
+            error_message = stderr.decode()
+            logger.error("FFmpeg process failed with error: %s", error_message)
+            raise RuntimeError(f"FFmpeg process failed with error: {error_message}")
+        return output_path
+
     async def _iter_chunks(
-            self, metadata: dict[str, Any] | None = None
+            self,
+            metadata: dict[str, Any] | None = None,
+            bounds: list[SegmentBounds] | None = None,
+            segmented: bool = False,
     ) -> AsyncIterator[AudioSegment]:
         if metadata is None:
             metadata = {}
+        pattern = self._ffmpeg_muxer_pattern if segmented else self._ffmpeg_output_pattern
         files = sorted(
-            glob.glob(self._ffmpeg_output_pattern.replace("%03d", "*")),
-            key=lambda x: int(
-                re.search(rf"{self._prefix}_chunk_(\d+)\.{self._chunk_format}", x).group(1)
-            )
+            glob.glob(pattern.replace("%03d", "*")),
+            key=lambda x: int(re.search(rf"{self._prefix}_chunk_(\d+)\.", x).group(1))
         )
         total_count = len(files)
-        for id, filepath in enumerate(files):  # noqa: A001
-            file_metadata = await self._probe_file_metadata(Path(filepath))
-            if not file_metadata:
-                raise ValueError(f"Empty metadata for file {filepath}")
+        for index, output_path in enumerate(files):
+            filepath = output_path
+            if segmented and self._muxer_format != self._chunk_format:
+                filepath = await self._encode_chunk(output_path)
             async with aiofiles.open(filepath, mode="rb") as file:
                 content = await file.read()
+            # Чанки записаны FFmpeg в WAV/FLAC, поэтому метаданные берутся из заголовка,
+            # FFprobe запускается только для остальных форматов
+            file_metadata = parse_audio_header(content) or await self._probe_file_metadata(
+                Path(filepath)
+            )
+            if not file_metadata:
+                raise ValueError(f"Empty metadata for file {filepath}")
             yield AudioSegment(
-                id=id + 1,
+                number=index + 1,
                 total_count=total_count,
+                offset=bounds[index].start if bounds else index * self._chunk_duration,
+                overlap=bounds[index].overlap if bounds else 0,
                 content=content,
                 duration=int(file_metadata["duration"]),
                 format=AudioFormat.from_filepath(filepath),
@@ -179,22 +329,63 @@ class AudioSplitter:
             except (PermissionError, OSError):
                 logger.exception("Error occurred while unlinking file %s", filepath)
 
-    async def split_stream(
-            self, stream: AsyncIterable[bytes], metadata: dict[str, Any] | None = None
+    async def split_file(
+            self,
+            input_file: Path,
+            metadata: dict[str, Any] | None = None,
+            input_options: list[str] | None = None,
     ) -> AsyncIterator[AudioSegment]:
-        """Потоковое разделение аудио на чанки с переконвертацией.
+        """Разделение аудио файла на чанки с переконвертацией.
 
-        :param stream: Поток байтов аудио записи.
+        :param input_file: Путь до аудио файла (или списка записей для concat демуксера).
         :param metadata: Дополнительные данные, которые нужно передать в контекст чанков.
-        :returns: Байты чанка + фактическая продолжительность чанка.
+        :param input_options: Параметры входа FFmpeg (*опционально),
+        например `-f concat -safe 0` для склейки записей в один таймлайн.
+        :returns: Генератор чанков, смещение чанка в `offset`.
         """
-        input_file = await self._write_input_file(stream)
-        async with self._ffmpeg_pipe(input_file, self._ffmpeg_output_pattern) as process:
+        segment_times, bounds = None, None
+        if self._chunk_overlap > 0:
+            bounds = await self._plan_bounds(input_file, input_options)
+        elif self._boundary_planner is not None:
+            segment_times = await self._boundary_planner.plan(
+                input_file, self._chunk_duration, input_options=input_options
+            )
+        async with self._ffmpeg_pipe(
+                input_file,
+                segment_times=segment_times,
+                bounds=bounds,
+                input_options=input_options,
+        ) as process:
             _, stderr = await process.communicate()
             if process.returncode != 0:
                 error_message = stderr.decode()
                 logger.error("FFmpeg process failed with error: %s", error_message)
                 raise RuntimeError(f"FFmpeg process failed with error: {error_message}")
-            async for chunk in self._iter_chunks(metadata):
+            # Без перекрытия смещения чанков совпадают с точками разреза
+            chunk_bounds = bounds or (
+                overlapping_bounds(segment_times, 0) if segment_times else None
+            )
+            async for chunk in self._iter_chunks(
+                    metadata, bounds=chunk_bounds, segmented=not bounds
+            ):
                 yield chunk
-            os.unlink(input_file)
+
+    async def split_stream(
+            self, stream: AsyncIterable[bytes], metadata: dict[str, Any] | None = None
+    ) -> AsyncIterator[AudioSegment]:
+        """Потоковое разделение аудио на чанки с переконвертацией.
+
+        :param stream: Поток байтов аудио записи.
+        :param metadata: Дополнительные данные, которые нужно передать в контекст чанков.
+        :returns: Байты чанка + фактическая продолжительность чанка.
+        """
+        input_file = await self._write_input_file(stream)
+        try:
+            async with aclosing(self.split_file(input_file, metadata)) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+        finally:
+            try:
+                os.unlink(input_file)
+            except OSError:
+                logger.exception("Error occurred while unlinking input file %s", input_file)
@@ -0,0 +1,110 @@
+import asyncio
+import contextlib
+import logging
+
+from faststream import FastStream, Logger
+from faststream.rabbit import RabbitBroker
+from redis import RedisError
+
+from client.v1 import ClientV1
+from config.dev import settings as dev_settings
+from modules.summarization.domain import SummarizationTaskCreatedEvent
+from modules.summarization.infrastructure.scheduler import ScheduledTask, create_scheduler
+
+logger = logging.getLogger(__name__)
+
+broker = RabbitBroker(url=dev_settings.rabbitmq.url)
+
+app = FastStream(broker)
+
+client = ClientV1(base_url=dev_settings.app.url)
+
+scheduler = create_scheduler()
+
+# Новая задача будит цикл выдачи, освобождение мест замечается по интервалу
+wakeup = asyncio.Event()
+
+dispatcher: asyncio.Task[None] | None = None
+
+
+async def dispatch_task(task: ScheduledTask) -> None:
+    """Передача задачи в пайплайн, при ошибке публикации задача возвращается в очередь"""
+
+    event = SummarizationTaskCreatedEvent(
+        task_id=task.task_id, collection_id=task.collection_id, workspace_id=task.workspace_id
+    )
+    try:
+        await broker.publish(event, queue="audio_splitting")
+    except Exception:
+        logger.exception("Task %s is not dispatched, returning it to the queue", task.task_id)
+        await scheduler.release(task.task_id)
+        await scheduler.submit(task)
+    else:
+        logger.info(
+            "Task %s (%s s) of workspace %s dispatched",
+            task.task_id, task.duration, task.workspace_id,
+        )
+
+
+async def dispatch_pending() -> None:
+    """Выдача задач в пайплайн на свободные места (один проход)"""
+
+    try:
+        tasks = await scheduler.dispatch()
+    except RedisError:
+        logger.exception("Error occurred while dispatching tasks")
+        return
+    for task in tasks:
+        await dispatch_task(task)
+
+
+async def dispatch_loop() -> None:
+    """Выдача задач в пайплайн по мере освобождения мест"""
+
+    while True:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(
+                wakeup.wait(), timeout=dev_settings.scheduler.dispatch_interval
+            )
+        # Новая задача, пришедшая во время выдачи, разбудит следующую итерацию
+        wakeup.clear()
+        await dispatch_pending()
+
+
+@app.after_startup
+async def start_dispatcher() -> None:
+    global dispatcher  # noqa: PLW0603
+    if scheduler is not None:
+        # Задачи, накопленные пока воркер не работал, выдаются сразу после запуска брокера
+        await dispatch_pending()
+        dispatcher = asyncio.create_task(dispatch_loop())
+
+
+@app.after_shutdown
+async def stop_dispatcher() -> None:
+    if dispatcher is not None:
+        dispatcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await dispatcher
+
+
+@broker.subscriber("summarization_tasks")
+async def handle_summarization_task_created_event(
+        event: SummarizationTaskCreatedEvent, logger: Logger
+) -> None:
+    if scheduler is None:
+        # Планировщик выключен: задачи идут в пайплайн в порядке поступления
+        await broker.publish(event, queue="audio_splitting")
+        return
+    collection = await client.collections.get(event.collection_id)
+    queued = await scheduler.submit(ScheduledTask(
+        task_id=event.task_id,
+        collection_id=event.collection_id,
+        workspace_id=event.workspace_id or collection.user_id,
+        duration=collection.total_duration,
+    ))
+    logger.info(
+        "Task %s (%s s) queued, %s tasks in the workspace queue",
+        event.task_id, collection.total_duration, queued,
+    )
+    wakeup.set()
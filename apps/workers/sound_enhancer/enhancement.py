@@ -0,0 +1,44 @@
+from typing import Any
+
+import logging
+import os
+
+from pedalboard import Pedalboard
+
+from modules.audio.domain import AudioFormat
+from modules.audio.utils.enhancement import PRESETS, enhance_sound_quality_adaptive
+from modules.audio.utils.enhancement import enhance_sound_quality as enhance_audio
+
+logger = logging.getLogger(__name__)
+
+# Цепочки эффектов процесса по пресетам (строятся один раз)
+_boards: dict[str, Pedalboard] = {}
+
+
+def init_worker_process() -> None:
+    """Инициализатор процесса пула: цепочки эффектов строятся при старте процесса,
+    а не на каждый сегмент.
+    """
+    for preset, board_factory in PRESETS.items():
+        if board_factory is not None:
+            _boards[preset] = board_factory()
+    logger.debug("Sound enhancement process %s is ready", os.getpid())
+
+
+def enhance_sound_quality(
+        audio: bytes, output_format: AudioFormat = "wav", adaptive: bool = True
+) -> tuple[bytes, int, dict[str, Any]]:
+    """Поблочное улучшение качества звука цепочкой эффектов процесса пула.
+    Выполняется в процессе пула, поэтому принимает и возвращает только байты.
+
+    :param audio: Байты аудио записи.
+    :param output_format: Формат аудио на выходе, после обработки (по умолчанию WAV).
+    :param adaptive: Выбирать пресет по оценке качества (чистая запись не обрабатывается).
+    :returns: Байты аудио записи + частота дискретизации + результат анализа и пресет.
+    """
+    if not _boards:
+        init_worker_process()
+    if adaptive:
+        return enhance_sound_quality_adaptive(audio, output_format, boards=_boards)
+    effected, samplerate = enhance_audio(audio, output_format, board=_boards["full"])
+    return effected, samplerate, {"preset": "full"}
@@ -1,14 +1,19 @@
-import io
+import asyncio
+import contextlib
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 
-import soundfile as sf
 from faststream import FastStream, Logger
-from faststream.rabbit import RabbitBroker
-from pedalboard import Compressor, Gain, LowShelfFilter, NoiseGate, Pedalboard
+from faststream.rabbit import Channel, RabbitBroker
 
 from config.dev import settings as dev_settings
-from modules.shared_kernel.audio import AudioFormat, AudioSegment
+from modules.audio.domain import AudioSegment
+from modules.audio.infrastructure.claim_check import create_claim_check
 from modules.summarization.domain import SoundEnhancedEvent
+from modules.summarization.infrastructure.scheduler import create_scheduler
+
+from .enhancement import enhance_sound_quality, init_worker_process
 
 logger = logging.getLogger(__name__)
 
@@ -16,51 +21,81 @@ broker = RabbitBroker(url=dev_settings.rabbitmq.url)
 
 app = FastStream(broker)
 
+claim_check = create_claim_check()
+
+scheduler = create_scheduler()
+
+# Количество процессов пула, столько же сегментов обрабатывается одновременно
+enhancer_processes = dev_settings.audio_pipeline.enhancer_processes or os.cpu_count() or 1
 
-def enhance_sound_quality(audio: bytes, output_format: AudioFormat = "wav") -> tuple[bytes, int]:
-    """Улучшение качества звука используя технологии Spotify.
+executor: ProcessPoolExecutor | None = None
 
-    :param audio: Байты аудио записи.
-    :param output_format: Формат аудио на выходе, после обработки (по умолчанию WAV).
-    :returns: Байты обработанной аудио записи + частота дискретизации.
+
+@app.on_startup
+async def start_executor() -> None:
+    """Запуск пула процессов и прогрев: все процессы стартуют заранее
+    и строят цепочку эффектов до первого сегмента.
     """
-    with io.BytesIO(audio) as stream:
-        content, samplerate = sf.read(stream)
-    board = Pedalboard([
-        NoiseGate(threshold_db=-30, ratio=1.5, release_ms=250),
-        Compressor(threshold_db=-16, ratio=4, attack_ms=5, release_ms=100),
-        LowShelfFilter(cutoff_frequency_hz=400, gain_db=8, q=1),
-        Gain(gain_db=2)
-    ])
-    effected = board(content, samplerate)
-    with io.BytesIO(effected) as stream:
-        sf.write(stream, content, samplerate, format=output_format)
-        stream.seek(0)
-        return stream.read(), samplerate
-
-
-@broker.subscriber("sound_enhancement")
-@broker.publisher("sound_enhancement")
-async def handle_sound_quality_enhancement(
-        audio_segment: AudioSegment, logger: Logger
-) -> AudioSegment:
-    logger.info(
-        "Start sound quality enhancement for audio segment %s/%s with duration %s sec",
-        audio_segment.id, audio_segment.total_count, audio_segment.duration,
-        extra=audio_segment.metadata
+    global executor  # noqa: PLW0603
+    executor = ProcessPoolExecutor(
+        max_workers=enhancer_processes, initializer=init_worker_process
     )
-    effected, samplerate = enhance_sound_quality(audio_segment.content)
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(
+        loop.run_in_executor(executor, os.getpid) for _ in range(enhancer_processes)
+    ))
+    logger.info("Sound enhancement pool started with %s processes", enhancer_processes)
+
+
+@app.after_shutdown
+def shutdown_executor() -> None:
+    # FastStream выполняет синхронный хук в пуле потоков, ожидание не блокирует event loop
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+@broker.subscriber("sound_enhancement", channel=Channel(prefetch_count=enhancer_processes))
+async def handle_sound_quality_enhancement(audio_segment: AudioSegment, logger: Logger) -> None:
     logger.info(
-        "Finished sound quality enhancement for audio segment %s/%s with duration %s sec",
-        audio_segment.id, audio_segment.total_count, audio_segment.duration,
+        "Start sound quality enhancement for audio segment %s/%s with duration %s sec",
+        audio_segment.number, audio_segment.total_count, audio_segment.duration,
         extra=audio_segment.metadata
     )
-    if audio_segment.is_last:
-        event = SoundEnhancedEvent(collection_id=audio_segment.metadata["collection_id"])
-        await broker.publish(event, queue="sound_enhancement")
-    return audio_segment.rewrite(
-        content=effected,
-        size=len(effected),
-        format=AudioFormat.WAV,
-        samplerate=samplerate
+    # Сегмент, который не удалось обработать, не даёт задаче дойти до конца пайплайна
+    task_slot = (
+        scheduler.hold(audio_segment.metadata["task_id"])
+        if scheduler is not None else contextlib.nullcontext()
     )
+    async with task_slot:
+        claimed_segment = audio_segment
+        if claim_check is not None:
+            audio_segment = await claim_check.check_out(audio_segment)
+        effected, samplerate, enhancement = await asyncio.get_running_loop().run_in_executor(
+            executor,
+            enhance_sound_quality,
+            audio_segment.content,
+            audio_segment.format,
+            dev_settings.audio_pipeline.adaptive_enhancement,
+        )
+        logger.info(
+            "Finished sound quality enhancement for audio segment %s/%s "
+            "with duration %s sec, preset %s",
+            audio_segment.number, audio_segment.total_count, audio_segment.duration,
+            enhancement["preset"],
+            extra=audio_segment.metadata
+        )
+        if audio_segment.is_last:
+            event = SoundEnhancedEvent(collection_id=audio_segment.metadata["collection_id"])
+            await broker.publish(event, queue="sound_enhancement")
+        enhanced_segment = audio_segment.model_copy(update={
+            "content": effected,
+            "size": len(effected),
+            "samplerate": samplerate,
+            "metadata": {**audio_segment.metadata, "enhancement": enhancement},
+        })
+        if claim_check is not None:
+            enhanced_segment = await claim_check.check_in(enhanced_segment)
+        # Вход удаляется только после публикации результата
+        await broker.publish(enhanced_segment, queue="sound_enhancement")
+        if claim_check is not None:
+            await claim_check.release(claimed_segment)
@@ -1,7 +1,8 @@
 from faststream import FastStream, Logger
-from faststream.rabbit import RabbitBroker
+from faststream.rabbit import Channel, RabbitBroker
 
 from config.dev import settings as dev_settings
+from modules.summarization.application.services import summarize_transcript
 from modules.summarization.domain import (
     SummarizeTranscriptionCommand,
     TranscriptionSummarizedEvent,
@@ -12,8 +13,15 @@ broker = RabbitBroker(url=dev_settings.rabbitmq.url)
 app = FastStream(broker)
 
 
-@broker.subscriber("summarizing")
-@broker.publisher("summarizing")
+@broker.subscriber(
+    "summarizing", channel=Channel(prefetch_count=dev_settings.summarizer.max_concurrency)
+)
+@broker.publisher("summarized")
 async def handle_summarize_transcription_command(
         command: SummarizeTranscriptionCommand, logger: Logger
-) -> TranscriptionSummarizedEvent: ...
+) -> TranscriptionSummarizedEvent:
+    summary = await summarize_transcript(command.transcript)
+    logger.info("Transcription summarized for task %s", command.task_id)
+    return TranscriptionSummarizedEvent(
+        task_id=command.task_id, collection_id=command.collection_id, summary=summary
+    )
@@ -1,12 +1,25 @@
-import asyncio
+import contextlib
 
 from faststream import FastStream, Logger
-from faststream.rabbit import RabbitBroker
+from faststream.rabbit import Channel, RabbitBroker
 
 from config.dev import settings as dev_settings
-from modules.shared_kernel.audio import AudioSegment
+from modules.audio.application.transcription_cache import (
+    build_transcription_key,
+    transcribe_cached,
+)
+from modules.audio.domain import AudioSegment
+from modules.audio.infrastructure.claim_check import create_claim_check
+from modules.audio.infrastructure.rate_limit import create_rate_limiter, create_task_slots
+from modules.audio.infrastructure.token_cache import create_token_cache
+from modules.audio.infrastructure.transcription_cache import create_transcription_cache
+from modules.audio.utils.fingerprint import fingerprint_audio, fingerprint_audio_stream
 from modules.summarization.domain import AudioTranscribedEvent
-from salute_speech.asyncio import AsyncSaluteSpeechClient
+from modules.summarization.infrastructure.scheduler import create_scheduler
+from salute_speech.asyncio import AsyncSaluteSpeechClient, AsyncTranscriptionEngine, UploadData
+from salute_speech.constants import FILE_FORMAT_ENCODINGS
+from salute_speech.models import RecognizedSpeechList
+from salute_speech.resilience import CircuitBreaker, RetryPolicy
 
 broker = RabbitBroker(url=dev_settings.rabbitmq.url)
 
@@ -15,45 +28,116 @@ app = FastStream(broker)
 salute_speech_client = AsyncSaluteSpeechClient(
     apikey=dev_settings.salute_speech.apikey,
     scope=dev_settings.salute_speech.scope,
+    token_cache=create_token_cache(),
+    rate_limiter=create_rate_limiter(),
+    retry_policy=RetryPolicy(attempts=dev_settings.salute_speech.retry_attempts),
+    circuit_breaker=CircuitBreaker(
+        failure_threshold=dev_settings.salute_speech.circuit_failure_threshold,
+        recovery_timeout=dev_settings.salute_speech.circuit_recovery_timeout,
+        half_open_probes=dev_settings.salute_speech.circuit_half_open_probes,
+    ),
+)
+
+transcription_engine = AsyncTranscriptionEngine(
+    salute_speech_client,
+    max_in_flight=dev_settings.salute_speech.max_in_flight_tasks,
+    poll_interval=dev_settings.salute_speech.poll_interval,
+    max_poll_interval=dev_settings.salute_speech.max_poll_interval,
+    task_slots=create_task_slots(),
+    max_poll_failures=dev_settings.salute_speech.max_poll_failures,
 )
 
+claim_check = create_claim_check()
+
+transcription_cache = create_transcription_cache()
+
+scheduler = create_scheduler()
+
+
+@app.after_shutdown
+async def close_transcription_engine() -> None:
+    await transcription_engine.close()
+    await salute_speech_client.close()
+
+
+def read_content(audio_segment: AudioSegment) -> UploadData:
+    """Контент сегмента: байты или поток частей из хранилища (не загружается в память целиком)"""
+
+    if claim_check is not None:
+        return claim_check.stream(audio_segment)
+    return audio_segment.content
+
+
+async def fingerprint_segment(audio_segment: AudioSegment) -> str:
+    """Отпечаток PCM сегмента, из хранилища для FLAC читается только заголовок"""
+
+    if claim_check is not None and audio_segment.is_claimed:
+        async with contextlib.aclosing(claim_check.stream(audio_segment)) as chunks:
+            return await fingerprint_audio_stream(chunks)
+    return fingerprint_audio(audio_segment.content)
+
 
 async def transcribe_audio(audio_segment: AudioSegment) -> str:
-    """Асинхронная трансрибация аудио сегмента.
+    """Асинхронная трансрибация аудио сегмента, одинаковое аудио распознаётся один раз.
 
     :param audio_segment: Аудио сегмент для трансрибации.
     :returns: Трансрибация + диаризация в формате Markdown.
     """
-    request_file_id = await salute_speech_client.upload_file(
-        file=audio_segment.content, audio_encoding="PCM_S16LE"
-    )
-    task = await salute_speech_client.async_recognize(
-        request_file_id, channels=audio_segment.channels, max_speakers_count=10
-    )
-    while task.status != "DONE":
-        await asyncio.sleep(1)
-        task = await salute_speech_client.get_task_status(task.id)
-    recognized_speech_list = await salute_speech_client.download_file(task.response_file_id)
-    return recognized_speech_list.to_markdown()
-
-
-@broker.subscriber("transcribing")
-@broker.publisher("transcribing")
-async def handle_audio_segment(
-        audio_segment: AudioSegment, logger: Logger
-) -> AudioTranscribedEvent:
-    text = await transcribe_audio(audio_segment)
-    logger.info(
-        "Audio transcribing successfully for segment %s/%s",
-        audio_segment.id, audio_segment.total_count
-    )
-    return AudioTranscribedEvent(
-        task_id=audio_segment.metadata["task_id"],
-        collection_id=audio_segment.metadata["collection_id"],
-        record_id=audio_segment.metadata["record_id"],
-        segment_id=audio_segment.id,
-        segment_duration=audio_segment.duration,
-        segments_count=audio_segment.total_count,
-        is_last=audio_segment.is_last,
-        text=text,
+    options = {
+        "channels": audio_segment.channels,
+        "samplerate": audio_segment.samplerate,
+        "max_speakers_count": 10,
+    }
+
+    async def transcribe() -> RecognizedSpeechList:
+        # Пока SaluteSpeech недоступен, сегменты не берутся в работу: новые сообщения
+        # не приходят сверх prefetch, а уже полученные ждут восстановления, а не падают
+        await salute_speech_client.circuit_breaker.wait()
+        return await transcription_engine.transcribe(
+            read_content(audio_segment),
+            audio_encoding=FILE_FORMAT_ENCODINGS[audio_segment.format],
+            duration=audio_segment.duration,
+            **options,
+        )
+
+    if transcription_cache is None:
+        recognized_speech = await transcribe()
+    else:
+        cache_key = build_transcription_key(await fingerprint_segment(audio_segment), **options)
+        recognized_speech = await transcribe_cached(transcription_cache, cache_key, transcribe)
+    return recognized_speech.to_markdown()
+
+
+# Сообщений в обработке столько же, сколько задач распознавания может быть в работе
+@broker.subscriber(
+    "transcribing",
+    channel=Channel(prefetch_count=dev_settings.salute_speech.max_in_flight_tasks),
+)
+async def handle_audio_segment(audio_segment: AudioSegment, logger: Logger) -> None:
+    # Сегмент, который не удалось распознать, не даёт задаче дойти до конца пайплайна
+    task_slot = (
+        scheduler.hold(audio_segment.metadata["task_id"])
+        if scheduler is not None else contextlib.nullcontext()
     )
+    async with task_slot:
+        text = await transcribe_audio(audio_segment)
+        logger.info(
+            "Audio transcribing successfully for segment %s/%s",
+            audio_segment.number, audio_segment.total_count
+        )
+        event = AudioTranscribedEvent(
+            task_id=audio_segment.metadata["task_id"],
+            collection_id=audio_segment.metadata["collection_id"],
+            record_id=audio_segment.metadata["record_id"],
+            segment_id=audio_segment.number,
+            segment_duration=audio_segment.duration,
+            segments_count=audio_segment.total_count,
+            is_last=audio_segment.is_last,
+            segment_offset=audio_segment.offset,
+            segment_overlap=audio_segment.overlap,
+            text=text,
+        )
+        # Вход удаляется только после публикации результата
+        await broker.publish(event, queue="transcribed")
+        if claim_check is not None:
+            await claim_check.release(audio_segment)
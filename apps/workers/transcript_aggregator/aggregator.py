@@ -0,0 +1,103 @@
+import logging
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from modules.audio.domain import TranscriptionSegment
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 60 * 60  # Время хранения незавершённой расшифровки (в секундах)
+
+# Добавление сегмента и проверка готовности атомарно: сегмент пишется один раз (HSETNX),
+# готовность - по количеству сегментов, готовую расшифровку забирает ровно один вызов.
+ADD_SEGMENT_SCRIPT = """
+if redis.call("HEXISTS", KEYS[2], "emitted") == 1 then
+    return 0
+end
+redis.call("HSETNX", KEYS[1], ARGV[1], ARGV[2])
+if ARGV[3] ~= "" then
+    redis.call("HSET", KEYS[2], "segments_count", ARGV[3])
+end
+redis.call("EXPIRE", KEYS[1], ARGV[4])
+redis.call("EXPIRE", KEYS[2], ARGV[4])
+local segments_count = tonumber(redis.call("HGET", KEYS[2], "segments_count"))
+if segments_count == nil or redis.call("HLEN", KEYS[1]) < segments_count then
+    return 0
+end
+return redis.call("HSETNX", KEYS[2], "emitted", 1)
+"""
+
+
+class TranscriptAggregator:
+    """Сборка расшифровок сегментов задачи, приходящих в произвольном порядке.
+
+    Состояние задачи - два Redis hash: сегменты (номер -> расшифровка, O(1) на сегмент)
+    и метаданные (общее количество сегментов, признак выдачи). Повторная доставка
+    сегмента ничего не меняет, а готовая расшифровка выдаётся один раз.
+
+    Example:
+        >>> if await aggregator.add(task_id, segment):
+        ...     segments = await aggregator.collect(task_id)
+        ...     await publish(segments)
+        ...     await aggregator.complete(task_id)
+    """
+
+    def __init__(
+            self, redis: Redis, prefix: str = "transcripts", ttl: int = DEFAULT_TTL
+    ) -> None:
+        """
+        :param redis: Клиент Redis.
+        :param prefix: Префикс ключей состояния.
+        :param ttl: Время хранения состояния задачи в секундах (для брошенных задач).
+        """
+
+        self._redis = redis
+        self._prefix = prefix
+        self._ttl = ttl
+        self._add_script = redis.register_script(ADD_SEGMENT_SCRIPT)
+
+    def _segments_key(self, task_id: UUID) -> str:
+        return f"{self._prefix}:{task_id}:segments"
+
+    def _meta_key(self, task_id: UUID) -> str:
+        return f"{self._prefix}:{task_id}:meta"
+
+    async def add(self, task_id: UUID, segment: TranscriptionSegment) -> bool:
+        """Добавление расшифровки сегмента.
+
+        :param task_id: Идентификатор задачи.
+        :param segment: Расшифровка сегмента (общее количество - если уже известно).
+        :returns: True, если собраны все сегменты и вызывающий должен выдать расшифровку.
+        """
+
+        completed = await self._add_script(
+            keys=[self._segments_key(task_id), self._meta_key(task_id)],
+            args=[
+                segment.number,
+                segment.model_dump_json(),
+                segment.total_count or "",
+                self._ttl,
+            ],
+        )
+        return bool(completed)
+
+    async def collect(self, task_id: UUID) -> list[TranscriptionSegment]:
+        """Все расшифровки сегментов задачи, упорядоченные по номеру"""
+
+        data = await self._redis.hgetall(self._segments_key(task_id))
+        segments = [TranscriptionSegment.model_validate_json(value) for value in data.values()]
+        return sorted(segments, key=lambda segment: segment.number)
+
+    async def complete(self, task_id: UUID) -> None:
+        """Удаление сегментов выданной расшифровки, признак выдачи хранится до истечения TTL,
+        чтобы повторно доставленные сегменты не начали сборку заново.
+        """
+
+        await self._redis.delete(self._segments_key(task_id))
+        logger.debug("Transcript for task %s completed", task_id)
+
+    async def release(self, task_id: UUID) -> None:
+        """Снятие признака выдачи, если расшифровку не удалось передать дальше"""
+
+        await self._redis.hdel(self._meta_key(task_id), "emitted")
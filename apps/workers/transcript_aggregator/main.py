@@ -0,0 +1,63 @@
+from faststream import FastStream, Logger
+from faststream.rabbit import RabbitBroker
+from redis.asyncio import Redis
+
+from config.dev import settings as dev_settings
+from modules.audio.domain import TranscriptionSegment
+from modules.audio.utils.stitching import stitch_transcriptions
+from modules.summarization.domain import AudioTranscribedEvent, SummarizeTranscriptionCommand
+from modules.summarization.infrastructure.scheduler import create_scheduler
+
+from .aggregator import TranscriptAggregator
+
+broker = RabbitBroker(url=dev_settings.rabbitmq.url)
+
+app = FastStream(broker)
+
+redis = Redis.from_url(dev_settings.redis.url)
+
+aggregator = TranscriptAggregator(redis)
+
+scheduler = create_scheduler()
+
+
+@app.after_shutdown
+async def close_redis() -> None:
+    await redis.aclose()
+
+
+@broker.subscriber("transcribed")
+async def handle_audio_transcribed_event(event: AudioTranscribedEvent, logger: Logger) -> None:
+    segment = TranscriptionSegment(
+        number=event.segment_id,
+        total_count=event.segments_count,
+        offset=event.segment_offset,
+        overlap=event.segment_overlap,
+        text=event.text,
+        metadata={"record_id": event.record_id},
+    )
+    if scheduler is not None:
+        # Сегменты задачи ещё приходят: место в пайплайне не освобождается по аренде
+        await scheduler.renew(event.task_id)
+    # Готовность определяется по количеству сегментов, а не по `is_last`:
+    # последний по номеру сегмент может быть расшифрован раньше остальных
+    if not await aggregator.add(event.task_id, segment):
+        return
+    try:
+        segments = await aggregator.collect(event.task_id)
+        command = SummarizeTranscriptionCommand(
+            task_id=event.task_id,
+            collection_id=event.collection_id,
+            segments_count=len(segments),
+            transcript=stitch_transcriptions(segments),
+        )
+        await broker.publish(command, queue="summarizing")
+    except Exception:
+        # Сообщение вернётся в очередь, и сборку выполнит повторная доставка
+        await aggregator.release(event.task_id)
+        raise
+    await aggregator.complete(event.task_id)
+    if scheduler is not None:
+        # Работа с аудио закончена: место в пайплайне отдаётся следующей задаче
+        await scheduler.release(event.task_id)
+    logger.info("Transcript of %s segments assembled for task %s", len(segments), event.task_id)